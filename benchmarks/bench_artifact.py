@@ -0,0 +1,81 @@
+"""Compara el artefacto binario de tokens con pickle y JSON (tamaño y carga).
+
+También verifica que el artefacto reproduce exactamente la salida de
+Lexer.tokenize. Uso: python benchmarks/bench_artifact.py [statements]
+"""
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, Token, TokenType
+from compilador import artifact
+from corpus import identifier_program
+
+
+def as_tuples(tokens):
+    return [(t.type, t.value, t.line, t.position, t.offset) for t in tokens]
+
+
+def timed(function, repeat: int = 3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def check_round_trip(code: str):
+    tokens = Lexer().tokenize(code)
+    stream = artifact.load(artifact.dump(tokens))
+    assert as_tuples(stream.to_tokens()) == as_tuples(tokens), "el artefacto no reproduce los tokens"
+    return tokens
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    check_round_trip("/* a\n b */ string s = \"x\\\"y\";\nboolean b = true && false; @ 1.5")
+    tokens = check_round_trip(identifier_program(statements))
+
+    rows = [[t.type.value, t.value, t.line, t.position, t.offset] for t in tokens]
+    encoded = {
+        'artefacto': artifact.dump(tokens),
+        'pickle': pickle.dumps(tokens, protocol=pickle.HIGHEST_PROTOCOL),
+        'json': json.dumps(rows).encode('utf-8'),
+    }
+    loaders = {
+        'artefacto': artifact.load,
+        'pickle': pickle.loads,
+        'json': json.loads,
+    }
+    full_loaders = {
+        'artefacto': lambda data: artifact.load(data).to_tokens(),
+        'pickle': pickle.loads,
+        'json': lambda data: [Token(TokenType(r[0]), r[1], r[2], r[3], r[4]) for r in json.loads(data)],
+    }
+
+    print(f"tokens: {len(tokens)}")
+    print(f"{'formato':<10} {'bytes':>12} {'abrir':>10} {'a Token':>10}")
+    for name, data in encoded.items():
+        open_time, _ = timed(lambda: loaders[name](data))
+        full_time, _ = timed(lambda: full_loaders[name](data))
+        print(f"{name:<10} {len(data):>12} {open_time * 1000:>8.2f}ms {full_time * 1000:>8.2f}ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tokens.ctok')
+        artifact.save(tokens, path)
+        open_time, stream = timed(lambda: artifact.open_artifact(path))
+        middle = stream[len(stream) // 2]
+        print(f"mmap: abrir {open_time * 1000:.3f}ms, token central {middle}")
+        stream.release()
+
+
+if __name__ == "__main__":
+    main()
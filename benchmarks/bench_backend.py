@@ -0,0 +1,154 @@
+"""Backend a Python: misma salida que el intérprete de la IR y velocidad en programas con bucles.
+
+Uso: python benchmarks/bench_backend.py [escala]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, CompilerError
+from compilador.ir import build_ir
+from compilador.interpreter import ExecutionError, run_ir
+from compilador.backend import CompiledProgram, compile_ir, compile_program
+from compilador.runner import Limits, LimitExceeded, run_limited
+from corpus import CONFORMANCE_PROGRAMS, structured_program
+from bench_ir import mutations
+from bench_nesting import nested_blocks
+
+
+def nested_loops(n: int) -> str:
+    return (f"int total = 0;\n"
+            f"for (int i = 0; i < {n}; i += 1) {{\n"
+            f"    for (int j = 0; j < 100; j += 1) {{\n"
+            f"        total = total + ((i * j) / 7);\n"
+            f"    }}\n"
+            f"}}\n"
+            f"print(total);\n")
+
+
+def primes(n: int) -> str:
+    return (f"int count = 0;\n"
+            f"for (int n = 2; n < {n}; n += 1) {{\n"
+            f"    boolean prime = true;\n"
+            f"    int d = 2;\n"
+            f"    while ((d * d) <= n) {{\n"
+            f"        if ((n - ((n / d) * d)) == 0) {{\n"
+            f"            prime = false;\n"
+            f"            break;\n"
+            f"        }}\n"
+            f"        d += 1;\n"
+            f"    }}\n"
+            f"    if (prime) {{\n"
+            f"        count += 1;\n"
+            f"    }}\n"
+            f"}}\n"
+            f"print(count);\n")
+
+
+def fibonacci(n: int) -> str:
+    return (f"float a = 0.0;\n"
+            f"float b = 1.0;\n"
+            f"int k = 0;\n"
+            f"while (k < {n}) {{\n"
+            f"    float t = a + b;\n"
+            f"    a = b;\n"
+            f"    b = t;\n"
+            f"    k += 1;\n"
+            f"    if (b > 1000000.0) {{\n"
+            f"        a = 0.0;\n"
+            f"        b = 1.0;\n"
+            f"        continue;\n"
+            f"    }}\n"
+            f"}}\n"
+            f"print(a);\n"
+            f"print(b);\n")
+
+
+# Pasos para la verificación: las mutaciones pueden quitar el incremento de un bucle
+LIMITS = Limits(200_000, None, None)
+
+
+def interpreted(program) -> list:
+    output = []
+    try:
+        run_ir(program, output.append)
+    except ExecutionError as e:
+        output.append(e)
+    return output
+
+
+def limited(engine: CompiledProgram) -> tuple:
+    """(líneas impresas, si terminó antes del límite de pasos)"""
+    output = []
+    try:
+        run_limited(engine, output.append, LIMITS)
+    except LimitExceeded:
+        return output, False
+    except ExecutionError as e:
+        output.append(e)
+    return output, True
+
+
+def same(a: list, b: list) -> bool:
+    if len(a) != len(b):
+        return False
+    return all(str(x) == str(y) and type(x) is type(y) for x, y in zip(a, b))
+
+
+def main():
+    # Todo programa aceptado imprime lo mismo compilado que interpretado
+    programs = [Lexer().tokenize(code) for code in CONFORMANCE_PROGRAMS]
+    programs.append(Lexer().tokenize(structured_program(20)))
+    programs.extend(mutations(structured_program(6), 2000))
+    programs.extend(Lexer().tokenize(code) for code in (nested_loops(20), primes(200), fibonacci(100)))
+    # Con el mismo límite de pasos: si el intérprete no termina, el backend
+    # tampoco puede terminar (lo impreso hasta el límite depende de los pasos)
+    checked = endless = 0
+    for tokens in programs:
+        try:
+            program = build_ir(tokens)
+        except CompilerError:
+            continue
+        expected, finished = limited(CompiledProgram(program, None))
+        output, compiled_finished = limited(compile_ir(program))
+        assert compiled_finished == finished, [t.value for t in tokens]
+        if finished:
+            assert same(output, expected), [t.value for t in tokens]
+            checked += 1
+        else:
+            endless += 1
+
+    deep = compile_ir(build_ir(Lexer().tokenize(nested_blocks(5000))))
+    assert deep.function is None and deep.run() == ['1']
+    print(f"verificación: {checked} programas con la misma salida ({endless} sin terminar en ninguno de los dos); "
+          f"anidamiento 5000 -> intérprete")
+
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    for name, code in (("bucles anidados", nested_loops(300 * scale)),
+                       ("primos", primes(20000 * scale)),
+                       ("fibonacci", fibonacci(100000 * scale))):
+        start = time.perf_counter()
+        program = compile_program(code)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        assert compile_program(code) is program
+        cached = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = interpreted(program.program)
+        slow = time.perf_counter() - start
+
+        start = time.perf_counter()
+        output = program.run()
+        fast = time.perf_counter() - start
+
+        assert output == expected
+        print(f"{name:<16} intérprete {slow:7.3f}s  backend {fast:7.3f}s  x{slow / fast:5.1f}  "
+              f"compilación {first * 1000:6.2f} ms  caché {cached * 1e6:5.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
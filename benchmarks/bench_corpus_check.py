@@ -0,0 +1,130 @@
+"""Revisión de corpus: resultados iguales a la revisión secuencial, reanudación y rezagados.
+
+Con pocos núcleos la aceleración real no se puede medir, así que además se
+simula el tiempo total con N workers a partir de la latencia medida de cada
+archivo: reparto estático en trozos (como Pool.map) frente al planificador
+con robo de lotes.
+
+Uso: python benchmarks/bench_corpus_check.py [archivos] [workers simulados]
+"""
+import heapq
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from compilador.diagnostics import check_file
+from corpus_check import Scheduler, check_corpus, make_shards, percentile, read_journal
+from corpus import CONFORMANCE_PROGRAMS, identifier_program, structured_program
+
+
+def write_corpus(folder: str, count: int, rnd: random.Random) -> list:
+    """Muchas entregas pequeñas y unas pocas enormes, repartidas al azar"""
+    giants = set(rnd.sample(range(count), 4))
+    paths = []
+    for number in range(count):
+        if number in giants:
+            source = identifier_program(40000)
+        elif rnd.random() < 0.7:
+            source = rnd.choice(CONFORMANCE_PROGRAMS)
+        else:
+            source = structured_program(rnd.randrange(1, 30))
+        path = os.path.join(folder, f"entrega{number:05d}.txt")
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(source)
+        paths.append(path)
+    return paths
+
+
+def static_makespan(costs: list, workers: int) -> float:
+    """Pool.map: trozos fijos de len/(4·workers) archivos, cada uno al primer worker libre"""
+    chunk = max(1, len(costs) // (4 * workers))
+    finish = [0.0] * workers
+    for start in range(0, len(costs), chunk):
+        worker = min(range(workers), key=finish.__getitem__)
+        finish[worker] += sum(costs[start:start + chunk])
+    return max(finish)
+
+
+def stealing_makespan(files: list, costs: dict, workers: int) -> float:
+    """El planificador de corpus_check con los costes medidos"""
+    total = sum(entry[1] for entry in files)
+    shard_bytes = max(1, min(1024 * 1024, total // (workers * 8)))
+    scheduler = Scheduler(make_shards(files, shard_bytes), workers)
+    events = [(0.0, worker) for worker in range(workers)]
+    end = 0.0
+    while events:
+        now, worker = heapq.heappop(events)
+        shard = scheduler.next_shard(worker)
+        if shard is None:
+            end = max(end, now)
+            continue
+        heapq.heappush(events, (now + sum(costs[entry[0]] for entry in shard), worker))
+    return end
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    simulated = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    rnd = random.Random(9)
+    with tempfile.TemporaryDirectory() as folder:
+        corpus = os.path.join(folder, 'corpus')
+        os.makedirs(corpus)
+        paths = write_corpus(corpus, count, rnd)
+
+        # Mismos diagnósticos que la revisión secuencial
+        journal = os.path.join(folder, 'diario.ndjson')
+        stats = check_corpus([corpus], journal, workers=2)
+        results = read_journal(journal)
+        assert stats['files'] == count and len(results) == count
+        for path in rnd.sample(paths, 200):
+            assert results[path]['diagnostics'] == check_file(path), path
+        latencies = stats['latencies']
+        print(f"verificación: {count} archivos, {stats['failed']} con errores, {stats['stolen']} lotes robados; "
+              f"{count / stats['seconds']:,.0f} archivos/s, p50 {percentile(latencies, 0.5):.2f} ms, "
+              f"p99 {percentile(latencies, 0.99):.2f} ms, máx {max(latencies):.0f} ms")
+
+        # Sin cambios no se revisa nada; un archivo modificado se vuelve a revisar
+        with open(paths[0], 'a', encoding='utf-8') as file:
+            file.write("int extra = 1;\n")
+        again = check_corpus([corpus], journal, workers=2)
+        assert again['files'] == 1 and again['resumed'] == count - 1
+        assert read_journal(journal)[paths[0]]['diagnostics'] == check_file(paths[0])
+
+        # Interrumpir la línea de órdenes a mitad y reanudar
+        journal = os.path.join(folder, 'interrumpido.ndjson')
+        process = subprocess.Popen([sys.executable, 'corpus_check.py', corpus, '--journal', journal,
+                                    '--workers', '2'], cwd=ROOT, stderr=subprocess.PIPE, text=True)
+        while not os.path.exists(journal) or len(read_journal(journal)) < count // 3:
+            time.sleep(0.05)
+        process.send_signal(signal.SIGINT)
+        message = process.communicate()[1]
+        assert process.returncode == 130, message
+        with open(journal, 'a', encoding='utf-8') as file:
+            file.write('{"file": "cortad')  # Una escritura a medias no rompe la reanudación
+        before = len(read_journal(journal))
+        resumed = check_corpus([corpus], journal, workers=2)
+        assert resumed['resumed'] == before and before + resumed['files'] == count
+        assert len(read_journal(journal)) == count
+        print(f"reanudación: interrumpido con {before} archivos en el diario, "
+              f"la segunda ejecución revisó los {resumed['files']} restantes")
+
+        # Tiempo total simulado con más workers a partir de los costes medidos
+        entries = read_journal(os.path.join(folder, 'diario.ndjson'))
+        files = [(path, entries[path]['size'], entries[path]['mtime_ns']) for path in paths]
+        costs = {path: entries[path]['ms'] for path in paths}
+        ideal = max(sum(costs.values()) / simulated, max(costs.values()))
+        static = static_makespan([costs[path] for path in paths], simulated)
+        stealing = stealing_makespan(files, costs, simulated)
+        print(f"{simulated} workers simulados: ideal {ideal / 1000:.2f}s, trozos fijos {static / 1000:.2f}s, "
+              f"lotes por bytes con robo {stealing / 1000:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
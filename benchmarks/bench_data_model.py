@@ -0,0 +1,106 @@
+"""Modelo de datos con __slots__: memoria por token y compilación completa de un archivo de 1M tokens.
+
+Compara Token (con __slots__), la clase anterior con __dict__ y la
+representación como tupla (Token.as_row). La compilación completa se mide
+con el Lexer creando Token y creando la clase anterior.
+
+Uso: python benchmarks/bench_data_model.py [tokens]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, Token, TokenType, CompilerError, ErrorType
+from compilador import lexer as lexer_module
+from compilador.backend import compile_program, _cache, _canonical
+from compilador.m_token import TOKEN_TYPES
+from corpus import identifier_program
+
+TOKENS_PER_STATEMENT = 8
+
+
+class DictToken:
+    """El Token anterior, con __dict__ por instancia"""
+
+    def __init__(self, type: TokenType, value: str, line: int, position: int, offset: int = None):
+        self.type = type
+        self.value = value
+        self.line = line
+        self.position = position
+        self.offset = offset
+
+    @property
+    def end(self) -> int:
+        return self.offset + len(self.value)
+
+
+def measure(build) -> tuple:
+    """(bytes asignados por build, resultado); los valores de los tokens ya existen"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def compile_time(source: str) -> float:
+    _cache.clear()
+    _canonical.clear()
+    gc.collect()
+    start = time.perf_counter()
+    compile_program(source)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    source = identifier_program(count // TOKENS_PER_STATEMENT)
+    tokens = Lexer().tokenize(source)
+    n = len(tokens)
+
+    # La representación compacta conserva los atributos públicos
+    rows = [token.as_row() for token in tokens[:10000]]
+    assert all(Token.from_row(row).as_row() == row for row in rows)
+    assert all(TOKEN_TYPES[token.kind] is token.type and token.type_name == token.type.value
+               for token in tokens[:10000])
+    assert not hasattr(tokens[0], '__dict__')
+    error = CompilerError(ErrorType.SYNTACTIC, "mensaje", 3, 4, "';'", "'}'", 10, 2)
+    assert str(error) == str(CompilerError(ErrorType.SYNTACTIC, "mensaje", 3, 4, "';'", "'}'", 10, 2))
+
+    fields = [(t.type, t.value, t.line, t.position, t.offset) for t in tokens]
+    # Enteros que ya existen en los tokens: solo se cuenta el contenedor de cada representación
+    slots, _ = measure(lambda: [Token(*f) for f in fields])
+    dicts, _ = measure(lambda: [DictToken(*f) for f in fields])
+    tuples, _ = measure(lambda: [token.as_row() for token in tokens])
+    print(f"{n:,} tokens, memoria por token (objeto + puntero en la lista): "
+          f"__dict__ {dicts / n:.0f} B, __slots__ {slots / n:.0f} B, tupla {tuples / n:.0f} B")
+    del fields
+
+    start = time.perf_counter()
+    names = [str(token) for token in tokens]
+    print_time = time.perf_counter() - start
+    start = time.perf_counter()
+    names = [f"Token({token.type.value}, '{token.value}', línea {token.line}, pos {token.position})"
+             for token in tokens]
+    enum_time = time.perf_counter() - start
+    print(f"str() de todos los tokens: tabla de nombres {print_time:.2f}s, Enum.value {enum_time:.2f}s")
+    del names, tokens
+
+    # Compilación completa (lexer, parser, IR y backend) con cada modelo de token
+    current = compile_time(source)
+    lexer_module.Token = DictToken
+    try:
+        previous = compile_time(source)
+    finally:
+        lexer_module.Token = Token
+    print(f"compilación completa de {len(source) / 1024 / 1024:.1f} MB: "
+          f"__slots__ {current:.2f}s, __dict__ {previous:.2f}s (x{previous / current:.2f})")
+
+
+if __name__ == "__main__":
+    main()
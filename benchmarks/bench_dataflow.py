@@ -0,0 +1,102 @@
+"""Análisis de flujo: resultados esperados, bits compartidos frente a un bit por variable y escalado.
+
+Uso: python benchmarks/bench_dataflow.py [bloques]
+"""
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, Parser, CompilerError
+from compilador.dataflow import FlowGraph, DECLARE, operations
+from corpus import CONFORMANCE_PROGRAMS, structured_program
+
+# Programa -> mensajes de todos los diagnósticos del análisis de flujo
+EXPECTED = {
+    "int x; if (true) { x = 1; } print(x);": ["Variable 'x' utilizada sin inicializar"],
+    "int x; if (true) { x = 1; } else { x = 2; } print(x);": [],
+    "int x; while (true) { x = 1; break; } print(x);": ["Variable 'x' utilizada sin inicializar"],
+    "int x; while (true) { print(x); x = 1; }": ["Variable 'x' utilizada sin inicializar"],
+    "int s; for (int i = 0; i < 3; s) { s = i; } print(1);": [],
+    "int i = 0; while (i < 3) { i += 1; continue; print(i); }": [],
+    "int x = x + 1; print(x);": ["Variable 'x' utilizada sin inicializar"],
+    "int a = 1; if (a > 0) { int b = a; } int c; int d = 2;": [
+        "Variable 'b' declarada pero nunca utilizada",
+        "Variable 'c' declarada pero nunca utilizada",
+        "Variable 'd' declarada pero nunca utilizada",
+    ],
+}
+
+
+def diagnostics(tokens, dense: bool = False):
+    parser = Parser(tokens)
+    if dense:
+        parser.flow.allocate_bits = lambda: dense_bits(parser.flow)
+    try:
+        parser.parse()
+    except CompilerError as e:
+        if not parser.diagnostics:
+            return [(e.message, e.line, e.position)]
+    return [(d.message, d.line, d.position) for d in parser.diagnostics]
+
+
+def dense_bits(flow: FlowGraph) -> tuple:
+    """Un bit distinto por declaración: referencia sin compartir bits"""
+    masks = {}
+    for events in flow.events:
+        for operation, var, _ in operations(events):
+            if operation == DECLARE:
+                masks[var] = 1 << len(masks)
+    return masks, len(masks)
+
+
+def mutated_programs(code: str, count: int, seed: int = 7):
+    """Programas con un token borrado o duplicado: generan muchos casos de flujo distintos"""
+    tokens = Lexer().tokenize(code)
+    rnd = random.Random(seed)
+    for _ in range(count):
+        mutated = list(tokens)
+        i = rnd.randrange(len(mutated))
+        if rnd.random() < 0.5:
+            del mutated[i]
+        else:
+            mutated.insert(i, mutated[i])
+        yield mutated
+
+
+def main():
+    for code, messages in EXPECTED.items():
+        received = [message for message, _, _ in diagnostics(Lexer().tokenize(code))]
+        assert received == messages, f"{code!r}: {received}"
+
+    programs = [Lexer().tokenize(code) for code in CONFORMANCE_PROGRAMS + list(EXPECTED)]
+    programs.extend(mutated_programs(structured_program(6), 2000))
+    for tokens in programs:
+        assert diagnostics(tokens) == diagnostics(tokens, dense=True)
+    print(f"verificación: {len(EXPECTED)} casos esperados, {len(programs)} programas iguales con un bit por variable")
+
+    base = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    previous = None
+    for blocks in (base, base * 2, base * 4, base * 8):
+        parser = Parser(Lexer().tokenize(structured_program(blocks)))
+        parser.check_data_flow = lambda: None
+        parser.parse()
+        flow = parser.flow
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        flow.analyze()
+        elapsed = time.perf_counter() - start
+        gc.enable()
+        width = flow.allocate_bits()[1]
+        ratio = f"  x{elapsed / previous:.2f}" if previous else ""
+        previous = elapsed
+        print(f"{blocks:>6} bloques  {len(flow.events):>7} bloques básicos  {width:>3} bits  "
+              f"{elapsed * 1000:8.1f} ms{ratio}")
+
+
+if __name__ == "__main__":
+    main()
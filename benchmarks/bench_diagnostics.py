@@ -0,0 +1,96 @@
+"""Diagnósticos estructurados: registros completos, SARIF válido y salida incremental.
+
+Uso: python benchmarks/bench_diagnostics.py [programas]
+"""
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from compilador import ErrorType
+from compilador.diagnostics import NDJSONWriter, SARIFWriter, check_source, diagnostic_record
+from corpus import CONFORMANCE_PROGRAMS, structured_program
+
+FIELDS = ['kind', 'file', 'code', 'type', 'severity', 'message', 'line', 'column', 'end_line',
+          'end_column', 'start', 'end', 'expected', 'received']
+
+
+def mutated_programs(count: int, rnd: random.Random) -> list:
+    """Programas del corpus con un carácter borrado o añadido: la mayoría con errores"""
+    programs = []
+    for _ in range(count):
+        source = rnd.choice(CONFORMANCE_PROGRAMS)
+        cut = rnd.randrange(len(source) + 1)
+        if rnd.random() < 0.5:
+            source = source[:cut] + source[cut + 1:]
+        else:
+            source = source[:cut] + rnd.choice("$;{}()=\"x1") + source[cut:]
+        programs.append(source)
+    return programs
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rnd = random.Random(7)
+    programs = mutated_programs(count, rnd)
+
+    # Cada registro tiene todos los campos, un código estable y un tramo dentro del buffer
+    codes = {error_type.code for error_type in ErrorType}
+    ndjson, sarif = io.StringIO(), io.StringIO()
+    writers = [NDJSONWriter(ndjson), SARIFWriter(sarif)]
+    start = time.perf_counter()
+    total = failed = 0
+    for number, source in enumerate(programs):
+        errors, source_map = check_source(source)
+        records = [diagnostic_record(error, source_map, f"programa{number}") for error in errors]
+        for record in records:
+            assert list(record) == FIELDS and record['code'] in codes
+            assert 0 <= record['start'] <= record['end'] <= len(source)
+            assert (record['line'], record['column']) <= (record['end_line'], record['end_column'])
+        for writer in writers:
+            writer.write(records)
+        total += len(records)
+        failed += bool(records)
+    for writer in writers:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    lines = ndjson.getvalue().splitlines()
+    assert len(lines) == total and all(json.loads(line)['kind'] == 'diagnostic' for line in lines)
+    log = json.loads(sarif.getvalue())
+    assert log['version'] == '2.1.0' and len(log['runs'][0]['results']) == total
+    print(f"verificación: {count} programas, {failed} con errores, {total} diagnósticos "
+          f"({total / elapsed:,.0f} registros/s en NDJSON y SARIF)")
+    by_code = {}
+    for line in lines:
+        code = json.loads(line)['code']
+        by_code[code] = by_code.get(code, 0) + 1
+    print("por código: " + ", ".join(f"{code} {by_code[code]}" for code in sorted(by_code)))
+
+    # La línea de órdenes escribe cada archivo en cuanto lo termina: el primer
+    # registro llega mucho antes de que acabe la ejecución completa
+    with tempfile.TemporaryDirectory() as folder:
+        for number in range(400):
+            source = structured_program(40) if number else "int x = 1 $;\n"
+            with open(os.path.join(folder, f"p{number:04d}.txt"), 'w', encoding='utf-8') as file:
+                file.write(source)
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, '-m', 'compilador.diagnostics', '--files', folder],
+                                   cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        first = json.loads(process.stdout.readline())
+        first_time = time.perf_counter() - start
+        rest = process.stdout.readlines()
+        process.wait()
+        total_time = time.perf_counter() - start
+        assert first['code'] == 'E100' and len(rest) == 400 and process.returncode == 1
+        print(f"CLI: primer registro a los {first_time:.2f}s de {total_time:.2f}s en total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Formateador: forma canónica estable, tokens y comentarios intactos, caché canónica y rendimiento.
+
+Uso: python benchmarks/bench_formatter.py [sentencias del archivo grande]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, CompilerError
+from compilador.backend import compile_program, _cache, _canonical
+from compilador.formatter import canonical_hash, format_source
+from compilador.runner import LineProfiler, Limits, run_limited
+from corpus import CONFORMANCE_PROGRAMS, identifier_program, structured_program
+from bench_backend import nested_loops, primes, fibonacci
+from bench_optimizer import RandomProgram
+
+DELIMITERS = {"(", ")", "{", "}", ";", ","}
+
+
+def scramble(source: str, rnd: random.Random) -> str:
+    """Misma secuencia de tokens con otros espacios, saltos de línea y comentarios"""
+    lexer = Lexer()
+    tokens = lexer.tokenize(source)
+    parts, last, previous = [], 0, ""
+    for token in tokens:
+        gap = source[last:token.offset]
+        if gap and '//' not in gap and '/*' not in gap:
+            # Sin separación solo junto a un delimitador, para no pegar dos tokens
+            choices = [" ", "  ", "\n", "\n\n\t", " /* c */ "]
+            if token.value in DELIMITERS or previous in DELIMITERS:
+                choices.append("")
+            gap = rnd.choice(choices)
+        parts.append(gap)
+        parts.append(token.value)
+        last, previous = token.end, token.value
+    parts.append(source[last:])
+    return "".join(parts)
+
+
+def signature(source: str) -> tuple:
+    lexer = Lexer()
+    tokens = lexer.tokenize(source)
+    return ([(token.type, token.value) for token in tokens],
+            [source[start:end].rstrip() for start, end in lexer.comments])
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rnd = random.Random(4)
+    sources = CONFORMANCE_PROGRAMS + [structured_program(30), nested_loops(6), primes(50), fibonacci(30)]
+    sources += [RandomProgram(rnd).generate() for _ in range(200)]
+
+    # Idempotente, con los mismos tokens y comentarios, y con el mismo hash
+    # canónico para cualquier disposición del código
+    checked = 0
+    for source in sources:
+        try:
+            formatted = format_source(source)
+        except CompilerError:
+            continue
+        assert format_source(formatted) == formatted, source
+        assert signature(formatted) == signature(source), source
+        tokens = Lexer().tokenize(source)
+        for _ in range(3):
+            variant = scramble(source, rnd)
+            assert canonical_hash(Lexer().tokenize(variant)) == canonical_hash(tokens)
+            assert format_source(format_source(variant)) == format_source(variant)
+        checked += 1
+    print(f"verificación: {checked} programas; formato idempotente, tokens y comentarios intactos")
+
+    # Caché canónica: un programa reformateado reutiliza la compilación y se
+    # comporta igual, pasos y perfil incluidos, que compilado desde cero
+    hits = 0
+    for source in sources[-60:]:
+        variant = format_source(scramble(source, rnd))
+        compile_program(source)
+        reused = compile_program(variant)
+        hits += reused.function is compile_program(source).function
+        _canonical.clear()
+        fresh = compile_program(variant)
+        results = []
+        for program in (reused, fresh):
+            output, profiler = [], LineProfiler()
+            monitor = run_limited(program, output.append, Limits(1_000_000, None, None), profiler)
+            results.append((output, monitor.steps, profiler.hits))
+        assert results[0] == results[1], variant
+    print(f"caché canónica: {hits}/60 variantes reformateadas reutilizaron la compilación, misma ejecución")
+
+    # Coste de compilar la versión reformateada de un programa grande: desde
+    # cero frente a reubicar la compilación guardada
+    big = structured_program(300)
+    reformatted = format_source(big)
+    _canonical.clear()
+    start = time.perf_counter()
+    compile_program(reformatted)
+    fresh_time = time.perf_counter() - start
+    compile_program(big)
+    _cache.clear()
+    start = time.perf_counter()
+    compile_program(reformatted)
+    reused_time = time.perf_counter() - start
+    print(f"programa de {len(big.splitlines())} líneas reformateado: compilar {fresh_time * 1000:.0f} ms, "
+          f"con la caché canónica {reused_time * 1000:.0f} ms")
+
+    code = identifier_program(statements) + structured_program(statements // 20)
+    scrambled = scramble(code, rnd)
+    lexer = Lexer()
+    start = time.perf_counter()
+    tokens = lexer.tokenize(scrambled)
+    lexing = time.perf_counter() - start
+    start = time.perf_counter()
+    formatted = format_source(scrambled)
+    total = time.perf_counter() - start
+    start = time.perf_counter()
+    canonical_hash(tokens)
+    hashing = time.perf_counter() - start
+    size = len(scrambled) / 1024 / 1024
+    print(f"{size:.1f} MB, {len(tokens):,} tokens: formatear {total:.2f}s ({size / total:.2f} MB/s, "
+          f"{len(tokens) / total / 1e6:.2f} M tokens/s; de ello el lexer {lexing:.2f}s), "
+          f"hash canónico {hashing:.2f}s")
+    assert len(formatted.splitlines()) >= statements
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Mide el efecto de internar identificadores en Lexer.tokenize.
+
+Uso: python benchmarks/bench_interning.py [statements]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, Parser, TokenType
+from corpus import identifier_program
+
+
+def copy_values(tokens):
+    """Da a cada token su propio string, como hacía el lexer sin internar"""
+    for token in tokens:
+        if token.type == TokenType.IDENTIFIER:
+            token.value = token.value[:1] + token.value[1:]
+
+
+def retained_bytes(tokens, fresh_strings: bool) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    if fresh_strings:
+        copy_values(tokens)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    code = identifier_program(statements)
+
+    start = time.perf_counter()
+    tokens = Lexer().tokenize(code)
+    lex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Parser(tokens).parse()
+    parse_time = time.perf_counter() - start
+
+    identifiers = [t.value for t in tokens if t.type == TokenType.IDENTIFIER]
+    distinct_objects = len({id(v) for v in identifiers})
+    extra = retained_bytes(tokens, fresh_strings=True)
+
+    print(f"statements:              {statements}")
+    print(f"tokens:                  {len(tokens)}")
+    print(f"identificadores:         {len(identifiers)}")
+    print(f"objetos str distintos:   {distinct_objects}")
+    print(f"bytes extra sin internar: {extra} ({extra / max(len(identifiers), 1):.1f} B/identificador)")
+    print(f"tokenize:                {lex_time:.3f}s")
+    print(f"parse:                   {parse_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Generación de la IR: verificación sobre el corpus y coste frente al análisis sin IR.
+
+Uso: python benchmarks/bench_ir.py [bloques]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, Parser, CompilerError
+from compilador.ll1_parser import LL1Parser
+from compilador.ir import IRBuilder, build_ir
+from corpus import CONFORMANCE_PROGRAMS, identifier_program, structured_program
+from bench_nesting import nested_blocks
+
+
+def outcome(parser_class, tokens, flow_class=None):
+    parser = parser_class(tokens, flow_class) if flow_class else parser_class(tokens)
+    try:
+        parser.parse()
+    except CompilerError as e:
+        return (e.message, e.line, e.position)
+    if flow_class:
+        parser.flow.finish().verify()
+    return None
+
+
+def mutations(code: str, count: int, seed: int = 3):
+    tokens = Lexer().tokenize(code)
+    rnd = random.Random(seed)
+    for _ in range(count):
+        mutated = list(tokens)
+        i = rnd.randrange(len(mutated))
+        choice = rnd.random()
+        if choice < 0.4:
+            del mutated[i]
+        elif choice < 0.8:
+            mutated.insert(i, mutated[i])
+        else:
+            j = rnd.randrange(len(mutated))
+            mutated[i], mutated[j] = mutated[j], mutated[i]
+        yield mutated
+
+
+def main():
+    # Generar la IR no cambia qué programas se aceptan ni sus errores, y la
+    # IR de los aceptados pasa el verificador
+    programs = [Lexer().tokenize(code) for code in CONFORMANCE_PROGRAMS]
+    programs.extend(mutations(structured_program(6), 2000))
+    accepted = 0
+    for tokens in programs:
+        for parser_class in (Parser, LL1Parser):
+            expected = outcome(parser_class, tokens)
+            assert outcome(parser_class, tokens, IRBuilder) == expected, [t.value for t in tokens]
+        accepted += expected is None
+    build_ir(Lexer().tokenize(nested_blocks(5000))).verify()
+    print(f"verificación: {len(programs)} programas, {accepted} aceptados con IR válida")
+
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    for name, code in (("estructurado", structured_program(blocks)),
+                       ("identificadores", identifier_program(blocks * 10))):
+        tokens = Lexer().tokenize(code)
+
+        start = time.perf_counter()
+        Parser(tokens).parse()
+        plain = time.perf_counter() - start
+
+        start = time.perf_counter()
+        program = build_ir(tokens)
+        lowered = time.perf_counter() - start
+
+        program.verify()
+        start = time.perf_counter()
+        text = program.dump()
+        dumped = time.perf_counter() - start
+
+        count = program.instruction_count()
+        print(f"{name:<16} {len(tokens):>8} tokens  {count:>8} instrucciones  "
+              f"{len(program.blocks):>6} bloques  {len(program.temp_types):>8} temporales")
+        print(f"{'':<16} análisis {plain:.3f}s  con IR {lowered:.3f}s (+{(lowered / plain - 1) * 100:.0f}%)  "
+              f"{count / lowered:,.0f} instr/s  volcado {dumped:.3f}s ({len(text) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Lexer: recorrido carácter a carácter frente a clases de carácter con bytes.translate.
+
+Tokeniza MB megabytes de código ASCII generado en trozos de 1 MB (los tokens
+de 100 MB no caben en memoria a la vez) con los dos caminos, comprueba que
+producen lo mismo y mide el rendimiento.
+
+Uso: python benchmarks/bench_lexer.py [MB]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, CompilerError
+from compilador.lexer import CLASS_TABLE
+from corpus import CONFORMANCE_PROGRAMS, identifier_program, structured_program
+from bench_backend import nested_loops, primes
+
+MB = 1024 * 1024
+ASCII_PROGRAMS = [program for program in CONFORMANCE_PROGRAMS if program.isascii()]
+
+
+def source_chunk(rnd: random.Random) -> str:
+    """Un mega de código con comentarios, strings y números reales entre los programas"""
+    parts, size = [], 0
+    while size < MB:
+        kind = rnd.random()
+        if kind < 0.3:
+            part = structured_program(rnd.randrange(5, 40))
+        elif kind < 0.5:
+            part = identifier_program(rnd.randrange(50, 400), rnd.randrange(5, 60))
+        elif kind < 0.6:
+            part = nested_loops(rnd.randrange(2, 9)) + primes(rnd.randrange(10, 100))
+        elif kind < 0.8:
+            part = (f"/* bloque {size}\n   de varias lineas */\n"
+                    f"string s{size} = \"texto con \\\"comillas\\\" y // no comentario\";\n"
+                    f"float f{size} = {rnd.randrange(1000)}.{rnd.randrange(1000)} * .5; // comentario\n")
+        else:
+            part = rnd.choice(ASCII_PROGRAMS)
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+def token_tuples(tokens) -> list:
+    return [(t.type, t.value, t.line, t.position, t.offset) for t in tokens]
+
+
+def outcome(lexer: Lexer, code: str) -> tuple:
+    try:
+        lexer.tokenize(code)
+        error = None
+    except CompilerError as e:
+        error = str(e)
+    return token_tuples(lexer.tokens), lexer.comments, error
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rnd = random.Random(3)
+    chunks = [source_chunk(rnd) for _ in range(min(megabytes, 8))]
+    fast, slow = Lexer(), Lexer(fast=False)
+
+    # Mismos tokens, comentarios y errores en ambos caminos, también con código
+    # roto y con caracteres no ASCII (que usan siempre el recorrido clásico)
+    checked = 0
+    for chunk in chunks[:2] + CONFORMANCE_PROGRAMS:
+        assert outcome(fast, chunk) == outcome(slow, chunk)
+        if chunk.isascii():
+            # Sin errores léxicos el camino rápido no necesita el recorrido clásico
+            assert (fast.tokenize_runs(chunk) is None) == (outcome(slow, chunk)[2] is not None)
+        checked += 1
+    for _ in range(300):
+        chunk = rnd.choice(CONFORMANCE_PROGRAMS)
+        cut = rnd.randrange(len(chunk) + 1)
+        broken = chunk[:cut] + rnd.choice(['"', "/*", "1.2.3", "#", "&", "ñ", "\\", "'"]) + chunk[cut:]
+        assert outcome(fast, broken) == outcome(slow, broken), broken
+        checked += 1
+    print(f"verificación: {checked} programas con los mismos tokens, comentarios y errores")
+
+    code = "".join(chunks)
+    start = time.perf_counter()
+    code.encode('ascii').translate(CLASS_TABLE)
+    classify = time.perf_counter() - start
+    print(f"clasificación de {len(code) / MB:.0f} MB con bytes.translate: {len(code) / MB / classify:,.0f} MB/s")
+    del code
+
+    times, total, tokens = {}, 0, 0
+    for name, lexer in (("carácter a carácter", slow), ("clases de carácter", fast)):
+        elapsed, total, tokens = 0.0, 0, 0
+        for number in range(megabytes):
+            chunk = chunks[number % len(chunks)]
+            start = time.perf_counter()
+            tokens += len(lexer.tokenize(chunk))
+            elapsed += time.perf_counter() - start
+            total += len(chunk)
+            lexer.reset()
+        times[name] = elapsed
+        print(f"{name:<20} {total / MB:6.0f} MB  {tokens:>11,} tokens  {elapsed:7.2f}s  "
+              f"{total / MB / elapsed:5.2f} MB/s  {tokens / elapsed / 1e6:5.2f} M tokens/s")
+    print(f"aceleración: x{times['carácter a carácter'] / times['clases de carácter']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
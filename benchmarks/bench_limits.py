@@ -0,0 +1,83 @@
+"""Modo de ejecución con límites: cortes garantizados, pasos iguales en ambos motores y coste.
+
+Uso: python benchmarks/bench_limits.py [escala]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer
+from compilador.ir import build_ir
+from compilador.backend import CompiledProgram, compile_ir, compile_program
+from compilador.runner import Limits, LimitExceeded, LineProfiler, run_limited
+from corpus import structured_program
+from bench_backend import nested_loops, primes, fibonacci
+
+STEPS = Limits(max_steps=2_000_000, max_seconds=5.0)
+# Elevar al cuadrado sin fin: cada paso tarda más que el anterior, así que
+# con un límite de memoria pequeño salta antes que el de tiempo
+MEMORY = Limits(max_steps=None, max_seconds=30.0, max_memory=1024 * 1024)
+
+# Programa -> (límites, límite que debe saltar)
+RUNAWAY = {
+    "int i = 0; while (true) { i += 1; }": (STEPS, "pasos"),
+    "while (true) { }": (STEPS, "pasos"),
+    "for (int i = 0; true; i += 0) { continue; }": (STEPS, "pasos"),
+    "int x = 3; while (true) { x = x * x; }": (MEMORY, "memoria"),
+}
+
+
+def engines(code: str):
+    """El programa compilado y el mismo programa en el intérprete de la IR"""
+    program = build_ir(Lexer().tokenize(code))
+    return compile_ir(program), CompiledProgram(program, None)
+
+
+def main():
+    for code, (limits, kind) in RUNAWAY.items():
+        for engine in engines(code):
+            try:
+                run_limited(engine, lambda line: None, limits)
+                raise AssertionError(f"{code!r} terminó")
+            except LimitExceeded as e:
+                assert kind in str(e), (code, str(e))
+    timed = Limits(max_steps=None, max_seconds=0.3)
+    try:
+        run_limited(compile_program("while (true) { }"), print, timed)
+    except LimitExceeded as e:
+        assert "tiempo" in str(e)
+
+    # Ambos motores cuentan los mismos pasos y el mismo perfil
+    for code in (structured_program(30), nested_loops(5), primes(100), fibonacci(50)):
+        results = []
+        for engine in engines(code):
+            output = []
+            profiler = LineProfiler()
+            monitor = run_limited(engine, output.append, Limits(), profiler)
+            results.append((output, monitor.steps, profiler.hits))
+        assert results[0] == results[1], code
+    print(f"verificación: {len(RUNAWAY)} programas sin fin cortados en ambos motores; pasos y perfiles iguales")
+
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    for name, code in (("bucles anidados", nested_loops(300 * scale)),
+                       ("primos", primes(20000 * scale)),
+                       ("fibonacci", fibonacci(100000 * scale))):
+        program = compile_program(code)
+        unlimited = Limits(None, None, None)
+        times = []
+        for limits, profiler in ((None, None), (unlimited, None), (Limits(), None), (unlimited, LineProfiler())):
+            start = time.perf_counter()
+            if limits is None:
+                program.run()
+            else:
+                monitor = run_limited(program, [].append, limits, profiler)
+            times.append(time.perf_counter() - start)
+        plain, counted, limited, profiled = times
+        print(f"{name:<16} {monitor.steps:>9} pasos  libre {plain:6.3f}s  contando {counted:6.3f}s  "
+              f"con límites {limited:6.3f}s (x{limited / plain:.1f})  perfil {profiled:6.3f}s (x{profiled / plain:.1f})")
+
+
+if __name__ == "__main__":
+    main()
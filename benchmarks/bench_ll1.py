@@ -0,0 +1,83 @@
+"""Conformidad y rendimiento del parser LL(1) frente al Parser recursivo.
+
+Uso: python benchmarks/bench_ll1.py [bloques]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, Parser, CompilerError
+from compilador.ll1_parser import LL1Parser
+from corpus import CONFORMANCE_PROGRAMS, structured_program
+
+
+def outcome(parser_class, tokens):
+    try:
+        parser_class(tokens).parse()
+        return None
+    except CompilerError as e:
+        return (e.error_type, e.message, e.line, e.position)
+
+
+def check_conformance(programs):
+    for code in programs:
+        tokens = Lexer().tokenize(code)
+        expected = outcome(Parser, tokens)
+        received = outcome(LL1Parser, tokens)
+        assert expected == received, f"{code!r}: {expected} != {received}"
+
+
+def mutated_programs(code: str, count: int, seed: int = 1):
+    """Programas con un token borrado, duplicado o intercambiado"""
+    tokens = Lexer().tokenize(code)
+    rnd = random.Random(seed)
+    for _ in range(count):
+        mutated = list(tokens)
+        i = rnd.randrange(len(mutated))
+        choice = rnd.random()
+        if choice < 0.4:
+            del mutated[i]
+        elif choice < 0.7:
+            j = rnd.randrange(len(mutated))
+            mutated[i], mutated[j] = mutated[j], mutated[i]
+        else:
+            mutated.insert(i, mutated[rnd.randrange(len(mutated))])
+        yield mutated
+
+
+def mutation_divergences(code: str, mutations: int, seed: int = 1) -> int:
+    """Cuenta programas mutados con resultados distintos en los dos parsers"""
+    return sum(outcome(Parser, mutated) != outcome(LL1Parser, mutated)
+               for mutated in mutated_programs(code, mutations, seed))
+
+
+def best_time(parser_class, tokens, repeat: int = 3) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser_class(tokens).parse()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    check_conformance(CONFORMANCE_PROGRAMS + [structured_program(20)])
+    divergent = mutation_divergences(structured_program(5), 2000)
+    print(f"conformidad: {len(CONFORMANCE_PROGRAMS) + 1} programas idénticos, "
+          f"{divergent}/2000 mutaciones con resultado distinto")
+
+    tokens = Lexer().tokenize(structured_program(blocks))
+    recursive = best_time(Parser, tokens)
+    table = best_time(LL1Parser, tokens)
+    print(f"tokens: {len(tokens)}")
+    print(f"Parser     {recursive:.3f}s  {len(tokens) / recursive:12.0f} tokens/s")
+    print(f"LL1Parser  {table:.3f}s  {len(tokens) / table:12.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Programas con anidamiento extremo: Parser recursivo frente al LL1Parser de pila explícita.
+
+Uso: python benchmarks/bench_nesting.py [niveles...]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, Parser, NestingTooDeep, parse_tokens
+from compilador.ll1_parser import LL1Parser
+
+
+def nested_blocks(depth: int) -> str:
+    """if anidados con una variable global usada en el nivel más profundo"""
+    return ("int total = 0;\n"
+            + "if (true) {\n" * depth
+            + "total += 1;\n"
+            + "}\n" * depth
+            + "print(total);\n")
+
+
+def nested_parentheses(depth: int) -> str:
+    return "int x = " + "(" * depth + "1" + ")" * depth + ";\nprint(x);\n"
+
+
+def measure(parser_class, tokens) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    parser = parser_class(tokens)
+    parser.parse()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return parser, elapsed, peak
+
+
+def main():
+    levels = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    for depth in levels:
+        for name, build in (("bloques", nested_blocks), ("paréntesis", nested_parentheses)):
+            tokens = Lexer().tokenize(build(depth))
+
+            try:
+                Parser(tokens).parse()
+                recursive = "ok"
+            except NestingTooDeep as e:
+                recursive = f"NestingTooDeep en línea {e.line}"
+
+            parser, elapsed, peak = measure(LL1Parser, tokens)
+            assert len(parser.scope_stack) == 1 and parser.get_variable(parser.tokens[1].value).used
+            assert parse_tokens(tokens)[1] is None
+
+            print(f"{name:<11} {depth:>7} niveles  {len(tokens):>8} tokens  "
+                  f"LL1 {elapsed * 1000:9.1f} ms  pico {peak / 1024:9.1f} KiB  recursivo: {recursive}")
+
+
+if __name__ == "__main__":
+    main()
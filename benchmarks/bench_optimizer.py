@@ -0,0 +1,192 @@
+"""Optimización de bucles: misma salida con y sin optimizar, estadísticas y aceleración.
+
+Uso: python benchmarks/bench_optimizer.py [programas aleatorios]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer
+from compilador.ir import build_ir
+from compilador.interpreter import ExecutionError
+from compilador.backend import CompiledProgram, compile_ir
+from compilador.optimizer import optimize
+from compilador.runner import Limits, LimitExceeded, run_limited
+from corpus import CONFORMANCE_PROGRAMS, structured_program
+from bench_backend import nested_loops, primes, fibonacci
+
+INTS = ['a', 'b', 'c', 'n']
+ASSIGNABLE = ['a', 'b', 'c']  # n solo se lee: los límites de los bucles no crecen
+FLOATS = ['f', 'g']
+COUNTED = [('<', 1), ('<=', 1), ('>', -1), ('>=', -1)]
+
+
+class RandomProgram:
+    """Programas válidos y que terminan, con muchos bucles contados e invariantes"""
+
+    def __init__(self, rnd: random.Random):
+        self.rnd = rnd
+        self.lines = []
+        self.loops = 0
+
+    def generate(self) -> str:
+        rnd = self.rnd
+        for name in INTS:
+            self.lines.append(f"int {name} = {rnd.randrange(0, 10) if name in ASSIGNABLE else rnd.randrange(1, 6)};")
+        for name in FLOATS:
+            self.lines.append(f"float {name} = {rnd.randrange(0, 9)}.5;")
+        self.statements(INTS, 5, 0, False)
+        self.lines.append("print(" + " + ".join(INTS) + ");")
+        for name in FLOATS:
+            self.lines.append(f"print({name});")
+        return "\n".join(self.lines) + "\n"
+
+    def expression(self, names: list) -> str:
+        rnd = self.rnd
+        left = rnd.choice(names)
+        for _ in range(rnd.randrange(0, 3)):
+            operator = rnd.choice(['+', '-', '*', '/'])
+            right = str(rnd.randrange(1, 4)) if operator in '*/' else rnd.choice(names + ['1', '2'])
+            left = f"({left} {operator} {right})"
+        return left
+
+    def statements(self, names: list, count: int, depth: int, in_for: bool):
+        rnd = self.rnd
+        indent = "    " * depth
+        assignable = ASSIGNABLE
+        for _ in range(count):
+            kind = rnd.random()
+            if kind < 0.25 and depth < 3:
+                self.loops += 1
+                loop = f"i{self.loops}"
+                operator, sign = rnd.choice(COUNTED)
+                amount = rnd.randrange(1, 3)
+                # El paso con asignación compuesta o con la asignación completa
+                if rnd.random() < 0.5:
+                    step = f"+= {amount}" if sign > 0 else f"-= {amount}"
+                else:
+                    step = f"= {loop} {'+' if sign > 0 else '-'} {amount}"
+                start, bound = (0, rnd.choice(['4', 'n', '(n * 2)'])) if sign > 0 else \
+                    (rnd.randrange(3, 7), rnd.choice(['0', '(n - 3)', '(0 - 2)']))
+                self.lines.append(f"{indent}for (int {loop} = {start}; {loop} {operator} {bound}; "
+                                  f"{loop} {step}) {{")
+                self.statements(names + [loop], 3, depth + 1, True)
+                self.lines.append(f"{indent}}}")
+            elif kind < 0.35 and depth < 3:
+                self.loops += 1
+                counter = f"w{self.loops}"
+                self.lines.append(f"{indent}int {counter} = 0;")
+                self.lines.append(f"{indent}while ({counter} < {rnd.randrange(1, 5)}) {{")
+                self.statements(names, 2, depth + 1, False)
+                self.lines.append(f"{indent}    {counter} += 1;")
+                self.lines.append(f"{indent}}}")
+            elif kind < 0.5:
+                target = rnd.choice(assignable)
+                self.lines.append(f"{indent}{target} = {self.expression(names)} - {target};")
+            elif kind < 0.6:
+                target = rnd.choice(assignable)
+                self.lines.append(f"{indent}{target} {rnd.choice(['+=', '-='])} {rnd.randrange(1, 4)};")
+            elif kind < 0.7:
+                target = rnd.choice(FLOATS)
+                self.lines.append(f"{indent}{target} += {rnd.choice(['1', '0.5', self.expression(names)])};")
+            elif kind < 0.8:
+                self.lines.append(f"{indent}if ({self.expression(names)} > {self.expression(names)}) {{")
+                if in_for and rnd.random() < 0.5:
+                    self.lines.append(f"{indent}    {rnd.choice(['break', 'continue'])};")
+                else:
+                    self.statements(names, 1, depth + 1, in_for)
+                self.lines.append(f"{indent}}} else {{")
+                self.statements(names, 1, depth + 1, in_for)
+                self.lines.append(f"{indent}}}")
+            else:
+                self.lines.append(f"{indent}print({self.expression(names)});")
+
+
+LIMITS = Limits(1_000_000, None, None)
+
+
+def outputs(engine: CompiledProgram) -> tuple:
+    """(líneas impresas, si terminó antes del límite de pasos)"""
+    output = []
+    try:
+        run_limited(engine, output.append, LIMITS)
+    except LimitExceeded:
+        return output, False
+    except ExecutionError as e:
+        output.append(str(e))
+    return output, True
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    rnd = random.Random(11)
+    sources = CONFORMANCE_PROGRAMS + [structured_program(20), nested_loops(10), primes(100), fibonacci(80)]
+    sources += [RandomProgram(rnd).generate() for _ in range(count)]
+    totals = {}
+    checked = endless = 0
+    for source in sources:
+        try:
+            program = build_ir(Lexer().tokenize(source))
+        except Exception:
+            continue
+        optimized = optimize(program)
+        optimized.verify()
+        engines = (CompiledProgram(optimized, None), compile_ir(program), compile_ir(program, optimized=False))
+        expected, finished = outputs(CompiledProgram(program, None))
+        if not finished:
+            # Solo los programas del corpus escritos para no terminar; en los
+            # demás motores tampoco pueden terminar (lo impreso depende de los pasos)
+            assert source in CONFORMANCE_PROGRAMS, f"no termina:\n{source}"
+            for engine in engines:
+                assert not outputs(engine)[1], source
+            endless += 1
+            continue
+        for engine in engines:
+            assert outputs(engine) == (expected, True), source
+        for name, value in optimized.optimizations.items():
+            totals[name] = totals.get(name, 0) + value
+        checked += 1
+    assert checked >= count, checked
+    print(f"verificación: {checked} programas con la misma salida en los cuatro motores "
+          f"({endless} del corpus sin terminar en ninguno); "
+          + ", ".join(f"{name} {value}" for name, value in totals.items()))
+
+    for name, code in (("bucles anidados", nested_loops(600)),
+                       ("primos", primes(20000)),
+                       ("fibonacci", fibonacci(100000)),
+                       ("invariantes", invariant_loops(200))):
+        program = build_ir(Lexer().tokenize(code))
+        optimized = optimize(program)
+        times = []
+        for engine in (CompiledProgram(program, None), CompiledProgram(optimized, None),
+                       compile_ir(program, optimized=False), compile_ir(program)):
+            best = float('inf')
+            for _ in range(3):
+                start = time.perf_counter()
+                engine.run()
+                best = min(best, time.perf_counter() - start)
+            times.append(best)
+        stats = " ".join(f"{value}" for value in optimized.optimizations.values())
+        print(f"{name:<16} intérprete {times[0]:6.3f}s -> {times[1]:6.3f}s (x{times[0] / times[1]:.2f})  "
+              f"backend {times[2]:6.3f}s -> {times[3]:6.3f}s (x{times[2] / times[3]:.2f})  "
+              f"[incrementos/invariantes/contados: {stats}]")
+
+
+def invariant_loops(n: int) -> str:
+    """Bucles contados cuyo cuerpo repite un cálculo que no depende del bucle"""
+    return (f"int n = {n};\n"
+            f"int scale = 3;\n"
+            f"int total = 0;\n"
+            f"for (int i = 0; i < n; i += 1) {{\n"
+            f"    for (int j = 0; j <= (n / 2); j += 1) {{\n"
+            f"        total = total + ((((scale * n) + (scale * scale)) - n) + j);\n"
+            f"    }}\n"
+            f"}}\n"
+            f"print(total);\n")
+
+
+if __name__ == "__main__":
+    main()
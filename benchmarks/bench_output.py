@@ -0,0 +1,68 @@
+"""Salida de print: escritura línea a línea frente a lotes, y memoria acotada sin consumidor.
+
+Uso: python benchmarks/bench_output.py [líneas]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador.backend import compile_program
+from compilador.output import OutputBuffer, stream_sink
+
+
+def printing_program(lines: int) -> str:
+    return (f"int i = 0;\n"
+            f"while (i < {lines}) {{\n"
+            f"    print(i * 3);\n"
+            f"    i += 1;\n"
+            f"}}\n")
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    program = compile_program(printing_program(lines))
+
+    # Las dos formas escriben exactamente lo mismo
+    small = compile_program(printing_program(2500))
+    collected = []
+    output = OutputBuffer(collected.extend, batch_size=100)
+    small.run(output.write)
+    output.flush()
+    assert collected == small.run() and output.dropped == 0
+
+    with open(os.devnull, 'w') as devnull:
+        def line_by_line(line):
+            devnull.write(line + "\n")
+            devnull.flush()
+
+        start = time.perf_counter()
+        program.run(line_by_line)
+        direct = time.perf_counter() - start
+
+        output = OutputBuffer(stream_sink(devnull))
+        start = time.perf_counter()
+        program.run(output.write)
+        output.flush()
+        batched = time.perf_counter() - start
+    print(f"{lines} líneas  línea a línea {direct:.3f}s  por lotes {batched:.3f}s  x{direct / batched:.1f}")
+
+    # Sin nadie que consuma, la memoria queda acotada por la capacidad del anillo
+    for capacity in (1000, 10000):
+        output = OutputBuffer(capacity=capacity)
+        tracemalloc.start()
+        program.run(output.write)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert len(output.lines) == capacity and output.dropped == lines - capacity
+        print(f"sin consumidor, capacidad {capacity:>6}: pico {peak / 1024:8.0f} KiB, "
+              f"{output.dropped} líneas descartadas")
+    kept = program.run()
+    print(f"referencia sin límite (lista): {len(kept)} líneas en memoria, "
+          f"{sum(map(sys.getsizeof, kept)) / 1024:.0f} KiB de cadenas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Actualización por diferencias de las vistas de resultados frente a reescribirlas enteras.
+
+Simula ediciones de una línea sobre un programa grande y mide cuántas líneas
+de tokens hay que reescribir (Tk) o enviar por el websocket (Flet) y el
+coste de calcular la diferencia.
+
+Uso: python benchmarks/bench_result_diff.py [bloques] [ediciones]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, CompilerError
+from compilador.diffing import changed_range, same_token
+from corpus import structured_program
+
+
+def edit(source: str, rnd: random.Random) -> str:
+    """Una edición local típica: cambiar un número, añadir o borrar una línea, o espacios"""
+    lines = source.split('\n')
+    index = rnd.randrange(len(lines))
+    choice = rnd.random()
+    if choice < 0.4:
+        lines[index] = lines[index].replace('1', '7', 1)
+    elif choice < 0.6:
+        lines.insert(index, f"int nueva{rnd.randrange(10 ** 6)} = 1;")
+    elif choice < 0.8:
+        del lines[index]
+    else:
+        lines[index] = "  " + lines[index]
+    return '\n'.join(lines)
+
+
+def tokenize(source: str) -> list:
+    try:
+        return Lexer().tokenize(source)
+    except CompilerError:
+        return []
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rnd = random.Random(3)
+    source = structured_program(blocks)
+    shown_tokens = tokenize(source)
+    shown = [str(token) for token in shown_tokens]  # Líneas que muestra la vista
+
+    rewritten = full = sent_bytes = full_bytes = 0
+    per_edit = []
+    diff_time = render_time = 0.0
+    for _ in range(edits):
+        source = edit(source, rnd)
+        tokens = tokenize(source)
+        start = time.perf_counter()
+        change = changed_range(shown_tokens, tokens, same_token)
+        diff_time += time.perf_counter() - start
+        full += len(tokens)
+        full_bytes += sum(len(line) + 1 for line in map(str, tokens))
+        if change is not None:
+            begin, old_end, new_end = change
+            start = time.perf_counter()
+            lines = [str(token) for token in tokens[begin:new_end]]
+            render_time += time.perf_counter() - start
+            shown[begin:old_end] = lines
+            rewritten += len(lines)
+            sent_bytes += sum(len(line) + 1 for line in lines)
+            per_edit.append(len(lines))
+        else:
+            per_edit.append(0)
+        shown_tokens = tokens
+        assert shown == [str(token) for token in tokens]  # El parche deja la vista igual que redibujarla
+
+    print(f"{edits} ediciones sobre {len(shown_tokens):,} tokens: vista idéntica a redibujarla tras cada una")
+    print(f"líneas reescritas por compilación: {rewritten / edits:,.0f} de {full / edits:,.0f} "
+          f"({rewritten / full * 100:.1f}%); datos enviados {sent_bytes / edits / 1024:,.1f} KiB "
+          f"en lugar de {full_bytes / edits / 1024:,.1f} KiB")
+    # Añadir o quitar una línea cambia el número de línea de todos los tokens
+    # siguientes; las ediciones dentro de una línea solo tocan esa línea
+    per_edit.sort()
+    print(f"mediana {per_edit[len(per_edit) // 2]:,} líneas; {sum(n < 50 for n in per_edit)} de {edits} "
+          f"ediciones reescribieron menos de 50")
+    print(f"coste por compilación: diferencia {diff_time / edits * 1000:.1f} ms, "
+          f"texto de los tokens cambiados {render_time / edits * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Árbol de ámbitos del parser: igual en Parser y LL1Parser, coste del análisis y de la pestaña.
+
+La pestaña "Tokens Tree" antes insertaba un nodo por token al mostrarse; ahora
+inserta el ámbito global y la primera página de sus hijos.
+
+Uso: python benchmarks/bench_scopes.py [bloques]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, Parser, LL1Parser
+from compilador.m_token import Variable
+from corpus import CONFORMANCE_PROGRAMS, identifier_program, structured_program
+from bench_nesting import nested_blocks
+from gui import TREE_PAGE
+
+
+class FlatParser(Parser):
+    """Parser con la pila de ámbitos anterior, sin árbol"""
+
+    def push_scope(self):
+        self.scope_stack.append({})
+
+    def pop_scope(self):
+        for name in self.scope_stack.pop():
+            self.symbols[name].pop()
+
+    def declare_variable(self, name: str, type_: str, initialized: bool = False):
+        var = self.scope_stack[-1][name] = Variable(name, type_, initialized)
+        self.symbols.setdefault(name, []).append(var)
+        self.flow.declare(var, self.current_token())
+        return var
+
+
+def describe(scope, tokens) -> list:
+    """Recorrido en preorden sin recursión: los árboles profundos no agotan la pila"""
+    rows, stack = [], [(scope, 0)]
+    while stack:
+        scope, depth = stack.pop()
+        rows.append((depth, scope.keyword(tokens), scope.start, scope.end, scope.lines(tokens),
+                     [(token.value, token.line) for token in scope.declarations], list(scope.variables)))
+        stack.extend((child, depth + 1) for child in reversed(scope.children))
+    return rows
+
+
+def check(scope, tokens):
+    """Cada ámbito está entre sus delimitadores y dentro de su padre"""
+    stack = [scope]
+    while stack:
+        scope = stack.pop()
+        if scope.parent is not None:
+            assert tokens[scope.start - 1].value in '({' and scope.parent.start <= scope.start
+            if scope.end is not None:
+                assert tokens[scope.end - 1].value == '}' and scope.end <= (scope.parent.end or scope.end)
+        assert [token.value for token in scope.declarations] == list(scope.variables)
+        stack.extend(scope.children)
+
+
+def timed(parser_class, tokens) -> tuple:
+    parser = parser_class(tokens)
+    start = time.perf_counter()
+    parser.parse()
+    return parser, time.perf_counter() - start
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    programs = CONFORMANCE_PROGRAMS + [structured_program(40), nested_blocks(300)]
+    for source in programs:
+        tokens = Lexer().tokenize(source)
+        trees = []
+        for parser_class in (Parser, LL1Parser):
+            parser = parser_class(tokens)
+            try:
+                parser.parse()
+            except Exception:
+                pass  # El árbol parcial también debe coincidir
+            check(parser.scope_tree, tokens)
+            trees.append(describe(parser.scope_tree, tokens))
+        assert trees[0] == trees[1], source
+    print(f"verificación: {len(programs)} programas, mismo árbol de ámbitos en Parser y LL1Parser")
+
+    source = structured_program(blocks) + identifier_program(blocks * 2)
+    tokens = Lexer().tokenize(source)
+    parser, with_tree = timed(Parser, tokens)
+    _, without_tree = min((timed(FlatParser, tokens) for _ in range(2)), key=lambda run: run[1])
+    _, with_tree = min([(parser, with_tree), timed(Parser, tokens)], key=lambda run: run[1])
+    scopes = len(describe(parser.scope_tree, tokens))
+    print(f"{len(tokens):,} tokens, {scopes:,} ámbitos: análisis {with_tree:.2f}s con árbol, "
+          f"{without_tree:.2f}s sin árbol ({(with_tree / without_tree - 1) * 100:+.1f}%)")
+
+    root = parser.scope_tree
+    first_page = 1 + min(TREE_PAGE, len(root.declarations) + len(root.children)) + 1
+    print(f"nodos insertados al abrir la pestaña: {len(tokens):,} antes (uno por token), {first_page} ahora")
+
+
+if __name__ == "__main__":
+    main()
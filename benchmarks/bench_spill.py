@@ -0,0 +1,218 @@
+"""Compilación con memoria acotada: mismos resultados que en memoria y pico de memoria residente.
+
+Comprueba que StructuredFlow da los diagnósticos del grafo completo, que
+tokenizar por trozos da los mismos tokens y errores aunque los cortes caigan
+dentro de comentarios y strings, y compila en un proceso aparte un programa
+más grande que el límite de memoria, midiendo su pico de memoria residente
+frente a la compilación en memoria.
+
+Uso: python benchmarks/bench_spill.py [MB del programa] [límite en MB]
+"""
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador import Lexer, Parser, CompilerError
+from compilador.dataflow import StructuredFlow
+from compilador.spill import TokenStore, compile_file, tokenize_file
+from corpus import CONFORMANCE_PROGRAMS, structured_program
+from bench_dataflow import EXPECTED, mutated_programs
+
+# Comentarios y strings de varias líneas y texto no ASCII para los cortes entre trozos
+PIECES = """int total = 0; /* un comentario
+que sigue
+   en varias líneas */ string s = "texto
+con saltos"; print(s);
+string ñ = 'año'; // comentario de línea
+print(ñ); boolean flag = true;
+"""
+LEXICAL_ERRORS = [PIECES + "int x = 1;\n/* sin cerrar\n\n", PIECES * 3 + "print('sin cerrar);\n",
+                  PIECES + "int y = 2 # 3;\n" + PIECES]
+
+
+def scoped_block(b: int) -> str:
+    """Bloque de structured_program con sus variables locales, que se liberan al cerrarlo"""
+    return f"""if (flag) {{
+    int n = {b % 17};
+    float f = n * 1.5;
+    string s = "bloque
+{b}";
+    /* comentario
+       de varias líneas */
+    for (int i = 0; i < {b % 17 + 3}; i += 1) {{
+        if (i == {b % 5} && flag) {{
+            continue;
+        }} else {{
+            total = total + i * n; // acumulado
+        }}
+        while (f > 100.0) {{
+            f -= 1;
+            break;
+        }}
+    }}
+    print(s);
+    print(f + total);
+}}
+"""
+
+
+def write_program(path: str, size: int):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write("int total = 0;\nboolean flag = true;\n")
+        block = 0
+        while file.tell() < size:
+            file.write(scoped_block(block))
+            block += 1
+        file.write("print(flag);\n")
+
+
+def diagnostics(tokens, flow_class=None) -> list:
+    parser = Parser(tokens, flow_class) if flow_class else Parser(tokens)
+    try:
+        parser.parse()
+    except CompilerError as e:
+        return [(d.message, d.line, d.position) for d in parser.diagnostics or [e]]
+    return []
+
+
+def error_key(error: CompilerError) -> tuple:
+    return error.message, error.line, error.position, error.offset
+
+
+def check_flow() -> int:
+    programs = [Lexer().tokenize(code) for code in CONFORMANCE_PROGRAMS + list(EXPECTED)]
+    programs.extend(mutated_programs(structured_program(6), 2000))
+    programs.extend(mutated_programs(''.join(map(scoped_block, range(4))), 1000, seed=3))
+    for tokens in programs:
+        assert diagnostics(tokens) == diagnostics(tokens, StructuredFlow), [t.value for t in tokens]
+    return len(programs)
+
+
+def check_pieces(directory: str) -> int:
+    """tokenize_file con trozos pequeños frente a Lexer.tokenize del código entero"""
+    checked = 0
+    rnd = random.Random(5)
+    sources = [PIECES * 20, structured_program(30)] + LEXICAL_ERRORS
+    path = os.path.join(directory, 'trozos.txt')
+    for source in sources:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(source)
+        try:
+            expected = [token.as_row() for token in Lexer().tokenize(source)]
+        except CompilerError as e:
+            expected = error_key(e)
+        for piece_size in [1, 7, 40, 333] + [rnd.randrange(2, 200) for _ in range(10)]:
+            with TokenStore(window=0, directory=directory) as store:
+                try:
+                    tokenize_file(path, store, piece_size)
+                    received = [token.as_row() for token in store.finish()]
+                except CompilerError as e:
+                    received = error_key(e)
+            assert received == expected, (source[:40], piece_size)
+            checked += 1
+    return checked
+
+
+def check_compile(directory: str) -> int:
+    """compile_file frente a compilar en memoria, con errores después del primer trozo"""
+    big = structured_program(300)
+    sources = CONFORMANCE_PROGRAMS + [
+        big, big + "int sin_usar;\n", big + "int z;\nprint(z);\n", big + "print(;\n", big + "#\n",
+        ''.join(map(scoped_block, range(2000))) + "if (flag) { int w; while (flag) { print(w); } }\n",
+    ]
+    path = os.path.join(directory, 'programa.txt')
+    for source in sources:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(source)
+        try:
+            expected = diagnostics(Lexer().tokenize(source))
+        except CompilerError as e:
+            expected = [(e.message, e.line, e.position)]
+        result = compile_file(path, max_memory=1024 * 1024, directory=directory)
+        received = [(d.message, d.line, d.position) for d in result['diagnostics']]
+        assert received == expected, (source[-60:], received, expected)
+        assert result['ok'] == (not expected)
+    return len(sources)
+
+
+def peak_rss() -> int:
+    """Pico de memoria residente del proceso en bytes.
+
+    ru_maxrss conserva en Linux el pico del proceso padre anterior al exec,
+    así que se prefiere VmHWM, que es del proceso actual.
+    """
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KB en Linux
+
+
+def child(mode: str, path: str, max_memory: int):
+    """Compilación medida en su propio proceso, para que el pico de memoria sea solo suyo"""
+    start = time.perf_counter()
+    if mode == 'memoria':
+        with open(path, encoding='utf-8') as file:
+            tokens = Lexer().tokenize(file.read())
+        Parser(tokens).parse()
+        result = {'tokens': len(tokens), 'ok': True}
+    else:
+        result = compile_file(path, max_memory, os.path.dirname(path))
+        result['diagnostics'] = [str(d) for d in result['diagnostics']]
+    result['elapsed'] = time.perf_counter() - start
+    result['peak'] = peak_rss()
+    print(json.dumps(result))
+
+
+def measure(mode: str, path: str, max_memory: int = 0) -> dict:
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, path, str(max_memory)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    if sys.argv[1:2] == ['--child']:
+        child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+        return
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 48
+    mb = 1024 * 1024
+
+    print(f"análisis en una pasada: {check_flow()} programas con los mismos diagnósticos que el grafo")
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"lexer por trozos: {check_pieces(directory)} combinaciones de programa y tamaño de trozo "
+              f"con los mismos tokens o el mismo error")
+        print(f"compilación acotada: {check_compile(directory)} programas con los mismos diagnósticos que en memoria")
+
+        path = os.path.join(directory, 'grande.txt')
+        small = max(size // 8, 1)
+        write_program(path, small * mb)
+        memory = measure('memoria', path)
+        bounded = measure('acotada', path, limit * mb)
+        assert bounded['ok'] and bounded['tokens'] == memory['tokens']
+        print(f"{small} MB ({memory['tokens']:,} tokens): en memoria pico {memory['peak'] / mb:.0f} MB "
+              f"en {memory['elapsed']:.1f}s; acotada a {limit} MB pico {bounded['peak'] / mb:.0f} MB "
+              f"en {bounded['elapsed']:.1f}s")
+
+        write_program(path, size * mb)
+        bounded = measure('acotada', path, limit * mb)
+        assert bounded['ok'], bounded['diagnostics']
+        assert bounded['peak'] < limit * mb, bounded['peak']
+        print(f"{size} MB ({bounded['tokens']:,} tokens, {bounded['lines']:,} líneas) acotada a {limit} MB: "
+              f"pico {bounded['peak'] / mb:.0f} MB en {bounded['elapsed']:.1f}s; "
+              f"{bounded['chunks']:,} bloques de tokens, {bounded['spilled_bytes'] / mb:.0f} MB en disco, "
+              f"{bounded['loads']:,} lecturas de bloque")
+
+
+if __name__ == "__main__":
+    main()
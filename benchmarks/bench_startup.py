@@ -0,0 +1,64 @@
+"""Mide el coste de arranque: importación del núcleo y tiempo hasta la primera ventana.
+
+Uso: python benchmarks/bench_startup.py [repeticiones]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Reproduce run.main hasta que la ventana se dibuja por primera vez
+FIRST_WINDOW = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+from gui import CompilerGUI
+root = tk.Tk()
+app = CompilerGUI(root)
+root.update()
+print(time.perf_counter() - start)
+root.destroy()
+"""
+
+
+def import_time_us(module: str) -> int:
+    """Tiempo acumulado de importación de un módulo según python -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    for line in reversed(result.stderr.splitlines()):
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    return 0
+
+
+def first_window_seconds() -> float:
+    result = subprocess.run([sys.executable, '-c', FIRST_WINDOW],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip())
+
+
+def best_of(repeat: int, measure):
+    values = [measure() for _ in range(repeat)]
+    values = [v for v in values if v is not None]
+    return min(values) if values else None
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for module in ('compilador', 'tkinter', 'gui'):
+        us = best_of(repeat, lambda: import_time_us(module))
+        print(f"import {module:<12} {us / 1000:8.2f} ms")
+
+    seconds = best_of(repeat, first_window_seconds)
+    if seconds is None:
+        print("primera ventana: no disponible (sin display)")
+    else:
+        print(f"primera ventana       {seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
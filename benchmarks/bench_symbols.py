@@ -0,0 +1,121 @@
+"""Índice de símbolos: construcción sobre muchos archivos, actualización incremental y consultas.
+
+Uso: python benchmarks/bench_symbols.py [archivos]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador.symbols import SymbolIndex, collect_symbols
+from corpus import CONFORMANCE_PROGRAMS, identifier_program, structured_program
+from bench_backend import nested_loops, primes, fibonacci
+
+SHADOWING = ("int total = 0;\n"
+             "for (int i = 0; i < 3; i += 1) {\n"
+             "    int total = i;\n"
+             "    total += 1;\n"
+             "}\n"
+             "print(total);\n")
+
+
+def project_sources(count: int, rnd: random.Random) -> list:
+    """Programas de tamaños variados, con algunos erróneos como en un proyecto en curso"""
+    makers = [lambda: structured_program(rnd.randrange(1, 15)),
+              lambda: identifier_program(rnd.randrange(10, 120), rnd.randrange(5, 40)),
+              lambda: nested_loops(rnd.randrange(2, 9)),
+              lambda: primes(rnd.randrange(10, 100)),
+              lambda: fibonacci(rnd.randrange(10, 100)),
+              lambda: rnd.choice(CONFORMANCE_PROGRAMS)]
+    return [rnd.choice(makers)() for _ in range(count)]
+
+
+def write_project(root: str, sources: list) -> list:
+    paths = []
+    for number, source in enumerate(sources):
+        folder = os.path.join(root, f"modulo{number // 500:03d}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"programa{number:05d}.txt")
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(source)
+        paths.append(path)
+    return paths
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rnd = random.Random(5)
+    sources = project_sources(count, rnd)
+    with tempfile.TemporaryDirectory() as root:
+        paths = write_project(os.path.join(root, 'proyecto'), sources)
+        with SymbolIndex(os.path.join(root, 'indice.sqlite')) as index:
+            start = time.perf_counter()
+            index.update_directory(os.path.join(root, 'proyecto'))
+            full = time.perf_counter() - start
+            files, declarations, references = index.counts()
+            assert files == count and index.stats['parsed'] == count
+            print(f"construcción: {count} archivos en {full:.2f}s ({count / full:,.0f} archivos/s), "
+                  f"{declarations} declaraciones, {references} referencias, {len(index.errors())} con errores")
+
+            # El índice coincide con lo que recoge el parser en memoria
+            for path, source in rnd.sample(list(zip(paths, sources)), 50):
+                collector, _ = collect_symbols(source)
+                for symbol in collector.symbols(path):
+                    if symbol.kind == 'declaration':
+                        continue
+                    definition = index.go_to_definition(path, symbol.line, symbol.position + len(symbol.name) - 1)
+                    assert definition is not None and definition.path == path and definition.name == symbol.name
+                    assert symbol in index.find_references(path, definition.line, definition.position)
+
+            start = time.perf_counter()
+            index.update_directory(os.path.join(root, 'proyecto'))
+            unchanged = time.perf_counter() - start
+            assert index.stats['parsed'] == 0 and index.stats['unchanged'] == count
+
+            # Un 1 % de los archivos cambia, otro 1 % solo cambia de fecha y uno desaparece
+            changed = rnd.sample(paths, max(1, count // 100))
+            for path in changed:
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write(SHADOWING)
+            touched = [path for path in rnd.sample(paths, max(1, count // 100)) if path not in changed]
+            for path in touched:
+                os.utime(path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+            removed = next(path for path in paths if path not in changed and path not in touched)
+            os.remove(removed)
+            start = time.perf_counter()
+            index.update_directory(os.path.join(root, 'proyecto'))
+            incremental = time.perf_counter() - start
+            assert index.stats == {'parsed': len(changed), 'unchanged': count - 1 - len(changed),
+                                   'removed': 1}, index.stats
+            assert index.counts()[0] == count - 1
+            print(f"sin cambios: {unchanged * 1000:.0f} ms; con {len(changed)} modificados, "
+                  f"{len(touched)} tocados y 1 borrado: {incremental * 1000:.0f} ms")
+
+            # Ocultación: cada total resuelve a su propia declaración
+            path = changed[0]
+            outer = index.find_references(path, 1, 4)
+            inner = index.find_references(path, 4, 4)
+            assert [(s.kind, s.line) for s in outer] == [('declaration', 1), ('read', 6)], outer
+            assert [(s.kind, s.line) for s in inner] == [('declaration', 3), ('update', 4)], inner
+            assert index.go_to_definition(removed, 1, 4) is None
+            assert len(index.declarations('total')) >= 2 * len(changed)
+
+            start = time.perf_counter()
+            names = [f"v{number}" for number in range(40)] + ['total', 'i', 'n']
+            for _ in range(10):
+                for name in names:
+                    index.declarations(name)
+                    index.references(name)
+            lookups = (time.perf_counter() - start) / (20 * len(names))
+            start = time.perf_counter()
+            for path in changed:
+                index.find_references(path, 4, 4)
+            navigation = (time.perf_counter() - start) / len(changed)
+            print(f"consultas: por nombre {lookups * 1000:.2f} ms, buscar referencias {navigation * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Prueba de carga del modo web: clientes simulados compilando a la vez contra un WebCompiler.
+
+Cada cliente es una sesión que alterna tiempo de escritura y compilaciones:
+unas veces un ejemplo de clase que compilan todos, otras su propio programa.
+Se mide la latencia desde que la sesión pide la compilación hasta que tiene
+el resultado, con la caché compartida y sin ella.
+
+Uso: python benchmarks/bench_web.py [clientes] [compilaciones por cliente]
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compile_worker import compile_source
+from corpus import CONFORMANCE_PROGRAMS, structured_program
+from corpus_check import percentile
+from web_compiler import RateLimiter, Session, WebCompiler
+
+EXAMPLES = CONFORMANCE_PROGRAMS[:12]  # Lo que compila toda la clase
+THINK = (0.5, 2.0)  # Segundos de escritura entre compilaciones
+
+
+def without_time(result: dict) -> dict:
+    return {key: value for key, value in result.items() if key != 'elapsed_ms'}
+
+
+async def client(number: int, compiler: WebCompiler, compiles: int, latencies: list, checks: list):
+    rnd = random.Random(number)
+    session = Session(compiler)
+    own = structured_program(rnd.randrange(5, 30))
+    await asyncio.sleep(rnd.uniform(0, THINK[1]))  # Los alumnos no llegan a la vez
+    for attempt in range(compiles):
+        if rnd.random() < 0.6:
+            source = rnd.choice(EXAMPLES)
+        else:
+            own += f"int cliente{number}_{attempt} = {attempt};\nprint(cliente{number}_{attempt});\n"
+            source = own
+        start = time.perf_counter()
+        result = await session.compile(source)
+        latencies.append(time.perf_counter() - start)
+        assert result is not None and not result.get('limited'), result
+        if rnd.random() < 0.05:
+            checks.append((source, result))
+        await asyncio.sleep(rnd.uniform(*THINK))
+
+
+async def load(clients: int, compiles: int, cache_size: int) -> tuple:
+    compiler = WebCompiler(cache_size=cache_size)
+    try:
+        latencies, checks = [], []
+        start = time.perf_counter()
+        await asyncio.gather(*(client(number, compiler, compiles, latencies, checks)
+                               for number in range(clients)))
+        elapsed = time.perf_counter() - start
+    finally:
+        compiler.close()
+    for source, result in checks:
+        assert without_time(result) == without_time(compile_source(source))
+    return latencies, compiler.stats, elapsed
+
+
+async def session_rules():
+    compiler = WebCompiler()
+    try:
+        # Ráfaga: BURST compilaciones seguidas y después el límite
+        session = Session(compiler, RateLimiter(rate=2.0, burst=5))
+        results = [await session.compile(f"int x = {n};\nprint(x);\n") for n in range(20)]
+        limited = sum(bool(result.get('limited')) for result in results)
+        assert 13 <= limited <= 15, limited
+
+        # Dos peticiones seguidas de la misma pestaña: solo cuenta la última
+        session = Session(compiler)
+        first, second = await asyncio.gather(session.compile(structured_program(40)),
+                                             session.compile("int y = 2;\nprint(y);\n"))
+        assert first is None and second['ok']
+
+        # Misma fuente desde cien sesiones a la vez: una sola compilación
+        before = compiler.stats['compiles']
+        source = structured_program(60)
+        results = await asyncio.gather(*(Session(compiler).compile(source) for _ in range(100)))
+        assert compiler.stats['compiles'] == before + 1 and all(result is results[0] for result in results)
+        return limited
+    finally:
+        compiler.close()
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    compiles = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    limited = asyncio.run(session_rules())
+    print(f"sesiones: {limited}/20 compilaciones de una ráfaga rechazadas por el límite, "
+          f"la petición sustituida devuelve None, 100 peticiones iguales a la vez compilan una vez")
+
+    for label, cache_size in (("con caché", 1024), ("sin caché", 0)):
+        latencies, stats, elapsed = asyncio.run(load(clients, compiles, cache_size))
+        print(f"{clients} clientes {label}: {len(latencies)} compilaciones en {elapsed:.1f}s; "
+              f"latencia p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+              f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms, "
+              f"máx {max(latencies) * 1000:.0f} ms; compiladas {stats['compiles']}, "
+              f"de la caché {stats['hits']}, compartidas en curso {stats['shared']}")
+
+
+if __name__ == "__main__":
+    main()
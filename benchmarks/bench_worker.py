@@ -0,0 +1,77 @@
+"""Compara latencia en frío (un proceso por compilación) contra workers persistentes.
+
+Uso: python benchmarks/bench_worker.py [compilaciones]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from compile_worker import WorkerPool
+
+WORKER = os.path.join(ROOT, 'compile_worker.py')
+SOURCE = "int a = 1;\nint b = a + 2;\nwhile (b > 0) {\n    b -= 1;\n}\nprint(b);\n"
+
+
+def request_line(i: int) -> bytes:
+    return (json.dumps({'id': i, 'source': SOURCE}) + '\n').encode('utf-8')
+
+
+def cold(n: int) -> list:
+    """Arranca un intérprete nuevo para cada compilación"""
+    times = []
+    for i in range(n):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, WORKER], input=request_line(i),
+                       stdout=subprocess.PIPE, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def warm_pipe(n: int) -> list:
+    """Un único proceso compile_worker.py alimentado por stdin"""
+    process = subprocess.Popen([sys.executable, WORKER], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    times = []
+    try:
+        for i in range(n):
+            start = time.perf_counter()
+            process.stdin.write(request_line(i))
+            process.stdin.flush()
+            process.stdout.readline()
+            times.append(time.perf_counter() - start)
+    finally:
+        process.stdin.close()
+        process.wait()
+    return times
+
+
+def warm_pool(n: int) -> list:
+    with WorkerPool(1) as pool:
+        times = []
+        for _ in range(n):
+            start = time.perf_counter()
+            pool.compile(SOURCE)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def report(name: str, times: list):
+    ms = sorted(t * 1000 for t in times)
+    print(f"{name:<12} media {statistics.mean(ms):8.3f} ms   p50 {ms[len(ms) // 2]:8.3f} ms   "
+          f"máx {ms[-1]:8.3f} ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    report("frío", cold(max(n // 10, 1)))
+    report("tubería", warm_pipe(n))
+    report("pool", warm_pool(n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Generadores de programas sintéticos para los benchmarks"""
+
+
+def identifier_program(statements: int, names: int = 50) -> str:
+    """Programa válido dominado por identificadores: muchas asignaciones entre pocas variables"""
+    lines = [f"int v{i} = {i};" for i in range(names)]
+    for s in range(statements):
+        a = s % names
+        b = (s * 7 + 3) % names
+        c = (s * 13 + 5) % names
+        lines.append(f"v{a} = v{b} + v{c} * {s % 9};")
+    # Garantizar que todas las variables se lean al menos una vez
+    lines.append("print(" + " + ".join(f"v{i}" for i in range(names)) + ");")
+    return "\n".join(lines) + "\n"
+
+
+def structured_program(blocks: int) -> str:
+    """Programa válido que combina declaraciones, if/else, while, for, print, break y continue"""
+    lines = ["int total = 0;", "boolean flag = true;"]
+    for b in range(blocks):
+        lines.extend([
+            f"int n{b} = {b % 17};",
+            f"float f{b} = n{b} * 1.5;",
+            f"for (int i = 0; i < {b % 17 + 3}; i += 1) {{",
+            f"    if (i == {b % 5} && flag) {{",
+            "        continue;",
+            "    } else {",
+            f"        total = total + i * n{b};",
+            "    }",
+            f"    while (f{b} > 100.0) {{",
+            f"        f{b} -= 1;",
+            "        break;",
+            "    }",
+            "}",
+            f"print(f{b} + total);",
+        ])
+    lines.append("print(flag);")
+    return "\n".join(lines) + "\n"
+
+
+# Programas pequeños que cubren cada regla y cada mensaje de error del parser
+CONFORMANCE_PROGRAMS = [
+    "int a = 1; print(a);",
+    "int a; a = 2; print(a);",
+    "int a; print(a);",
+    "x = 1;",
+    "int a = 1; int a = 2;",
+    "int a = 1;",
+    "float f = 1; f += 2.5; print(f);",
+    "string s = 'a'; s += 'b';",
+    "string s = 3;",
+    "boolean b = true && 1;",
+    "int a = 1; if (a) { print(a); }",
+    "int a = 1; if (a > 0) { print(a); } else { a = 2; }",
+    "int a = 1; while (a < 10) { a += 1; if (a == 5) { break; } }",
+    "int i = 0; for (i = 0; i < 10; i += 1) { continue; } print(i);",
+    "for (int j = 0; j < 3; j + 1) { print(j); }",
+    "break;",
+    "return;",
+    "else { }",
+    "int a = 1; a",
+    "int a = 1; (a + 2) * 3; print(a);",
+    "int a = 1; print(a",
+    "int = 3;",
+    "int a + 3;",
+    "}",
+    "; int a = 1;",
+    "if (true) { int q = 1; print(q); ",
+    "int a = 1; while (a) { }",
+    "int i = 0; for (i = 0; i + 1; i += 1) { print(i); }",
+    "string s = \"x\"; print(s + 1);",
+    "@; 1 + @;",
+    "int a; int b = a + 1;",
+    "int a = 1; a = a == 1; print(a);",
+    "if (1 < 2) { } else { } print(1);",
+    "int a = 2; { a = 3; }",
+    "boolean b = !true;",
+    "5 5;",
+    "for (5; true; 1) { }",
+    "int a = 1; if (a > 0) { int b = a; } print(b);",
+]
@@ -0,0 +1,12 @@
+"""Núcleo del compilador (léxico, sintáctico y semántico) sin dependencias de interfaz gráfica"""
+from .m_token import Token, TokenType, ErrorType, CompilerError, Variable
+from .source_map import SourceMap
+from .lexer import Lexer
+from .paser import Parser, Scope, NestingTooDeep
+from .ll1_parser import LL1Parser, parse_tokens
+
+__all__ = [
+    'Token', 'TokenType', 'ErrorType', 'CompilerError', 'Variable',
+    'SourceMap', 'Lexer', 'Parser', 'Scope', 'NestingTooDeep', 'LL1Parser',
+    'parse_tokens',
+]
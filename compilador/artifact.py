@@ -0,0 +1,166 @@
+"""Formato binario compacto para guardar el flujo de tokens de una compilación.
+
+Estructura (little endian):
+    cabecera   MAGIC, versión, número de tokens, número de strings, bytes de strings
+    columnas   offset, línea, posición, id de valor (u32 cada una) y tipo (u8)
+    strings    offsets de inicio (u32, n + 1) seguidos del texto UTF-8
+
+Las columnas se leen sin copiar mediante memoryview.cast sobre bytes o mmap.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import List
+
+from .m_token import Token, TokenType, TOKEN_TYPES, TOKEN_TYPE_CODES
+
+MAGIC = b'CTOK'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIII')
+NO_OFFSET = 0xFFFFFFFF
+
+KINDS = TOKEN_TYPES  # El código de tipo guardado es TOKEN_TYPE_CODES
+KIND_CODES = TOKEN_TYPE_CODES
+
+
+class ArtifactError(ValueError):
+    pass
+
+
+def dump(tokens: List[Token]) -> bytes:
+    """Serializa una lista de tokens al formato binario"""
+    string_ids = {}
+    strings = []
+    offsets = array('I')
+    lines = array('I')
+    positions = array('I')
+    value_ids = array('I')
+    kinds = array('B')
+
+    for token in tokens:
+        value_id = string_ids.get(token.value)
+        if value_id is None:
+            value_id = string_ids[token.value] = len(strings)
+            strings.append(token.value)
+        offsets.append(NO_OFFSET if token.offset is None else token.offset)
+        lines.append(token.line)
+        positions.append(token.position)
+        value_ids.append(value_id)
+        kinds.append(KIND_CODES[token.type])
+
+    encoded = [s.encode('utf-8') for s in strings]
+    string_starts = array('I', [0])
+    for data in encoded:
+        string_starts.append(string_starts[-1] + len(data))
+    blob = b''.join(encoded)
+
+    columns = [offsets, lines, positions, value_ids, string_starts]
+    if sys.byteorder != 'little':
+        for column in columns:
+            column.byteswap()
+
+    header = HEADER.pack(MAGIC, VERSION, 0, len(tokens), len(strings), len(blob))
+    return b''.join([header] + [column.tobytes() for column in columns] + [kinds.tobytes(), blob])
+
+
+def save(tokens: List[Token], path: str):
+    with open(path, 'wb') as file:
+        file.write(dump(tokens))
+
+
+class TokenStream:
+    """Vista de solo lectura sobre un artefacto; los Token se crean bajo demanda"""
+
+    def __init__(self, data):
+        view = memoryview(data)
+        if len(view) < HEADER.size:
+            raise ArtifactError("Artefacto truncado")
+        magic, version, _, count, string_count, blob_size = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ArtifactError("No es un artefacto de tokens")
+        if version != VERSION:
+            raise ArtifactError(f"Versión de artefacto no soportada: {version}")
+
+        expected = HEADER.size + 4 * (4 * count + string_count + 1) + count + blob_size
+        if len(view) < expected:
+            raise ArtifactError("Artefacto truncado")
+
+        self.data = data
+        self.count = count
+        self.string_count = string_count
+        position = HEADER.size
+        self.offsets, position = self.u32_column(view, position, count)
+        self.lines, position = self.u32_column(view, position, count)
+        self.positions, position = self.u32_column(view, position, count)
+        self.value_ids, position = self.u32_column(view, position, count)
+        self.string_starts, position = self.u32_column(view, position, string_count + 1)
+        self.kinds = view[position:position + count]
+        position += count
+        self.blob = view[position:position + blob_size]
+        self.strings = [None] * string_count
+
+    @staticmethod
+    def u32_column(view: memoryview, start: int, length: int) -> tuple:
+        end = start + 4 * length
+        column = view[start:end].cast('I')
+        if sys.byteorder != 'little':
+            column = array('I', column)
+            column.byteswap()
+        return column, end
+
+    def string(self, value_id: int) -> str:
+        value = self.strings[value_id]
+        if value is None:
+            start = self.string_starts[value_id]
+            end = self.string_starts[value_id + 1]
+            value = self.strings[value_id] = sys.intern(str(self.blob[start:end], 'utf-8'))
+        return value
+
+    def kind(self, index: int) -> TokenType:
+        return KINDS[self.kinds[index]]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Token:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        offset = self.offsets[index]
+        return Token(
+            KINDS[self.kinds[index]],
+            self.string(self.value_ids[index]),
+            self.lines[index],
+            self.positions[index],
+            None if offset == NO_OFFSET else offset
+        )
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def to_tokens(self) -> List[Token]:
+        return list(self)
+
+    def release(self):
+        """Libera las vistas para poder cerrar el mmap subyacente"""
+        for column in (self.offsets, self.lines, self.positions, self.value_ids,
+                       self.string_starts, self.kinds, self.blob):
+            if isinstance(column, memoryview):
+                column.release()
+
+
+def load(data) -> TokenStream:
+    """Abre un artefacto desde bytes, bytearray o mmap sin copiar las columnas"""
+    return TokenStream(data)
+
+
+def open_artifact(path: str) -> TokenStream:
+    """Mapea un artefacto en memoria; las páginas se cargan al accederlas"""
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise ArtifactError("Artefacto truncado")  # mmap no admite archivos vacíos
+        return TokenStream(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
@@ -0,0 +1,321 @@
+"""Traducción de la IR a código Python para ejecutar los programas a velocidad de CPython.
+
+Cada programa se convierte en una función cuyas variables son locales de
+Python (v0, v1, ...) y cuyos if/while/for salen de Program.structure, así que
+los bucles se ejecutan como bucles de CPython y no instrucción a instrucción.
+print escribe en un buffer; el llamador decide cuándo mostrarlo.
+
+Los programas compilados se guardan en caché por el hash de su código fuente
+y, en un segundo nivel, por su hash canónico (formatter.canonical_hash): una
+versión reformateada del mismo programa reutiliza la función compilada y
+solo cambia las líneas de la IR, que usan los ticks y el perfil.
+
+Uso: python -m compilador.backend [archivo]   (ejecuta el programa; lee stdin sin archivo)
+"""
+import hashlib
+import math
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+from .formatter import canonical_hash
+from .ir import Program, Instruction, build_ir, INT, FLOAT, BOOLEAN
+from .interpreter import ExecutionError, idiv, run_ir
+from .lexer import Lexer
+from .m_token import CompilerError
+from .optimizer import optimize
+from .output import OutputBuffer, stream_sink
+
+CACHE_SIZE = 128
+
+BINARY_OPERATORS = {
+    'add': '+', 'sub': '-', 'mul': '*',
+    'lt': '<', 'gt': '>', 'le': '<=', 'ge': '>=', 'eq': '==', 'ne': '!=',
+    # Sin cortocircuito, como en la IR: se evalúan ambos operandos
+    'and': '&', 'or': '|',
+}
+
+
+class CodeGenerator:
+    """Genera el código fuente de la función a partir de la IR estructurada.
+
+    Los temporales que se usan una sola vez se sustituyen en la expresión que
+    los consume; un store materializa antes los pendientes que leen la misma
+    variable para conservar el orden de evaluación.
+
+    Con ticks, cada cambio de línea del código fuente llama a _tick(línea);
+    toda vuelta de un bucle pasa al menos por uno, así que _tick puede
+    contar pasos y cortar la ejecución.
+    """
+
+    def __init__(self, program: Program, ticks: bool = False):
+        self.program = program
+        self.ticks = ticks
+        self.last_line = None
+        self.lines: List[str] = []
+        self.uses = [0] * len(program.temp_types)
+        for block in program.blocks:
+            for instruction in block:
+                if instruction.op in ('const', 'load', 'inc', 'jump', 'exit'):
+                    continue
+                temps = instruction.args[1:] if instruction.op == 'store' else instruction.args[:1] \
+                    if instruction.op == 'branch' else instruction.args
+                for temp in temps:
+                    self.uses[temp] += 1
+        self.pending: Dict[int, tuple] = {}  # temporal -> (expresión, ranuras que lee)
+        self.steps: List[list] = []  # incremento de cada bucle abierto, para 'continue'
+
+    def generate(self) -> str:
+        self.lines.append("def program(_write, _idiv, _float, _tick):")
+        self.sequence(self.program.structure, 1)
+        self.lines.append("    return")
+        return "\n".join(self.lines) + "\n"
+
+    def sequence(self, items: list, depth: int):
+        self.last_line = None
+        for item in items:
+            if isinstance(item, int):
+                self.block(item, depth)
+            elif item == 'break':
+                self.line(depth, "break")
+            elif item == 'continue':
+                self.sequence(self.steps[-1], depth)
+                self.line(depth, "continue")
+            elif item[0] == 'if':
+                _, condition, then_items, else_items = item
+                self.line(depth, f"if {self.take(condition)}:")
+                self.body(then_items, depth + 1)
+                if else_items:
+                    self.line(depth, "else:")
+                    self.body(else_items, depth + 1)
+            elif item[5] is not None and not self.ticks:
+                self.counted_loop(item, depth)
+            else:
+                _, header, condition, body, step, _ = item
+                self.line(depth, "while True:")
+                self.sequence(header, depth + 1)
+                self.line(depth + 1, f"if not {self.take(condition)}:")
+                self.line(depth + 2, "break")
+                self.steps.append(step)
+                self.sequence(body, depth + 1)
+                self.sequence(step, depth + 1)
+                self.steps.pop()
+            self.last_line = None
+
+    def counted_loop(self, node: list, depth: int):
+        """Bucle contado del optimizador: la cabecera y el incremento los hace range()"""
+        slot, bound, adjust, amount = node[5]
+        limit = self.take(bound) + (f" + {adjust}" if adjust > 0 else f" - {-adjust}" if adjust else "")
+        self.line(depth, f"for v{slot} in range(v{slot}, {limit}, {amount}):")
+        self.steps.append([])
+        self.body(node[3], depth + 1)
+        self.steps.pop()
+
+    def body(self, items: list, depth: int):
+        start = len(self.lines)
+        self.sequence(items, depth)
+        if len(self.lines) == start:
+            self.line(depth, "pass")
+
+    def line(self, depth: int, text: str):
+        self.lines.append("    " * depth + text)
+
+    def take(self, temp: int) -> str:
+        pending = self.pending.pop(temp, None)
+        return pending[0] if pending else f"t{temp}"
+
+    def slots_of(self, temps) -> frozenset:
+        slots = frozenset()
+        for temp in temps:
+            pending = self.pending.get(temp)
+            if pending:
+                slots |= pending[1]
+        return slots
+
+    def block(self, index: int, depth: int):
+        types = self.program.temp_types
+        for instruction in self.program.blocks[index]:
+            op, args, dest = instruction.op, instruction.args, instruction.dest
+            if self.ticks and instruction.line and instruction.line != self.last_line:
+                self.last_line = instruction.line
+                self.line(depth, f"_tick({instruction.line})")
+            if op in ('store', 'inc'):
+                slot = args[0]
+                value = args[1] if op == 'store' else None
+                for temp in [t for t, (_, slots) in self.pending.items() if slot in slots and t != value]:
+                    self.line(depth, f"t{temp} = {self.take(temp)}")
+                if op == 'inc':
+                    self.line(depth, f"v{slot} += {args[1]!r}")
+                else:
+                    self.line(depth, f"v{slot} = {self.take(value)}")
+                continue
+            if op == 'print':
+                value = self.take(args[0])
+                type_id = types[args[0]]
+                if type_id == BOOLEAN:
+                    value = f"('true' if {value} else 'false')"
+                elif type_id == FLOAT:
+                    value = f"repr({value})"
+                elif type_id == INT:
+                    value = f"str({value})"
+                self.line(depth, f"_write({value})")
+                continue
+            if dest is None:
+                continue  # Terminadores: el control lo da la estructura
+
+            slots = self.slots_of(args) if op != 'const' else frozenset()
+            if op == 'const':
+                expression = self.literal(args[0])
+            elif op == 'load':
+                expression = f"v{args[0]}"
+                slots = frozenset((args[0],))
+            elif op == 'div' and instruction.type_id == INT:
+                expression = f"_idiv({self.take(args[0])}, {self.take(args[1])})"
+            elif op == 'div':
+                expression = f"({self.take(args[0])} / {self.take(args[1])})"
+            elif op == 'itof':
+                expression = f"_float({self.take(args[0])})"
+            elif op == 'ftoi':
+                expression = f"int({self.take(args[0])})"
+            else:
+                expression = f"({self.take(args[0])} {BINARY_OPERATORS[op]} {self.take(args[1])})"
+
+            if self.uses[dest] == 1:
+                self.pending[dest] = (expression, slots)
+            else:
+                self.line(depth, f"t{dest} = {expression}")
+
+        # Solo la condición del bloque puede consumirse después de él
+        terminator = self.program.blocks[index][-1]
+        keep = terminator.args[0] if terminator.op == 'branch' else None
+        for temp in [t for t in self.pending if t != keep]:
+            self.line(depth, f"t{temp} = {self.take(temp)}")
+
+    @staticmethod
+    def literal(value) -> str:
+        if isinstance(value, float) and not math.isfinite(value):
+            return f"_float({str(value)!r})"
+        return repr(value)
+
+
+class CompiledProgram:
+    """Función de Python generada para un programa; run() devuelve las líneas impresas"""
+
+    def __init__(self, program: Program, source: str, function: Callable = None):
+        self.program = program
+        self.source = source
+        self.function = function  # None: se ejecuta con el intérprete de la IR
+        self.traced = None  # Versión con _tick, generada la primera vez que se pide
+
+    def run(self, write: Callable[[str], None] = None, tick: Callable[[int], None] = None) -> List[str]:
+        """Ejecuta el programa; con tick, lo llama en cada línea ejecutada (ver CodeGenerator)"""
+        output = []
+        write = write or output.append
+        function = self.function
+        if tick is not None and function is not None:
+            if self.traced is None:
+                self.traced = python_function(CodeGenerator(self.program, ticks=True).generate())
+            function = self.traced
+        try:
+            if function is None:
+                run_ir(self.program, write, tick)
+            else:
+                function(write, idiv, float, tick)
+        except ZeroDivisionError:
+            raise ExecutionError("División entre cero")
+        except (OverflowError, ValueError):
+            raise ExecutionError("Valor fuera de rango")
+        return output
+
+
+def python_function(source: str) -> Callable:
+    namespace = {}
+    exec(compile(source, '<programa>', 'exec'), namespace)
+    return namespace['program']
+
+
+def compile_ir(program: Program, optimized: bool = True) -> CompiledProgram:
+    """Traduce la IR a una función de Python; si CPython no admite su anidamiento usa el intérprete"""
+    if optimized:
+        try:
+            program = optimize(program)
+        except RecursionError:
+            pass  # Anidamiento mayor que el que recorre el optimizador: se ejecuta sin optimizar
+    try:
+        source = CodeGenerator(program).generate()
+        return CompiledProgram(program, source, python_function(source))
+    except (SyntaxError, RecursionError, MemoryError):
+        return CompiledProgram(program, None)
+
+
+_cache: 'OrderedDict[bytes, CompiledProgram]' = OrderedDict()
+# Hash canónico -> (programa compilado, línea de cada uno de sus tokens)
+_canonical: 'OrderedDict[bytes, tuple]' = OrderedDict()
+
+
+def relocate(compiled: CompiledProgram, token_lines: array, tokens: list) -> CompiledProgram:
+    """El mismo programa con las líneas de otra disposición de los mismos tokens.
+
+    Cada instrucción lleva la línea de un token; si todos los tokens de cada
+    línea original siguen juntos en una línea nueva el cambio es exacto.
+    Devuelve None si alguna línea original quedó partida.
+    """
+    lines = {}
+    for old, token in zip(token_lines, tokens):
+        if lines.setdefault(old, token.line) != token.line:
+            return None
+    program = compiled.program
+    blocks = [[Instruction(i.op, i.type_id, i.dest, i.args, lines.get(i.line, 0)) if i.line else i for i in block]
+              for block in program.blocks]
+    moved = Program(blocks, program.variables, program.temp_types, program.structure)
+    moved.optimizations = program.optimizations
+    return CompiledProgram(moved, compiled.source, compiled.function)
+
+
+def compile_program(source: str) -> CompiledProgram:
+    """Compila código fuente del lenguaje, reutilizando el resultado si ya se compiló.
+
+    Lanza CompilerError si el programa no es válido; los errores no se guardan.
+    """
+    key = hashlib.blake2b(source.encode('utf-8'), digest_size=16).digest()
+    compiled = _cache.get(key)
+    if compiled is not None:
+        _cache.move_to_end(key)
+        return compiled
+    tokens = Lexer().tokenize(source)
+    canonical = canonical_hash(tokens)
+    entry = _canonical.get(canonical)
+    compiled = relocate(entry[0], entry[1], tokens) if entry is not None else None
+    if compiled is None:
+        compiled = compile_ir(build_ir(tokens))
+        _canonical[canonical] = (compiled, array('I', (token.line for token in tokens)))
+        if len(_canonical) > CACHE_SIZE:
+            _canonical.popitem(last=False)
+    else:
+        _canonical.move_to_end(canonical)
+    _cache[key] = compiled
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return compiled
+
+
+def main():
+    source = open(sys.argv[1], encoding='utf-8').read() if len(sys.argv) > 1 else sys.stdin.read()
+    try:
+        program = compile_program(source)
+    except CompilerError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    output = OutputBuffer(stream_sink(sys.stdout))
+    try:
+        program.run(output.write)
+    except ExecutionError as e:
+        output.flush()
+        print(f"Error de ejecución: {e}", file=sys.stderr)
+        sys.exit(1)
+    output.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,496 @@
+"""Análisis de flujo de datos sobre el grafo de control del programa.
+
+El parser construye el grafo (FlowGraph) a medida que analiza y, al terminar,
+se resuelven dos problemas con lista de trabajo y conjuntos de bits (enteros):
+    asignación definida   hacia adelante, intersección en las uniones
+    variables vivas       hacia atrás, unión en las bifurcaciones
+
+Los bits se asignan después del análisis sintáctico, como en la asignación de
+registros por barrido lineal: dos variables cuyos intervalos de bloques no se
+solapan comparten bit, así que el ancho de los conjuntos depende de cuántas
+variables están activas a la vez y no del número total de declaraciones.
+"""
+import heapq
+from collections import deque
+from typing import Dict, List
+
+from .m_token import Token, Variable, CompilerError, ErrorType
+
+# Operaciones registradas en cada bloque, en una lista plana de ternas
+# (operación, variable, token) para no crear una tupla por operación
+DECLARE = 0
+ASSIGN = 1
+READ = 2
+
+
+def operations(events: list):
+    """Recorre la lista plana de un bloque como ternas (operación, variable, token)"""
+    it = iter(events)
+    return zip(it, it, it)
+
+
+class FlowGraph:
+    """Grafo de control construido de forma incremental y sin recursión"""
+
+    def __init__(self):
+        self.events: List[list] = []
+        self.successors: List[list] = []
+        self.branches = []  # if abiertos: [bloque de la condición, fin del then o None]
+        self.loops = []  # bucles abiertos, ver begin_loop
+        self.loop_ranges = []  # (cabecera, salida) de cada bucle cerrado
+        self.current = self.new_block()
+
+    def new_block(self) -> int:
+        self.events.append([])
+        self.successors.append([])
+        return len(self.events) - 1
+
+    def link(self, source: int, target: int):
+        self.successors[source].append(target)
+
+    # Variables
+
+    def declare(self, var: Variable, token: Token):
+        self.events[self.current].extend((DECLARE, var, token))
+
+    def assign(self, var: Variable, operator: str = '='):
+        self.events[self.current].extend((ASSIGN, var, None))
+
+    def read(self, var: Variable, token: Token):
+        self.events[self.current].extend((READ, var, token))
+
+    def target(self, var: Variable, token: Token):
+        pass  # Token del destino de una asignación; el análisis solo necesita assign
+
+    # Ámbitos; el grafo no los necesita y StructuredFlow los usa para
+    # reutilizar los bits de las variables que ya no son visibles
+
+    def begin_scope(self):
+        pass
+
+    def end_scope(self):
+        pass
+
+    # Valores de las expresiones; el análisis de flujo no los necesita y
+    # ir.IRBuilder los usa para generar código
+
+    def constant(self, token: Token, type_: str):
+        pass
+
+    def operation(self, operator: str, result_type: str):
+        pass
+
+    def print_value(self):
+        pass
+
+    def discard(self):
+        pass
+
+    def end_expression(self):
+        pass  # Fin de una expresión (también de una entre paréntesis)
+
+    # Estructuras de control
+
+    def begin_if(self):
+        """La condición ya está en el bloque actual; empieza la rama then"""
+        condition = self.current
+        self.branches.append([condition, None])
+        self.current = self.new_block()
+        self.link(condition, self.current)
+
+    def begin_else(self):
+        branch = self.branches[-1]
+        branch[1] = self.current
+        self.current = self.new_block()
+        self.link(branch[0], self.current)
+
+    def end_if(self):
+        condition, then_end = self.branches.pop()
+        join = self.new_block()
+        self.link(self.current, join)
+        self.link(condition if then_end is None else then_end, join)
+        self.current = join
+
+    def begin_loop(self):
+        """Abre la cabecera donde se evalúa la condición del bucle"""
+        header = self.new_block()
+        self.link(self.current, header)
+        self.current = header
+        self.loops.append({'header': header, 'test': header, 'continue': header, 'breaks': []})
+
+    def begin_step(self):
+        """Incremento de un for: se ejecuta después del cuerpo, antes de volver a la cabecera"""
+        loop = self.loops[-1]
+        loop['test'] = self.current
+        self.current = loop['continue'] = self.new_block()
+
+    def loop_body(self):
+        loop = self.loops[-1]
+        if loop['continue'] == loop['header']:
+            loop['test'] = self.current
+        else:
+            self.link(self.current, loop['header'])
+        self.current = self.new_block()
+        self.link(loop['test'], self.current)
+
+    def end_loop(self):
+        loop = self.loops.pop()
+        self.link(self.current, loop['continue'])
+        self.current = self.new_block()
+        self.link(loop['test'], self.current)
+        for block in loop['breaks']:
+            self.link(block, self.current)
+        self.loop_ranges.append((loop['header'], self.current))
+
+    def jump(self, keyword: str):
+        """break o continue; lo que sigue en el mismo bloque es inalcanzable"""
+        loop = self.loops[-1]
+        if keyword == 'break':
+            loop['breaks'].append(self.current)
+        else:
+            self.link(self.current, loop['continue'])
+        self.current = self.new_block()
+
+    # Análisis
+
+    def allocate_bits(self) -> tuple:
+        """Máscara de bits de cada variable y ancho total de los conjuntos.
+
+        El intervalo de una variable va del bloque de su declaración al de su
+        última referencia, extendido hasta el final de los bucles que contienen
+        esa referencia pero no la declaración (su valor sigue vivo en la vuelta).
+        Fuera de ese intervalo el bit no puede estar vivo ni influir en una
+        lectura, porque todo camino hasta ella pasa otra vez por la declaración.
+        """
+        count = len(self.events)
+        last = {}
+        for block, events in enumerate(self.events):
+            for _, var, _ in operations(events):
+                last[var] = block
+
+        # Bucle más interno de cada bloque; los rangos están anidados
+        ranges = sorted(self.loop_ranges)
+        parent = [-1] * len(ranges)
+        innermost = [-1] * count
+        open_loops = []
+        next_loop = 0
+        for block in range(count):
+            while open_loops and ranges[open_loops[-1]][1] <= block:
+                open_loops.pop()
+            while next_loop < len(ranges) and ranges[next_loop][0] == block:
+                parent[next_loop] = open_loops[-1] if open_loops else -1
+                open_loops.append(next_loop)
+                next_loop += 1
+            innermost[block] = open_loops[-1] if open_loops else -1
+
+        masks: Dict[Variable, int] = {}
+        active = []  # montículo de (fin del intervalo, bit)
+        free = []
+        width = 0
+        for block, events in enumerate(self.events):
+            for operation, var, _ in operations(events):
+                if operation != DECLARE:
+                    continue
+                end = last[var]
+                loop = innermost[end]
+                while loop != -1 and ranges[loop][0] > block:
+                    end = ranges[loop][1] - 1
+                    loop = parent[loop]
+                while active and active[0][0] < block:
+                    free.append(heapq.heappop(active)[1])
+                if free:
+                    bit = free.pop()
+                else:
+                    bit = width
+                    width += 1
+                heapq.heappush(active, (end, bit))
+                masks[var] = 1 << bit
+        return masks, width
+
+    def reachable(self) -> List[bool]:
+        seen = [False] * len(self.events)
+        seen[0] = True
+        stack = [0]
+        while stack:
+            for successor in self.successors[stack.pop()]:
+                if not seen[successor]:
+                    seen[successor] = True
+                    stack.append(successor)
+        return seen
+
+    def summarize(self, masks: Dict[Variable, int]) -> tuple:
+        """gen/kill (bits que el bloque deja asignados o sin asignar) y uses/defs
+        (bits leídos antes de redefinirse o redefinidos) de cada bloque"""
+        count = len(self.events)
+        gen = [0] * count
+        kill = [0] * count
+        uses = [0] * count
+        defs = [0] * count
+        for block, events in enumerate(self.events):
+            if not events:
+                continue
+            g = k = u = d = 0
+            for operation, var, _ in operations(events):
+                mask = masks[var]
+                if operation == READ:
+                    if not d & mask:
+                        u |= mask
+                elif operation == ASSIGN:
+                    g |= mask
+                    k &= ~mask
+                    d |= mask
+                else:
+                    k |= mask
+                    g &= ~mask
+                    d |= mask
+            gen[block], kill[block], uses[block], defs[block] = g, k, u, d
+        return gen, kill, uses, defs
+
+    def definitely_assigned(self, gen: List[int], kill: List[int], full: int,
+                            predecessors: List[list], reachable: List[bool]) -> List[int]:
+        """Bits asignados en todos los caminos hasta la entrada de cada bloque"""
+        count = len(self.events)
+        assigned_in = [full] * count
+        assigned_out = [full] * count
+        worklist = deque(b for b in range(count) if reachable[b])
+        queued = list(reachable)
+        while worklist:
+            block = worklist.popleft()
+            queued[block] = False
+            state = 0 if block == 0 else full
+            for predecessor in predecessors[block]:
+                state &= assigned_out[predecessor]
+            assigned_in[block] = state
+            state = (state & ~kill[block]) | gen[block]
+            if state != assigned_out[block]:
+                assigned_out[block] = state
+                for successor in self.successors[block]:
+                    if not queued[successor]:
+                        queued[successor] = True
+                        worklist.append(successor)
+        return assigned_in
+
+    def live_variables(self, uses: List[int], defs: List[int],
+                       predecessors: List[list], reachable: List[bool]) -> List[int]:
+        """Bits cuyo valor puede leerse en algún camino desde la salida de cada bloque"""
+        count = len(self.events)
+        live_in = [0] * count
+        live_out = [0] * count
+        worklist = deque(b for b in reversed(range(count)) if reachable[b])
+        queued = list(reachable)
+        while worklist:
+            block = worklist.popleft()
+            queued[block] = False
+            state = 0
+            for successor in self.successors[block]:
+                state |= live_in[successor]
+            live_out[block] = state
+            state = uses[block] | (state & ~defs[block])
+            if state != live_in[block]:
+                live_in[block] = state
+                for predecessor in predecessors[block]:
+                    if reachable[predecessor] and not queued[predecessor]:
+                        queued[predecessor] = True
+                        worklist.append(predecessor)
+        return live_out
+
+    def analyze(self) -> List[CompilerError]:
+        """Lecturas sin asignación definida y variables cuyo valor nunca se lee"""
+        predecessors = [[] for _ in self.events]
+        for block, successors in enumerate(self.successors):
+            for successor in successors:
+                predecessors[successor].append(block)
+        reachable = self.reachable()
+        masks, width = self.allocate_bits()
+        gen, kill, uses, defs = self.summarize(masks)
+        assigned_in = self.definitely_assigned(gen, kill, (1 << width) - 1, predecessors, reachable)
+        live_out = self.live_variables(uses, defs, predecessors, reachable)
+
+        # Una variable se usa si algún valor que toma (incluido el de su
+        # declaración) se lee: en el mismo bloque o, por estar vivo a la
+        # salida del bloque, en otro
+        errors = []
+        declarations = []
+        used = set()
+        for block, events in enumerate(self.events):
+            if not events or not reachable[block]:
+                continue
+            assigned = assigned_in[block]
+            defined = 0
+            defined_vars = []
+            for operation, var, token in operations(events):
+                mask = masks[var]
+                if operation == READ:
+                    if not assigned & mask:
+                        errors.append(CompilerError(
+                            ErrorType.SEMANTIC,
+                            f"Variable '{var.name}' utilizada sin inicializar",
+                            token.line,
+                            token.position
+                        ))
+                    if defined & mask:
+                        used.add(var)
+                    continue
+                if operation == ASSIGN:
+                    assigned |= mask
+                else:
+                    assigned &= ~mask
+                    declarations.append((var, token))
+                defined |= mask
+                defined_vars.append(var)
+            live = live_out[block]
+            if live & defined:
+                used.update(var for var in defined_vars if live & masks[var])
+
+        for var, token in declarations:
+            if var not in used:
+                errors.append(CompilerError(
+                    ErrorType.SEMANTIC,
+                    f"Variable '{var.name}' declarada pero nunca utilizada",
+                    token.line,
+                    token.position
+                ))
+        errors.sort(key=lambda e: (e.line, e.position))
+        return errors
+
+
+class StructuredFlow(FlowGraph):
+    """Mismo análisis que FlowGraph en una sola pasada y sin guardar el grafo.
+
+    El parser solo produce flujo estructurado, así que basta un estado de
+    asignación definida (máscara de bits, None si el punto es inalcanzable)
+    y una pila por estructura abierta: la cabecera de un bucle ve el mismo
+    estado que su entrada, porque dentro del bucle solo se añaden
+    asignaciones, y su salida el de la condición. Una variable se usa si
+    alguna lectura alcanzable la lee. Los bits se asignan por profundidad de
+    ámbito y se reutilizan al cerrarlo; la declaración limpia su bit.
+
+    La memoria depende del anidamiento, de las variables visibles y de los
+    diagnósticos, no del tamaño del programa (ver spill).
+    """
+
+    def __init__(self):
+        # Sin bloques: no se llama a FlowGraph.__init__
+        self.state = 0
+        self.bits: Dict[Variable, int] = {}
+        self.height = 0  # Primer bit libre
+        self.scopes = [(0, [])]  # (altura al abrirlo, variables declaradas) de cada ámbito abierto
+        self.branches = []  # if abiertos: [estado de la condición, estado al final del then, hay else]
+        self.loops = []  # bucles abiertos, ver begin_loop
+        self.step = None  # Lecturas del incremento de un for mientras se analiza
+        self.pending: Dict[Variable, tuple] = {}  # Declaradas aún sin leer -> (línea, posición)
+        self.errors: List[CompilerError] = []
+
+    @staticmethod
+    def join(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return a & b
+
+    # Variables
+
+    def declare(self, var: Variable, token: Token):
+        bit = self.bits[var] = self.height
+        self.height += 1
+        self.scopes[-1][1].append(var)
+        self.unassign(var, bit, token)
+
+    def unassign(self, var: Variable, bit: int, token: Token):
+        """La variable recién declarada queda sin asignar y pendiente de leer"""
+        if self.state is not None:
+            # Los bits por encima de la altura solo pueden venir de ámbitos ya
+            # cerrados; si no hay ninguno no hace falta copiar el estado
+            if self.state.bit_length() > bit:
+                self.state &= ~(1 << bit)
+            self.pending[var] = (token.line, token.position)
+
+    def bit(self, var: Variable) -> int:
+        return self.bits[var]
+
+    def assign(self, var: Variable, operator: str = '='):
+        if self.state is not None:
+            self.state |= 1 << self.bit(var)
+
+    def read(self, var: Variable, token: Token):
+        if self.step is not None:
+            # El incremento se ejecuta después del cuerpo: se evalúa en end_loop
+            self.step.append((var, self.bit(var), token.line, token.position))
+        elif self.state is not None:
+            self.check_read(var, self.bit(var), token.line, token.position, self.state)
+
+    def check_read(self, var: Variable, bit: int, line: int, position: int, state: int):
+        if not state >> bit & 1:
+            self.errors.append(CompilerError(
+                ErrorType.SEMANTIC,
+                f"Variable '{var.name}' utilizada sin inicializar",
+                line,
+                position
+            ))
+        self.pending.pop(var, None)
+
+    def begin_scope(self):
+        self.scopes.append((self.height, []))
+
+    def end_scope(self):
+        self.height, variables = self.scopes.pop()
+        for var in variables:
+            del self.bits[var]
+
+    # Estructuras de control
+
+    def begin_if(self):
+        self.branches.append([self.state, None, False])
+
+    def begin_else(self):
+        branch = self.branches[-1]
+        branch[1:] = self.state, True
+        self.state = branch[0]
+
+    def end_if(self):
+        condition, then_end, has_else = self.branches.pop()
+        self.state = self.join(self.state, then_end if has_else else condition)
+
+    def begin_loop(self):
+        self.loops.append({'test': self.state, 'continue': None, 'step': None})
+
+    def begin_step(self):
+        loop = self.loops[-1]
+        loop['test'] = self.state
+        self.step = loop['step'] = []
+
+    def loop_body(self):
+        loop = self.loops[-1]
+        if loop['step'] is None:
+            loop['test'] = self.state
+        self.step = None
+
+    def end_loop(self):
+        loop = self.loops.pop()
+        state = self.join(self.state, loop['continue'])
+        if state is not None and loop['step']:
+            for var, bit, line, position in loop['step']:
+                self.check_read(var, bit, line, position, state)
+        # Las salidas por break tienen al menos los bits de la condición
+        self.state = loop['test']
+
+    def jump(self, keyword: str):
+        if keyword == 'continue':
+            loop = self.loops[-1]
+            loop['continue'] = self.join(loop['continue'], self.state)
+        self.state = None
+
+    # Análisis
+
+    def analyze(self) -> List[CompilerError]:
+        errors = list(self.errors)
+        for var, (line, position) in self.pending.items():
+            errors.append(CompilerError(
+                ErrorType.SEMANTIC,
+                f"Variable '{var.name}' declarada pero nunca utilizada",
+                line,
+                position
+            ))
+        errors.sort(key=lambda e: (e.line, e.position))
+        return errors
@@ -0,0 +1,179 @@
+"""Diagnósticos estructurados para consumidores automáticos.
+
+Cada error se convierte en un registro con código estable (ErrorType.code),
+severidad, tramo (offsets de inicio y fin del buffer, y línea y columna de
+ambos extremos, con columnas desde 1) y lo esperado y recibido, sin tener
+que analizar el texto de CompilerError.__str__.
+
+La línea de órdenes revisa archivos y carpetas y escribe los registros a
+medida que termina cada archivo, como NDJSON (un objeto JSON por línea) o
+como un log SARIF 2.1.0 cuyo encabezado sale antes del primer resultado.
+
+Uso: python -m compilador.diagnostics [--format ndjson|sarif] [--files] ruta... (- lee stdin)
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Iterable, Iterator, List, TextIO
+
+from .lexer import Lexer
+from .ll1_parser import parse_tokens
+from .m_token import CompilerError, ErrorType
+from .source_map import SourceMap
+
+SUFFIXES = ('.py', '.txt')
+SEVERITY = 'error'  # Todo diagnóstico detiene la compilación
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+
+def check_source(source: str) -> tuple:
+    """Devuelve (errores, SourceMap); del análisis de flujo salen todos, del resto el primero"""
+    lexer = Lexer()
+    try:
+        tokens = lexer.tokenize(source)
+    except CompilerError as e:
+        return [e], lexer.source_map
+    parser, error = parse_tokens(tokens)
+    if error is not None:
+        return parser.diagnostics or [error], lexer.source_map
+    return [], lexer.source_map
+
+
+def diagnostic_record(error: CompilerError, source_map: SourceMap, path: str = None) -> dict:
+    start, end = error.span(source_map)
+    end_line, end_position = source_map.line_col(end)
+    return {
+        'kind': 'diagnostic',
+        'file': path,
+        'code': error.error_type.code,
+        'type': error.error_type.name,
+        'severity': SEVERITY,
+        'message': error.message,
+        'line': error.line,
+        'column': error.position + 1,
+        'end_line': end_line,
+        'end_column': end_position + 1,
+        'start': start,
+        'end': end,
+        'expected': error.expected,
+        'received': error.received,
+    }
+
+
+def check_file(path: str) -> List[dict]:
+    if path == '-':
+        source = sys.stdin.read()
+    else:
+        with open(path, encoding='utf-8', errors='replace') as file:
+            source = file.read()
+    errors, source_map = check_source(source)
+    return [diagnostic_record(error, source_map, path) for error in errors]
+
+
+def expand_paths(paths: Iterable[str], suffixes: tuple = SUFFIXES) -> Iterator[str]:
+    """Los archivos tal cual y, de cada carpeta, los que tienen una de las extensiones"""
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    if name.endswith(suffixes):
+                        yield os.path.join(folder, name)
+        else:
+            yield path
+
+
+class NDJSONWriter:
+    """Un registro por línea; cada archivo se vuelca en cuanto termina"""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, records: List[dict]):
+        for record in records:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.stream.flush()
+
+    def close(self):
+        self.stream.flush()
+
+
+class SARIFWriter:
+    """Log SARIF escrito de forma incremental: encabezado, resultados y cierre"""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.first = True
+        rules = [{'id': error_type.code, 'name': error_type.name,
+                  'shortDescription': {'text': error_type.value}} for error_type in ErrorType]
+        run = {'tool': {'driver': {'name': 'compilador', 'rules': rules}},
+               'columnKind': 'unicodeCodePoints'}
+        header = json.dumps({'version': '2.1.0', '$schema': SARIF_SCHEMA, 'runs': [run]}, ensure_ascii=False)
+        # El arreglo de resultados queda abierto al final del primer run
+        self.stream.write(header[:-3] + ', "results": [\n')
+        self.stream.flush()
+
+    def write(self, records: List[dict]):
+        for record in records:
+            if record['kind'] != 'diagnostic':
+                continue
+            if not self.first:
+                self.stream.write(',\n')
+            self.first = False
+            self.stream.write(json.dumps(sarif_result(record), ensure_ascii=False))
+        self.stream.flush()
+
+    def close(self):
+        self.stream.write('\n]}]}\n')
+        self.stream.flush()
+
+
+def sarif_result(record: dict) -> dict:
+    region = {
+        'startLine': record['line'], 'startColumn': record['column'],
+        'endLine': record['end_line'], 'endColumn': record['end_column'],
+        'charOffset': record['start'], 'charLength': record['end'] - record['start'],
+    }
+    return {
+        'ruleId': record['code'],
+        'level': record['severity'],
+        'message': {'text': record['message']},
+        'locations': [{'physicalLocation': {'artifactLocation': {'uri': record['file']}, 'region': region}}],
+        'properties': {'expected': record['expected'], 'received': record['received']},
+    }
+
+
+WRITERS = {'ndjson': NDJSONWriter, 'sarif': SARIFWriter}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Revisa programas y emite diagnósticos estructurados")
+    parser.add_argument('paths', nargs='+', help="archivos o carpetas; - lee stdin")
+    parser.add_argument('--format', choices=sorted(WRITERS), default='ndjson')
+    parser.add_argument('--files', action='store_true',
+                        help="añade un registro por archivo (solo NDJSON), también para los correctos")
+    args = parser.parse_args()
+
+    writer = WRITERS[args.format](sys.stdout)
+    checked = failed = 0
+    try:
+        for path in expand_paths(args.paths):
+            try:
+                records = check_file(path)
+            except OSError as e:
+                print(f"{path}: {e}", file=sys.stderr)
+                continue
+            checked += 1
+            failed += bool(records)
+            if args.files:
+                records.append({'kind': 'file', 'file': path, 'ok': not records, 'diagnostics': len(records)})
+            writer.write(records)
+    finally:
+        writer.close()
+    print(f"{checked} archivos, {failed} con errores", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Diferencias entre dos compilaciones para actualizar solo lo que cambió.
+
+Las interfaces guardan lo último que mostraron y, tras cada compilación,
+sustituyen solo el tramo central distinto: los tokens anteriores a una
+edición no cambian y los posteriores solo si cambió su línea o su posición.
+"""
+import operator
+from typing import Callable, Optional, Sequence, Tuple
+
+
+def same_token(a, b) -> bool:
+    """Dos tokens se muestran igual (el offset no aparece en las vistas)"""
+    return a.value == b.value and a.line == b.line and a.position == b.position and a.type is b.type
+
+
+def changed_range(old: Sequence, new: Sequence,
+                  same: Callable = operator.eq) -> Optional[Tuple[int, int, int]]:
+    """(inicio, fin en old, fin en new) del tramo distinto; None si son iguales.
+
+    old[inicio:fin_old] se sustituye por new[inicio:fin_new]. Se recortan el
+    prefijo y el sufijo comunes, así que el coste es lineal y una edición
+    local da un tramo pequeño.
+    """
+    if old is new:
+        return None
+    old_end, new_end = len(old), len(new)
+    limit = min(old_end, new_end)
+    start = 0
+    while start < limit and same(old[start], new[start]):
+        start += 1
+    if start == old_end == new_end:
+        return None
+    while old_end > start and new_end > start and same(old[old_end - 1], new[new_end - 1]):
+        old_end -= 1
+        new_end -= 1
+    return start, old_end, new_end
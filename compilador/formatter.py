@@ -0,0 +1,205 @@
+"""Formateador que reconstruye el código desde el flujo de tokens del Lexer.
+
+Una sola pasada lineal mezcla los tokens y los comentarios por offset y
+escribe la forma canónica:
+    - cuatro espacios por nivel de llaves; '{' al final de la línea que abre
+      el bloque y '}' en su propia línea ('} else {' en la misma)
+    - una sentencia por línea; dentro de los paréntesis de un for, '; '
+    - espacio a ambos lados de los operadores (todos son binarios en la
+      gramática), tras las comas y entre una palabra clave y su '('
+    - los comentarios se conservan: al final de la línea si lo estaban, en
+      su propia línea si no; de varias líneas en blanco seguidas queda una
+
+canonical_hash resume solo la secuencia de (tipo, valor) de los tokens: dos
+programas con la misma forma canónica comparten hash aunque difieran en
+espacios, saltos de línea o comentarios.
+
+Uso: python -m compilador.formatter [--check | --write | --hash] [archivo...]   (sin archivos, stdin)
+"""
+import argparse
+import hashlib
+import sys
+from typing import List
+
+from .lexer import Lexer
+from .m_token import Token, TokenType, CompilerError
+
+INDENT = "    "
+NO_SPACE_BEFORE = {')', ']', ',', ';', '.'}
+NO_SPACE_AFTER = {'(', '[', '.'}
+SPACED_KEYWORDS = {'if', 'while', 'for'}  # print( va pegado, como una llamada
+
+
+class Formatter:
+    def __init__(self, source: str, tokens: List[Token], comments: List[tuple]):
+        self.source = source
+        self.tokens = tokens
+        self.comments = comments
+        self.lines: List[str] = []
+        self.line: List[str] = []  # Partes de la línea en curso
+        self.depth = 0
+        self.parens = 0
+        self.break_pending = False  # La línea en curso termina antes del próximo elemento
+        self.after_block_comment = False
+        self.previous = None  # Último token escrito
+        self.last_end = 0  # Offset del final del último elemento (token o comentario)
+
+    def format(self) -> str:
+        tokens, comments = self.tokens, self.comments
+        comment = 0
+        for token in tokens:
+            while comment < len(comments) and comments[comment][0] < token.offset:
+                self.write_comment(*comments[comment])
+                comment += 1
+            self.write_token(token)
+        for start, end in comments[comment:]:
+            self.write_comment(start, end)
+        self.flush()
+        return "\n".join(self.lines) + "\n" if self.lines else ""
+
+    # Líneas
+
+    def flush(self):
+        if self.line:
+            self.lines.append("".join(self.line).rstrip())
+            self.line = []
+
+    def gap(self, start: int) -> int:
+        """Saltos de línea en el original entre el último elemento y start"""
+        return self.source.count('\n', self.last_end, start)
+
+    def start_item(self, start: int, space: bool, blank_allowed: bool = True):
+        newlines = self.gap(start)
+        if self.after_block_comment and newlines:
+            self.break_pending = True  # Un /* */ seguido de salto de línea cierra la línea
+        self.after_block_comment = False
+        if self.break_pending:
+            self.flush()
+            self.break_pending = False
+            # Solo una línea en blanco, y nunca justo tras '{' o antes de '}'
+            if blank_allowed and newlines > 1 and self.lines and not self.lines[-1].endswith('{'):
+                self.lines.append("")
+        if not self.line:
+            self.line.append(INDENT * self.depth)
+        elif space:
+            self.line.append(" ")
+
+    # Elementos
+
+    def write_token(self, token: Token):
+        value = token.value
+        previous = self.previous
+        if value == '}':
+            self.depth = max(0, self.depth - 1)
+            self.break_pending = True
+        elif value == 'else' and previous is not None and previous.value == '}':
+            self.break_pending = False  # } else {
+        self.start_item(token.offset, self.space_before(previous, token), value != '}')
+        self.line.append(value)
+        self.previous = token
+        self.last_end = token.end
+
+        if value == '{':
+            self.depth += 1
+            self.break_pending = True
+        elif value == '}':
+            self.break_pending = True
+        elif value == '(':
+            self.parens += 1
+        elif value == ')':
+            self.parens = max(0, self.parens - 1)
+        elif value == ';' and self.parens == 0:
+            self.break_pending = True
+
+    @staticmethod
+    def space_before(previous: Token, token: Token) -> bool:
+        if previous is None:
+            return False
+        value, before = token.value, previous.value
+        if value in NO_SPACE_BEFORE or before in NO_SPACE_AFTER:
+            return False
+        if value in ('(', '['):
+            if previous.type == TokenType.KEYWORD:
+                return before in SPACED_KEYWORDS
+            return previous.type == TokenType.OPERATOR or before in (',', ';', '{', '}')
+        return True
+
+    def write_comment(self, start: int, end: int):
+        text = self.source[start:end]
+        if text.startswith('//'):
+            text = text.rstrip()
+        trailing = self.previous is not None and self.gap(start) == 0
+        if trailing and self.break_pending and self.line:
+            # x = 1; // comentario: se queda en la línea de la sentencia
+            self.line.append(" " + text)
+        else:
+            if not trailing and self.line:
+                self.break_pending = True
+            self.start_item(start, True)
+            self.line.append(text)
+        self.last_end = end
+        if text.startswith('//'):
+            self.break_pending = True
+        else:
+            self.after_block_comment = True
+
+
+def format_tokens(source: str, tokens: List[Token], comments: List[tuple]) -> str:
+    return Formatter(source, tokens, comments).format()
+
+
+def format_source(source: str) -> str:
+    """Devuelve la forma canónica del código; lanza CompilerError si hay errores léxicos"""
+    lexer = Lexer()
+    tokens = lexer.tokenize(source)
+    return format_tokens(source, tokens, lexer.comments)
+
+
+def canonical_hash(tokens: List[Token]) -> bytes:
+    """Hash de la secuencia de (tipo, valor): no depende del formato ni de los comentarios"""
+    # Cada valor lleva su longitud delante: ningún contenido de string puede
+    # hacer pasar dos secuencias distintas por la misma
+    canonical = "".join(f"{token.type.name}{len(token.value)}:{token.value}" for token in tokens)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).digest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Formatea programas con la forma canónica")
+    parser.add_argument('files', nargs='*')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--check', action='store_true', help="termina con 1 si algún archivo cambiaría")
+    mode.add_argument('--write', action='store_true', help="reescribe los archivos")
+    mode.add_argument('--hash', action='store_true', help="muestra el hash canónico de cada archivo")
+    args = parser.parse_args()
+
+    status = 0
+    for path in args.files or ['-']:
+        if path == '-':
+            source = sys.stdin.read()
+        else:
+            with open(path, encoding='utf-8') as file:
+                source = file.read()
+        try:
+            if args.hash:
+                print(f"{canonical_hash(Lexer().tokenize(source)).hex()}  {path}")
+                continue
+            formatted = format_source(source)
+        except CompilerError as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            status = 2
+            continue
+        if args.check:
+            if formatted != source:
+                print(f"{path}: sin formato canónico")
+                status = max(status, 1)
+        elif args.write and path != '-':
+            if formatted != source:
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write(formatted)
+        else:
+            sys.stdout.write(formatted)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Gramática declarativa del lenguaje y generador de tablas LL(1).
+
+Notación de las producciones:
+    'x'      terminal literal (valor de una palabra clave, delimitador u operador)
+    IDENT    clase de terminal (ver TOKEN_CLASSES)
+    #accion  acción semántica; no consume tokens y es transparente para FIRST/FOLLOW
+    ε        producción vacía
+    Nombre   no terminal
+"""
+from typing import Dict, List
+
+from .m_token import TokenType
+
+EPSILON = 'ε'
+END = '$'
+
+# Clases de terminal para los tokens cuyo valor no forma parte de la gramática
+TOKEN_CLASSES = {
+    TokenType.IDENTIFIER: 'IDENT',
+    TokenType.NUMBER: 'NUMBER',
+    TokenType.STRING: 'STRING',
+    TokenType.BOOLEAN: 'BOOLEAN',
+    TokenType.ARROBA: 'ARROBA',
+    TokenType.KEYWORD: 'KEYWORD',
+    TokenType.DELIMITER: 'DELIMITER',
+    TokenType.OPERATOR: 'OP',
+    TokenType.ERROR: 'ERROR',
+}
+
+LANGUAGE = """
+Program    -> TopList
+TopList    -> Stmt TopList | ε
+BlockList  -> Stmt BlockList | ε
+Block      -> '{' #push_scope BlockList '}' #pop_scope
+Stmt       -> Decl
+            | 'if' '(' Expr #if_condition ')' Block ElsePart #end_if
+            | 'while' #loop_enter #loop_header '(' Expr #while_condition ')' Block #loop_exit
+            | 'for' #loop_enter '(' #push_scope ForInit #loop_header Expr #for_condition ';' Expr #for_step ')' Block #pop_scope #loop_exit
+            | 'print' '(' Expr #print_value ')' ';'
+            | #loop_control 'break' ';'
+            | #loop_control 'continue' ';'
+            | #target IDENT IdentRest
+            | Primary ExprTail #end_expression #discard ';'
+ElsePart   -> 'else' #else_branch Block | ε
+Decl       -> Type #declare IDENT DeclInit #end_declaration ';'
+Type       -> 'int' | 'float' | 'string' | 'boolean'
+DeclInit   -> '=' Expr #declaration_value | ε
+ForInit    -> Decl | #target IDENT Assignment
+IdentRest  -> Assignment | #read_target ';'
+Assignment -> Operator #assignment_operator Expr #assignment_value ';'
+Operator   -> '=' | OP
+Expr       -> Term ExprTail #end_expression
+ExprTail   -> Operator #operator Term #combine ExprTail | ε
+Term       -> #variable IDENT | Primary
+Primary    -> #literal NUMBER | #literal STRING | #literal BOOLEAN | #literal ARROBA | '(' Expr ')'
+"""
+
+# Producción usada cuando no hay entrada en la tabla para el token actual
+LANGUAGE_DEFAULTS = {
+    'TopList': 0,
+    'BlockList': 0,
+    'ForInit': 1,
+    'IdentRest': 1,
+}
+
+# Acción que reporta el error cuando un no terminal no acepta el token actual
+LANGUAGE_ERRORS = {
+    'Stmt': 'statement_error',
+    'Term': 'term_error',
+    'Primary': 'term_error',
+}
+
+
+class GrammarError(Exception):
+    pass
+
+
+class Grammar:
+    """Gramática libre de contexto con cálculo de FIRST/FOLLOW y tabla LL(1)"""
+
+    def __init__(self, text: str, start: str, defaults: Dict[str, int] = None,
+                 errors: Dict[str, str] = None, terminals=()):
+        self.start = start
+        self.productions: Dict[str, List[tuple]] = {}
+        self.terminals = {END, *terminals}
+        self.actions = []
+        self.parse_text(text)
+        self.defaults = defaults or {}
+        self.errors = errors or {}
+
+        self.nullable = self.compute_nullable()
+        self.first = self.compute_first()
+        self.follow = self.compute_follow()
+        self.table = self.build_table()
+
+    def parse_text(self, text: str):
+        current = None
+        for raw in text.strip().splitlines():
+            line = raw.strip()
+            if not line:
+                continue
+            if '->' in line:
+                current, line = (part.strip() for part in line.split('->', 1))
+                self.productions[current] = []
+            elif line.startswith('|'):
+                line = line[1:]
+            else:
+                raise GrammarError(f"Línea de gramática inválida: {raw}")
+            for alternative in line.split('|'):
+                self.productions[current].append(self.parse_alternative(alternative))
+
+    def parse_alternative(self, alternative: str) -> tuple:
+        symbols = []
+        for symbol in alternative.split():
+            if symbol == EPSILON:
+                continue
+            if symbol.startswith("'") and symbol.endswith("'"):
+                symbol = symbol[1:-1]
+                self.terminals.add(symbol)
+            elif symbol.startswith('#'):
+                if symbol[1:] not in self.actions:
+                    self.actions.append(symbol[1:])
+            elif symbol.isupper():
+                self.terminals.add(symbol)
+            symbols.append(symbol)
+        return tuple(symbols)
+
+    def is_nonterminal(self, symbol: str) -> bool:
+        return symbol in self.productions
+
+    def is_action(self, symbol: str) -> bool:
+        return symbol.startswith('#')
+
+    def sequence_first(self, symbols) -> tuple:
+        """FIRST de una secuencia y si la secuencia completa puede ser vacía"""
+        first = set()
+        for symbol in symbols:
+            if self.is_action(symbol):
+                continue
+            if not self.is_nonterminal(symbol):
+                first.add(symbol)
+                return first, False
+            first |= self.first[symbol]
+            if symbol not in self.nullable:
+                return first, False
+        return first, True
+
+    def compute_nullable(self) -> set:
+        nullable = set()
+        changed = True
+        while changed:
+            changed = False
+            for name, alternatives in self.productions.items():
+                if name in nullable:
+                    continue
+                for symbols in alternatives:
+                    if all(self.is_action(s) or s in nullable for s in symbols):
+                        nullable.add(name)
+                        changed = True
+                        break
+        return nullable
+
+    def compute_first(self) -> Dict[str, set]:
+        self.first = {name: set() for name in self.productions}
+        changed = True
+        while changed:
+            changed = False
+            for name, alternatives in self.productions.items():
+                for symbols in alternatives:
+                    first, _ = self.sequence_first(symbols)
+                    if not first <= self.first[name]:
+                        self.first[name] |= first
+                        changed = True
+        return self.first
+
+    def compute_follow(self) -> Dict[str, set]:
+        follow = {name: set() for name in self.productions}
+        follow[self.start].add(END)
+        changed = True
+        while changed:
+            changed = False
+            for name, alternatives in self.productions.items():
+                for symbols in alternatives:
+                    for i, symbol in enumerate(symbols):
+                        if not self.is_nonterminal(symbol):
+                            continue
+                        first, rest_nullable = self.sequence_first(symbols[i + 1:])
+                        if rest_nullable:
+                            first = first | follow[name]
+                        if not first <= follow[symbol]:
+                            follow[symbol] |= first
+                            changed = True
+        return follow
+
+    def build_table(self) -> Dict[str, Dict[str, int]]:
+        table = {}
+        conflicts = []
+        for name, alternatives in self.productions.items():
+            row = table[name] = {}
+            for index, symbols in enumerate(alternatives):
+                first, nullable = self.sequence_first(symbols)
+                lookahead = first | self.follow[name] if nullable else first
+                for terminal in lookahead:
+                    if terminal in row and row[terminal] != index:
+                        conflicts.append(f"{name} con '{terminal}': alternativas {row[terminal]} y {index}")
+                    row[terminal] = index
+        if conflicts:
+            raise GrammarError("La gramática no es LL(1):\n" + "\n".join(conflicts))
+        return table
+
+    def compile(self) -> 'CompiledGrammar':
+        return CompiledGrammar(self)
+
+
+class CompiledGrammar:
+    """Tabla LL(1) con símbolos numerados, lista para el bucle del parser.
+
+    Los terminales ocupan los ids [0, T), los no terminales [T, T + N) y las
+    acciones [T + N, ...). Las producciones se guardan invertidas para
+    apilarlas directamente.
+    """
+
+    def __init__(self, grammar: Grammar):
+        self.terminals = sorted(grammar.terminals)
+        self.nonterminals = list(grammar.productions)
+        self.actions = list(grammar.actions)
+        self.terminal_ids = {name: i for i, name in enumerate(self.terminals)}
+        self.nonterminal_base = len(self.terminals)
+        self.action_base = self.nonterminal_base + len(self.nonterminals)
+        self.end = self.terminal_ids[END]
+        self.start = self.symbol_id(grammar.start)
+
+        self.rows = []
+        self.defaults = []
+        self.epsilons = []
+        self.errors = []
+        for name in self.nonterminals:
+            alternatives = [self.encode(symbols) for symbols in grammar.productions[name]]
+            self.rows.append({self.terminal_ids[t]: alternatives[i] for t, i in grammar.table[name].items()})
+
+            default = grammar.defaults.get(name)
+            if default is None and len(alternatives) == 1:
+                default = 0
+            self.defaults.append(None if default is None else alternatives[default])
+
+            epsilon = None
+            for symbols, encoded in zip(grammar.productions[name], alternatives):
+                if all(grammar.is_action(s) for s in symbols):
+                    epsilon = encoded
+            self.epsilons.append(epsilon)
+            self.errors.append(grammar.errors.get(name, 'unexpected_error'))
+
+    def symbol_id(self, symbol: str) -> int:
+        if symbol.startswith('#'):
+            return self.action_base + self.actions.index(symbol[1:])
+        if symbol in self.terminal_ids:
+            return self.terminal_ids[symbol]
+        return self.nonterminal_base + self.nonterminals.index(symbol)
+
+    def encode(self, symbols) -> tuple:
+        return tuple(self.symbol_id(s) for s in reversed(symbols))
+
+    def symbol_name(self, symbol: int) -> str:
+        if symbol < self.nonterminal_base:
+            return self.terminals[symbol]
+        if symbol < self.action_base:
+            return self.nonterminals[symbol - self.nonterminal_base]
+        return '#' + self.actions[symbol - self.action_base]
+
+
+def build_language_grammar() -> Grammar:
+    return Grammar(LANGUAGE, 'Program', LANGUAGE_DEFAULTS, LANGUAGE_ERRORS, TOKEN_CLASSES.values())
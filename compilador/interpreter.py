@@ -0,0 +1,95 @@
+"""Intérprete directo de la IR: semántica de referencia de la ejecución.
+
+Recorre las instrucciones de cada bloque y sigue sus terminadores. Es el
+respaldo de backend para los programas que no se pueden traducir a Python
+(anidamiento mayor que el que admite el compilador de CPython).
+"""
+import operator
+from typing import Callable
+
+from .ir import Program, INT, FLOAT, BOOLEAN
+
+
+class ExecutionError(Exception):
+    """Error al ejecutar un programa ya validado (por ejemplo, división entre cero)"""
+
+
+def idiv(a: int, b: int) -> int:
+    """División entera truncada hacia cero, como en C"""
+    quotient = a // b
+    if quotient < 0 and quotient * b != a:
+        quotient += 1
+    return quotient
+
+
+def format_value(value, type_id: int) -> str:
+    """Texto que escribe print para un valor del tipo dado"""
+    if type_id == BOOLEAN:
+        return 'true' if value else 'false'
+    if type_id == FLOAT:
+        return repr(value)
+    return str(value)
+
+
+BINARY = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'lt': operator.lt,
+    'gt': operator.gt,
+    'le': operator.le,
+    'ge': operator.ge,
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'and': operator.and_,
+    'or': operator.or_,
+}
+
+
+def run_ir(program: Program, write: Callable[[str], None], tick: Callable[[int], None] = None):
+    """Ejecuta el programa escribiendo cada línea de print con write.
+
+    Con tick, lo llama al empezar cada bloque y en cada cambio de línea.
+    """
+    values = [None] * len(program.temp_types)
+    variables = [None] * len(program.variables)
+    blocks = program.blocks
+    block = 0
+    try:
+        while True:
+            line = None
+            for instruction in blocks[block]:
+                if tick is not None and instruction.line and instruction.line != line:
+                    line = instruction.line
+                    tick(line)
+                op = instruction.op
+                args = instruction.args
+                if op == 'const':
+                    values[instruction.dest] = args[0]
+                elif op == 'load':
+                    values[instruction.dest] = variables[args[0]]
+                elif op == 'store':
+                    variables[args[0]] = values[args[1]]
+                elif op == 'inc':
+                    variables[args[0]] += args[1]
+                elif op in BINARY:
+                    values[instruction.dest] = BINARY[op](values[args[0]], values[args[1]])
+                elif op == 'div':
+                    a, b = values[args[0]], values[args[1]]
+                    values[instruction.dest] = idiv(a, b) if instruction.type_id == INT else a / b
+                elif op == 'itof':
+                    values[instruction.dest] = float(values[args[0]])
+                elif op == 'ftoi':
+                    values[instruction.dest] = int(values[args[0]])
+                elif op == 'print':
+                    write(format_value(values[args[0]], program.temp_types[args[0]]))
+                elif op == 'jump':
+                    block = args[0]
+                elif op == 'branch':
+                    block = args[1] if values[args[0]] else args[2]
+                else:
+                    return
+    except ZeroDivisionError:
+        raise ExecutionError("División entre cero")
+    except (OverflowError, ValueError):
+        raise ExecutionError("Valor fuera de rango")
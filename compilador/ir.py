@@ -0,0 +1,431 @@
+"""Representación intermedia tipada de tres direcciones.
+
+IRBuilder es una subclase de FlowGraph: genera el código durante el análisis,
+con los mismos bloques básicos que el análisis de flujo, y build_ir solo
+entrega el Program si el programa supera todas las comprobaciones.
+
+    %n        temporal; cada uno se define una sola vez (estilo SSA)
+    nombre#k  variable del programa (ranura k), leída con load y escrita con store
+              (o con inc, que le suma una constante; solo lo emite el optimizador)
+    bN        bloque básico; termina en jump, branch o exit
+
+Los tipos son enteros (INT, FLOAT, ...) y cada temporal guarda el suyo en
+Program.temp_types, así que los pasos posteriores no vuelven a deducirlos.
+
+Program.structure conserva además la forma estructurada del código fuente
+para los generadores que no trabajan con saltos arbitrarios:
+    secuencia  lista de bloques (int), 'break', 'continue' y nodos
+    if         ['if', temporal de la condición, secuencia then, secuencia else]
+    bucle      ['loop', cabecera, temporal de la condición, cuerpo, incremento, rango]
+rango es None salvo en los bucles contados que reconoce compilador.optimizer.
+
+Uso: python -m compilador.ir [archivo]   (vuelca la IR; lee stdin sin archivo)
+"""
+import re
+import sys
+from typing import Dict, List
+
+from .dataflow import FlowGraph
+from .lexer import Lexer
+from .ll1_parser import parse_tokens
+from .m_token import Token, Variable, CompilerError
+
+INT, FLOAT, BOOLEAN, STRING, ARROBA = range(5)
+TYPE_NAMES = ['int', 'float', 'boolean', 'string', 'ARROBA']
+TYPE_IDS = {name: type_id for type_id, name in enumerate(TYPE_NAMES)}
+NUMERIC = frozenset({INT, FLOAT})
+
+ARITHMETIC = {'+': 'add', '-': 'sub', '*': 'mul', '/': 'div'}
+RELATIONAL = {'<': 'lt', '>': 'gt', '<=': 'le', '>=': 'ge', '==': 'eq', '!=': 'ne'}
+LOGICAL = {'&&': 'and', '||': 'or'}
+ASSIGNMENT = {'=': None, '+=': 'add', '-=': 'sub', '*=': 'mul', '/=': 'div'}
+
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0'}
+ESCAPE_PATTERN = re.compile(r'\\(.)', re.S)
+
+
+class IRError(ValueError):
+    pass
+
+
+class Instruction:
+    """dest = op args; type_id es el tipo del resultado (None si no produce valor)"""
+    __slots__ = ('op', 'type_id', 'dest', 'args', 'line')
+
+    def __init__(self, op: str, type_id: int = None, dest: int = None, args: tuple = (), line: int = 0):
+        self.op = op
+        self.type_id = type_id
+        self.dest = dest
+        self.args = args
+        self.line = line  # Línea del código fuente (0 en los terminadores)
+
+
+class Program:
+    """Bloques básicos de instrucciones, ranuras de variables y tipo de cada temporal"""
+
+    def __init__(self, blocks: List[List[Instruction]], variables: List[tuple], temp_types: List[int],
+                 structure: list = None):
+        self.blocks = blocks
+        self.variables = variables  # (nombre, tipo) de cada ranura
+        self.temp_types = temp_types
+        self.structure = structure
+        self.optimizations: Dict[str, int] = {}  # Estadísticas de compilador.optimizer
+
+    def instruction_count(self) -> int:
+        return sum(len(block) for block in self.blocks)
+
+    def successors(self, block: int) -> tuple:
+        terminator = self.blocks[block][-1]
+        if terminator.op == 'jump':
+            return terminator.args
+        if terminator.op == 'branch':
+            return terminator.args[1:]
+        return ()
+
+    def format_instruction(self, instruction: Instruction) -> str:
+        op, args = instruction.op, instruction.args
+        if op == 'const':
+            operands = repr(args[0])
+        elif op == 'load':
+            operands = self.slot_name(args[0])
+        elif op == 'store':
+            operands = f"{self.slot_name(args[0])}, %{args[1]}"
+        elif op == 'inc':
+            operands = f"{self.slot_name(args[0])}, {args[1]!r}"
+        elif op == 'jump':
+            operands = f"b{args[0]}"
+        elif op == 'branch':
+            operands = f"%{args[0]}, b{args[1]}, b{args[2]}"
+        else:
+            operands = ", ".join(f"%{arg}" for arg in args)
+        text = f"{op} {operands}".rstrip()
+        if instruction.dest is None:
+            return text
+        return f"%{instruction.dest}:{TYPE_NAMES[instruction.type_id]} = {text}"
+
+    def slot_name(self, slot: int) -> str:
+        return f"{self.variables[slot][0]}#{slot}"
+
+    def dump(self) -> str:
+        lines = [f"; {self.slot_name(slot)}: {TYPE_NAMES[type_id]}"
+                 for slot, (_, type_id) in enumerate(self.variables)]
+        for index, block in enumerate(self.blocks):
+            lines.append(f"b{index}:")
+            lines.extend("    " + self.format_instruction(instruction) for instruction in block)
+        return "\n".join(lines) + "\n"
+
+    def verify(self):
+        """Comprueba temporales únicos, tipos de operandos y terminadores; lanza IRError"""
+        types = self.temp_types
+        defined = [False] * len(types)
+        for block in self.blocks:
+            for instruction in block:
+                if instruction.dest is not None:
+                    if defined[instruction.dest] or types[instruction.dest] != instruction.type_id:
+                        raise IRError(f"Temporal %{instruction.dest} redefinido o con tipo distinto")
+                    defined[instruction.dest] = True
+
+        for index, block in enumerate(self.blocks):
+            if not block or block[-1].op not in ('jump', 'branch', 'exit'):
+                raise IRError(f"El bloque b{index} no termina en jump, branch o exit")
+            for position, instruction in enumerate(block):
+                op, args = instruction.op, instruction.args
+                if op in ('jump', 'branch', 'exit') and position != len(block) - 1:
+                    raise IRError(f"Terminador en medio del bloque b{index}")
+                temps = {'store': args[1:], 'branch': args[:1]}.get(op, args) \
+                    if op not in ('const', 'load', 'inc', 'jump', 'exit') else ()
+                for temp in temps:
+                    if not defined[temp]:
+                        raise IRError(f"Temporal %{temp} usado sin definir en b{index}")
+                self.check_types(index, instruction)
+                for target in self.successors(index) if position == len(block) - 1 else ():
+                    if not 0 <= target < len(self.blocks):
+                        raise IRError(f"Salto a un bloque inexistente desde b{index}")
+
+    def check_types(self, index: int, instruction: Instruction):
+        op, args, types = instruction.op, instruction.args, self.temp_types
+        if op in ARITHMETIC.values():
+            valid = instruction.type_id in NUMERIC and types[args[0]] == types[args[1]] == instruction.type_id
+        elif op in RELATIONAL.values():
+            valid = instruction.type_id == BOOLEAN and types[args[0]] == types[args[1]]
+        elif op in LOGICAL.values():
+            valid = instruction.type_id == types[args[0]] == types[args[1]] == BOOLEAN
+        elif op == 'itof':
+            valid = types[args[0]] == INT and instruction.type_id == FLOAT
+        elif op == 'ftoi':
+            valid = types[args[0]] == FLOAT and instruction.type_id == INT
+        elif op == 'load':
+            valid = self.variables[args[0]][1] == instruction.type_id
+        elif op == 'store':
+            valid = self.variables[args[0]][1] == types[args[1]]
+        elif op == 'inc':
+            valid = self.variables[args[0]][1] == instruction.type_id and \
+                type(args[1]) is (int if instruction.type_id == INT else float)
+        elif op == 'branch':
+            valid = types[args[0]] == BOOLEAN
+        else:
+            valid = True
+        if not valid:
+            raise IRError(f"Tipos inválidos en b{index}: {self.format_instruction(instruction)}")
+
+
+def literal_value(token: Token, type_id: int):
+    if type_id == INT:
+        return int(token.value)
+    if type_id == FLOAT:
+        return float(token.value)
+    if type_id == BOOLEAN:
+        return token.value == 'true'
+    if type_id == STRING:
+        return ESCAPE_PATTERN.sub(lambda m: ESCAPES.get(m.group(1), m.group(1)), token.value[1:-1])
+    return token.value
+
+
+class IRBuilder(FlowGraph):
+    """FlowGraph que además emite instrucciones en cada bloque básico"""
+
+    def __init__(self):
+        self.code: List[List[Instruction]] = []
+        self.temp_types: List[int] = []
+        # Pila de valores de la expresión en curso y, en paralelo, la ranura
+        # de la que se cargó cada uno (para las asignaciones dentro de expresiones)
+        self.values: List[int] = []
+        self.sources: List[int] = []
+        # Asignaciones dentro de expresiones que esperan su valor completo:
+        # (posición de su valor en values, ranura, operador, valor cargado del destino)
+        self.pending: List[tuple] = []
+        self.slots: Dict[Variable, int] = {}
+        self.variables: List[tuple] = []
+        self.conditions: Dict[int, int] = {}  # bloque -> temporal de su condición
+        self.line = 1  # Línea del último token visto, para las instrucciones emitidas
+        self.program = None
+        super().__init__()
+        # Secuencias abiertas de Program.structure y nodos if/bucle abiertos
+        self.structure = [self.current]
+        self.sequences = [self.structure]
+        self.nodes = []
+
+    def new_block(self) -> int:
+        self.code.append([])
+        return super().new_block()
+
+    def emit(self, op: str, type_id: int, args: tuple) -> int:
+        dest = len(self.temp_types)
+        self.temp_types.append(type_id)
+        self.code[self.current].append(Instruction(op, type_id, dest, args, self.line))
+        return dest
+
+    def push(self, value: int, slot: int = None):
+        self.values.append(value)
+        self.sources.append(slot)
+
+    def pop(self) -> tuple:
+        return self.values.pop(), self.sources.pop()
+
+    def convert(self, value: int, type_id: int) -> int:
+        source = self.temp_types[value]
+        if source == INT and type_id == FLOAT:
+            return self.emit('itof', FLOAT, (value,))
+        if source == FLOAT and type_id == INT:
+            return self.emit('ftoi', INT, (value,))
+        return value
+
+    def arithmetic(self, op: str, left: int, right: int) -> int:
+        type_id = FLOAT if FLOAT in (self.temp_types[left], self.temp_types[right]) else INT
+        return self.emit(op, type_id, (self.convert(left, type_id), self.convert(right, type_id)))
+
+    def store(self, slot: int, value: int) -> int:
+        value = self.convert(value, self.variables[slot][1])
+        self.code[self.current].append(Instruction('store', args=(slot, value), line=self.line))
+        return value
+
+    # Variables
+
+    def declare(self, var: Variable, token: Token):
+        super().declare(var, token)
+        self.line = token.line
+        self.slots[var] = len(self.variables)
+        self.variables.append((var.name, TYPE_IDS[var.type]))
+
+    def read(self, var: Variable, token: Token):
+        super().read(var, token)
+        self.line = token.line
+        slot = self.slots[var]
+        self.push(self.emit('load', self.variables[slot][1], (slot,)), slot)
+
+    def assign(self, var: Variable, operator: str = '='):
+        super().assign(var, operator)
+        value, _ = self.pop()
+        if ASSIGNMENT.get(operator):
+            current, _ = self.pop()  # load emitido al leer la variable
+            value = self.arithmetic(ASSIGNMENT[operator], current, value)
+        self.store(self.slots[var], value)
+
+    # Expresiones
+
+    def constant(self, token: Token, type_: str):
+        type_id = TYPE_IDS[type_]
+        self.line = token.line
+        self.push(self.emit('const', type_id, (literal_value(token, type_id),)))
+
+    def operation(self, operator: str, result_type: str):
+        right, source = self.pop()
+        left, slot = self.pop()
+        left_type, right_type = self.temp_types[left], self.temp_types[right]
+        if operator in ARITHMETIC:
+            result = self.arithmetic(ARITHMETIC[operator], left, right)
+        elif operator in RELATIONAL:
+            if left_type != right_type:
+                left, right = self.convert(left, FLOAT), self.convert(right, FLOAT)
+            result = self.emit(RELATIONAL[operator], BOOLEAN, (left, right))
+        elif operator in LOGICAL:
+            result = self.emit(LOGICAL[operator], BOOLEAN, (left, right))
+        elif operator in ASSIGNMENT and slot is not None:
+            # Asignación dentro de una expresión (el incremento de un for). El
+            # parser agrupa por la izquierda, pero la asignación tiene la menor
+            # precedencia y se asocia por la derecha: en i = i + 1 el valor es
+            # todo lo que sigue, así que se guarda al terminar la expresión
+            self.pending.append((len(self.values), slot, operator, left))
+            self.push(right, source)
+            return
+        else:
+            # El resto de operadores conserva el operando izquierdo, igual que su tipo
+            result = left
+        self.push(result)
+
+    def end_expression(self):
+        """Completa las asignaciones de la expresión que termina, de la más interna a la más externa"""
+        depth = len(self.values) - 1
+        while self.pending and self.pending[-1][0] == depth:
+            _, slot, operator, left = self.pending.pop()
+            right, _ = self.pop()
+            if self.assignable(self.temp_types[left], self.temp_types[right], operator):
+                # Guarda el valor y lo devuelve con el tipo de la variable
+                if ASSIGNMENT[operator]:
+                    right = self.arithmetic(ASSIGNMENT[operator], left, right)
+                else:
+                    self.drop_load(left)
+                self.push(self.store(slot, right))
+            else:
+                self.push(left)  # Como los demás operadores, conserva el operando izquierdo
+
+    def drop_load(self, value: int):
+        """Quita el load del destino de una asignación simple, que nadie usa.
+
+        Así i = i + 1 deja en el bloque lo mismo que i += 1 y el optimizador
+        reconoce el incremento y el bucle contado.
+        """
+        code = self.code[self.current]
+        for index in range(len(code) - 1, -1, -1):
+            if code[index].dest == value:
+                del code[index]
+                return
+
+    @staticmethod
+    def assignable(target: int, value: int, operator: str) -> bool:
+        if ASSIGNMENT[operator]:
+            return target in NUMERIC and value in NUMERIC
+        return target == value or (target in NUMERIC and value in NUMERIC)
+
+    def print_value(self):
+        value, _ = self.pop()
+        self.code[self.current].append(Instruction('print', args=(value,), line=self.line))
+
+    def discard(self):
+        self.pop()
+
+    # Estructuras de control: la condición pendiente decide el branch del bloque
+
+    def begin_if(self):
+        condition, _ = self.pop()
+        self.conditions[self.current] = condition
+        super().begin_if()
+        self.open_node(['if', condition, [self.current], []], 2)
+
+    def begin_else(self):
+        super().begin_else()
+        self.sequences[-1] = self.nodes[-1][3]
+        self.sequences[-1].append(self.current)
+
+    def end_if(self):
+        super().end_if()
+        self.close_node()
+
+    def begin_loop(self):
+        super().begin_loop()
+        self.open_node(['loop', [self.current], None, [], [], None], 1)
+
+    def begin_step(self):
+        condition, _ = self.pop()
+        self.conditions[self.current] = condition
+        self.nodes[-1][2] = condition
+        super().begin_step()
+        self.sequences[-1] = self.nodes[-1][4]
+        self.sequences[-1].append(self.current)
+
+    def loop_body(self):
+        loop = self.loops[-1]
+        value, _ = self.pop()
+        if loop['continue'] == loop['header']:
+            self.conditions[self.current] = value
+            self.nodes[-1][2] = value
+        super().loop_body()  # En un for el valor es el del incremento y se descarta
+        self.sequences[-1] = self.nodes[-1][3]
+        self.sequences[-1].append(self.current)
+
+    def end_loop(self):
+        super().end_loop()
+        self.close_node()
+
+    def jump(self, keyword: str):
+        super().jump(keyword)
+        self.sequences[-1].append(keyword)
+        self.sequences[-1].append(self.current)
+
+    def open_node(self, node: list, first: int):
+        """Añade el nodo a la secuencia actual y continúa en su secuencia node[first]"""
+        self.sequences[-1].append(node)
+        self.nodes.append(node)
+        self.sequences.append(node[first])
+
+    def close_node(self):
+        """Cierra el nodo; el bloque actual (la unión o la salida) sigue tras él"""
+        self.sequences.pop()
+        self.nodes.pop()
+        self.sequences[-1].append(self.current)
+
+    def finish(self) -> Program:
+        """Añade los terminadores según las aristas del grafo; se llama una sola vez"""
+        if self.program is None:
+            for block, code in enumerate(self.code):
+                successors = self.successors[block]
+                if len(successors) == 2:
+                    code.append(Instruction('branch', args=(self.conditions[block], *successors)))
+                elif successors:
+                    code.append(Instruction('jump', args=(successors[0],)))
+                else:
+                    code.append(Instruction('exit'))
+            self.program = Program(self.code, self.variables, self.temp_types, self.structure)
+        return self.program
+
+
+def build_ir(tokens: List[Token]) -> Program:
+    """Analiza los tokens y devuelve su IR; lanza CompilerError si el programa no es válido"""
+    parser, error = parse_tokens(tokens, IRBuilder)
+    if error is not None:
+        raise error
+    return parser.flow.finish()
+
+
+def main():
+    source = open(sys.argv[1], encoding='utf-8').read() if len(sys.argv) > 1 else sys.stdin.read()
+    try:
+        program = build_ir(Lexer().tokenize(source))
+    except CompilerError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.write(program.dump())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import re
+import sys
+import string
+from typing import List
+from .m_token import Token, TokenType, CompilerError, ErrorType
+from .source_map import SourceMap
+
+# Camino rápido para buffers ASCII: bytes.translate reduce cada carácter a su
+# clase (letras y _ -> 'a', dígitos -> '0', espacios -> ' ', salto de línea y
+# puntuación se quedan igual) y una única expresión regular recorre las
+# rachas de clases. Los límites de los tokens salen de los cambios de clase,
+# así que el bucle de Python es por token y no por carácter. Las clases y la
+# expresión reproducen las reglas de tokenize con los operadores y
+# delimitadores por defecto.
+CLASS_TABLE = bytearray(range(256))
+for _char in string.ascii_letters + '_':
+    CLASS_TABLE[ord(_char)] = ord('a')
+for _char in string.digits:
+    CLASS_TABLE[ord(_char)] = ord('0')
+for _char in ' \t\r\x0b\x0c\x1c\x1d\x1e\x1f':  # Los que str.isspace acepta, salvo \n
+    CLASS_TABLE[ord(_char)] = ord(' ')
+CLASS_TABLE = bytes(CLASS_TABLE)
+
+# Un grupo por tipo de racha; el número del grupo es lastindex. Los espacios
+# que preceden a un token entran en su misma coincidencia
+(COMMENT, STRING, WORD, NUMBER, SPACE, OPERATOR, DELIMITER, ARROBA_CHAR, UNKNOWN) = range(1, 10)
+RUN_TYPES = {STRING: TokenType.STRING, NUMBER: TokenType.NUMBER, OPERATOR: TokenType.OPERATOR,
+             DELIMITER: TokenType.DELIMITER, ARROBA_CHAR: TokenType.ARROBA}
+RUNS = re.compile(rb'''
+    [ ]*(?:
+    (//[^\n]*|/\*[\s\S]*?\*/)
+  | ("(?:[^"\\]|\\[\s\S])*"|'(?:[^'\\]|\\[\s\S])*')
+  | (a[a0]*)
+  | (0[0.]*|\.0[0.]*)
+  | ([ \n]+)
+  | (==|<=|>=|!=|&&|\|\||\+\+|--|\+=|-=|\*=|/=|(?!/\*)[-+*/=<>!])
+  | ([{}()\[\];,.])
+  | (@)
+  | ([\s\S]))
+''', re.VERBOSE)
+
+
+class Lexer:
+    def __init__(self, fast: bool = True):
+        # fast usa el camino de clases de carácter con código ASCII
+        self.fast = fast
+        self.keywords = {
+            'if', 'else', 'while', 'for', 'int', 'float', 'string',
+            'boolean', 'print', 'input', 'return', 'void', 'class',
+            'public', 'private', 'true', 'false', 'break', 'continue'
+        }
+        self.operators = {
+            '+', '-', '*', '/', '=', '==', '<', '>', '<=', '>=',
+            '!=', '&&', '||', '!', '++', '--', '+=', '-=', '*=', '/='
+        }
+        self.delimiters = {'{', '}', '(', ')', ';', ',', '[', ']', '.'}
+        self.boolean_literals = {'true', 'false'}
+        # Lexer para [NEW]
+        self.arroba = {'@'}
+        self.word_types = {word: TokenType.KEYWORD for word in self.keywords}
+        self.word_types.update((word, TokenType.BOOLEAN) for word in self.boolean_literals)
+        self.reset()
+
+    def reset(self):
+        """Descarta los resultados del último tokenize para reutilizar la instancia"""
+        # Resultados de la última llamada a tokenize; tokens y comments
+        # quedan parcialmente llenos si hubo un error léxico
+        self.source_map = SourceMap('')
+        self.tokens: List[Token] = []
+        self.comments: List[tuple] = []
+
+    def make_token(self, type: TokenType, value: str, start: int) -> Token:
+        line, position = self.source_map.line_col(start)
+        return Token(type, value, line, position, start)
+
+    def error(self, message: str, start: int, expected: str, received: str) -> CompilerError:
+        line, position = self.source_map.line_col(start)
+        return CompilerError(ErrorType.LEXICAL, message, line, position, expected, received, start)
+
+    def tokenize(self, code: str) -> List[Token]:
+        if self.fast and code.isascii():
+            tokens = self.tokenize_runs(code)
+            if tokens is not None:
+                return tokens
+        self.reset()
+        tokens = self.tokens
+        self.source_map = SourceMap(code)
+        length = len(code)
+        position = 0
+
+        # Un único cursor recorre todo el buffer, así los comentarios y
+        # strings pueden abarcar varias líneas
+        while position < length:
+            char = code[position]
+
+            # Ignorar espacios en blanco (incluye saltos de línea)
+            if char.isspace():
+                position += 1
+                continue
+
+            # Strings
+            if char in '"\'':
+                string, position = self.extract_string(code, position, char)
+                tokens.append(string)
+                continue
+
+            # Comentarios
+            if char == '/' and position + 1 < length:
+                if code[position + 1] == '/':
+                    position = self.skip_line_comment(code, position)
+                    continue
+                if code[position + 1] == '*':
+                    position = self.skip_multiline_comment(code, position)
+                    continue
+
+            # Operadores lógicos
+            if char == '&' and position + 1 < length and code[position + 1] == '&':
+                tokens.append(self.make_token(TokenType.OPERATOR, '&&', position))
+                position += 2
+                continue
+
+            if char == '|' and position + 1 < length and code[position + 1] == '|':
+                tokens.append(self.make_token(TokenType.OPERATOR, '||', position))
+                position += 2
+                continue
+
+            # Números
+            if char.isdigit() or (char == '.' and position + 1 < length and code[position + 1].isdigit()):
+                num, position = self.extract_number(code, position)
+                tokens.append(num)
+                continue
+
+            # Identificadores, palabras clave y booleanos
+            if char.isalpha() or char == '_':
+                word, position = self.extract_word(code, position)
+                tokens.append(word)
+                continue
+
+            # Operadores
+            if char in self.operators or (char in '<>!' and position + 1 < length and code[position + 1] == '='):
+                op, position = self.extract_operator(code, position)
+                tokens.append(op)
+                continue
+
+            # Delimitadores
+            if char in self.delimiters:
+                tokens.append(self.make_token(TokenType.DELIMITER, char, position))
+                position += 1
+                continue
+
+            # tokenizador para [NEW]
+            if char in self.arroba:
+                tokens.append(self.make_token(TokenType.ARROBA, char, position))
+                position += 1
+                continue
+
+            # Caracteres no reconocidos
+            raise self.error(
+                f"Carácter no reconocido: {char}",
+                position,
+                "un carácter válido",
+                char
+            )
+
+        return tokens
+
+    def tokenize_runs(self, code: str) -> List[Token]:
+        """Camino rápido de tokenize; devuelve None si hay un error léxico.
+
+        El error y los tokens anteriores a él los reproduce el recorrido
+        carácter a carácter, que es quien construye los mensajes.
+        """
+        self.reset()
+        tokens = self.tokens
+        comments = self.comments
+        self.source_map = SourceMap(code)
+        classes = code.encode('ascii').translate(CLASS_TABLE)
+        append = tokens.append
+        intern = sys.intern
+        word_types = self.word_types
+        identifier = TokenType.IDENTIFIER
+        types = RUN_TYPES
+        count = classes.count
+        line, line_start = 1, 0
+
+        # Los tipos de racha más frecuentes se comprueban primero
+        for match in RUNS.finditer(classes):
+            kind = match.lastindex
+            start, end = match.span(kind)
+            if kind == WORD:
+                word = intern(code[start:end])
+                append(Token(word_types.get(word, identifier), word, line, start - line_start, start))
+            elif OPERATOR <= kind <= ARROBA_CHAR:
+                append(Token(types[kind], code[start:end], line, start - line_start, start))
+            elif kind == SPACE:
+                newlines = count(b'\n', start, end)
+                if newlines:
+                    line += newlines
+                    line_start = classes.rfind(b'\n', start, end) + 1
+            elif kind == NUMBER:
+                value = code[start:end]
+                if value.count('.') > 1:
+                    return None
+                append(Token(types[kind], value, line, start - line_start, start))
+            elif kind == UNKNOWN:
+                return None
+            else:
+                # Comentarios y strings pueden abarcar varias líneas
+                if kind == STRING:
+                    append(Token(types[kind], code[start:end], line, start - line_start, start))
+                else:
+                    comments.append((start, end))
+                newlines = count(b'\n', start, end)
+                if newlines:
+                    line += newlines
+                    line_start = classes.rfind(b'\n', start, end) + 1
+        return tokens
+
+    def skip_line_comment(self, code: str, start: int) -> int:
+        """Salta un comentario // hasta el siguiente salto de línea"""
+        end = code.find('\n', start)
+        end = len(code) if end == -1 else end
+        self.comments.append((start, end))
+        return end
+
+    def skip_multiline_comment(self, code: str, start: int) -> int:
+        """Salta un comentario /* ... */ aunque abarque varias líneas"""
+        end = code.find('*/', start + 2)
+        if end == -1:
+            raise self.error(
+                "Comentario no cerrado",
+                start,
+                "cierre de comentario con */",
+                "fin de archivo"
+            )
+        self.comments.append((start, end + 2))
+        return end + 2
+
+    def extract_string(self, code: str, start: int, quote: str) -> tuple:
+        position = start + 1
+        length = len(code)
+        while position < length:
+            char = code[position]
+            if char == '\\':
+                position += 2
+                continue
+            position += 1
+            if char == quote:
+                return self.make_token(TokenType.STRING, code[start:position], start), position
+        raise self.error(
+            "String no cerrado",
+            start,
+            f"cierre de string con {quote}",
+            "fin de archivo"
+        )
+
+    def extract_number(self, code: str, start: int) -> tuple:
+        position = start
+        length = len(code)
+        dots = 0
+        while position < length and (code[position].isdigit() or code[position] == '.'):
+            if code[position] == '.':
+                dots += 1
+                if dots > 1:
+                    raise self.error(
+                        "Número mal formado: múltiples puntos decimales",
+                        start,
+                        "un único punto decimal",
+                        f"número con {dots} puntos"
+                    )
+            position += 1
+        return self.make_token(TokenType.NUMBER, code[start:position], start), position
+
+    def extract_word(self, code: str, start: int) -> tuple:
+        position = start
+        length = len(code)
+        while position < length and (code[position].isalnum() or code[position] == '_'):
+            position += 1
+        # Todas las apariciones de un mismo nombre comparten un único objeto
+        word = sys.intern(code[start:position])
+        if word in self.boolean_literals:
+            token_type = TokenType.BOOLEAN
+        elif word in self.keywords:
+            token_type = TokenType.KEYWORD
+        else:
+            token_type = TokenType.IDENTIFIER
+        return self.make_token(token_type, word, start), position
+
+    def extract_operator(self, code: str, start: int) -> tuple:
+        position = start
+        op = code[position]
+        position += 1
+        if position < len(code):
+            possible_op = op + code[position]
+            if possible_op in self.operators:
+                op = possible_op
+                position += 1
+        return self.make_token(TokenType.OPERATOR, op, start), position
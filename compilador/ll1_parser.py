@@ -0,0 +1,318 @@
+from typing import List, Optional, Tuple
+from .m_token import Token, TokenType, CompilerError, ErrorType
+from .grammar import TOKEN_CLASSES, build_language_grammar
+from .dataflow import FlowGraph
+from .paser import Parser, NestingTooDeep, COMPOUND_ASSIGNMENT_OPERATORS
+
+# La tabla se genera una sola vez por proceso, la primera vez que se usa
+_grammar = None
+
+
+def language_grammar():
+    """Tabla LL(1) compilada de grammar.LANGUAGE, compartida por todos los LL1Parser"""
+    global _grammar
+    if _grammar is None:
+        _grammar = build_language_grammar().compile()
+    return _grammar
+
+
+class LL1Parser(Parser):
+    """Parser dirigido por la tabla LL(1) generada desde grammar.LANGUAGE.
+
+    Usa una pila explícita de símbolos en lugar de recursión y reutiliza las
+    validaciones semánticas de Parser, por lo que reporta los mismos errores.
+    Única diferencia conocida: en la inicialización de un for, Parser acepta
+    cualquier token como operador de asignación y este parser exige uno.
+    """
+
+    def __init__(self, tokens: List[Token], flow_class=FlowGraph):
+        super().__init__(tokens, flow_class)
+        self.grammar = language_grammar()
+        # Acciones semánticas en el orden de sus ids en la tabla
+        self.action_handlers = [getattr(self, f"action_{name}") for name in self.grammar.actions]
+
+    def reset(self, tokens: List[Token]):
+        super().reset(tokens)
+        # Pilas de valores que comparten las acciones semánticas
+        self.type_stack = []
+        self.operator_stack = []
+        self.variable_stack = []
+
+    def terminal_kinds(self) -> List[int]:
+        """Id de terminal de cada token, con el fin de entrada al final"""
+        terminal_ids = self.grammar.terminal_ids
+        kinds = []
+        for token in self.tokens:
+            kind = terminal_ids.get(token.value) if token.type in (
+                TokenType.KEYWORD, TokenType.DELIMITER, TokenType.OPERATOR) else None
+            if kind is None:
+                kind = terminal_ids[TOKEN_CLASSES[token.type]]
+            kinds.append(kind)
+        kinds.append(self.grammar.end)
+        return kinds
+
+    def parse(self):
+        try:
+            self.run()
+            self.check_data_flow()
+        except IndexError:
+            last_token = self.tokens[-1] if self.tokens else Token(TokenType.ERROR, "", 1, 0)
+            raise CompilerError(
+                ErrorType.SYNTACTIC,
+                "Se llegó al final del código inesperadamente",
+                last_token.line,
+                last_token.position
+            )
+
+    def run(self):
+        grammar = self.grammar
+        rows = grammar.rows
+        defaults = grammar.defaults
+        epsilons = grammar.epsilons
+        nonterminal_base = grammar.nonterminal_base
+        action_base = grammar.action_base
+        end = grammar.end
+        actions = self.action_handlers
+        kinds = self.terminal_kinds()
+
+        # El índice se mantiene en una variable local y se sincroniza con
+        # self.current solo antes de ejecutar acciones o reportar errores
+        current = self.current
+        stack = [end, grammar.start]
+        pop = stack.pop
+        push = stack.extend
+        while stack:
+            symbol = pop()
+            if symbol < nonterminal_base:
+                if kinds[current] != symbol:
+                    self.current = current
+                    self.terminal_error(symbol)
+                current += 1
+            elif symbol < action_base:
+                index = symbol - nonterminal_base
+                kind = kinds[current]
+                production = rows[index].get(kind)
+                if production is None:
+                    production = defaults[index]
+                    if production is None:
+                        production = epsilons[index] if kind != end else None
+                    if production is None:
+                        self.current = current
+                        self.nonterminal_error(index)
+                push(production)
+            else:
+                self.current = current
+                actions[symbol - action_base]()
+        self.current = len(self.tokens)  # El último terminal emparejado fue el fin de entrada
+
+    def terminal_error(self, symbol: int):
+        token = self.current_token()  # Error de fin de código si no quedan tokens
+        expected = self.grammar.symbol_name(symbol)
+        if expected == 'IDENT':
+            raise CompilerError(
+                ErrorType.SYNTACTIC,
+                "Se esperaba un identificador",
+                token.line,
+                token.position
+            )
+        raise CompilerError(
+            ErrorType.SYNTACTIC,
+            f"Se esperaba '{expected}'",
+            token.line,
+            token.position,
+            expected,
+            token.value
+        )
+
+    def nonterminal_error(self, index: int):
+        self.current_token()  # Error de fin de código si no quedan tokens
+        getattr(self, self.grammar.errors[index])()
+
+    def statement_error(self):
+        token = self.current_token()
+        if token.type == TokenType.KEYWORD:
+            raise CompilerError(
+                ErrorType.SYNTACTIC,
+                f"Palabra clave inesperada: '{token.value}'",
+                token.line,
+                token.position
+            )
+        self.term_error()
+
+    def term_error(self):
+        token = self.current_token()
+        raise CompilerError(
+            ErrorType.SYNTACTIC,
+            "Se esperaba un término válido",
+            token.line,
+            token.position
+        )
+
+    def unexpected_error(self):
+        token = self.current_token()
+        raise CompilerError(
+            ErrorType.SYNTACTIC,
+            f"Símbolo inesperado: '{token.value}'",
+            token.line,
+            token.position
+        )
+
+    def previous_token(self) -> Token:
+        return self.tokens[self.current - 1]
+
+    # Acciones semánticas (ver grammar.LANGUAGE)
+
+    def action_push_scope(self):
+        self.push_scope()
+
+    def action_pop_scope(self):
+        self.pop_scope()
+
+    def action_loop_enter(self):
+        self.loop_depth += 1
+
+    def action_loop_header(self):
+        self.flow.begin_loop()
+
+    def action_loop_exit(self):
+        self.flow.end_loop()
+        self.loop_depth -= 1
+
+    def action_loop_control(self):
+        token = self.current_token()
+        if self.loop_depth == 0:
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"'{token.value}' fuera de un bucle",
+                token.line,
+                token.position
+            )
+        self.flow.jump(token.value)
+
+    def action_if_condition(self):
+        self.check_condition(self.type_stack.pop(), 'if', self.previous_token())
+        self.flow.begin_if()
+
+    def action_else_branch(self):
+        self.flow.begin_else()
+
+    def action_end_if(self):
+        self.flow.end_if()
+
+    def action_while_condition(self):
+        self.check_condition(self.type_stack.pop(), 'while', self.current_token())
+        self.flow.loop_body()
+
+    def action_for_condition(self):
+        self.check_condition(self.type_stack.pop(), 'for', self.current_token())
+        self.flow.begin_step()
+
+    def action_for_step(self):
+        self.type_stack.pop()
+        self.flow.loop_body()
+
+    def action_print_value(self):
+        if self.type_stack.pop() is None:
+            token = self.current_token()
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                "Expresión inválida en print",
+                token.line,
+                token.position
+            )
+        self.flow.print_value()
+
+    def action_discard(self):
+        self.type_stack.pop()
+        self.flow.discard()
+
+    def action_declare(self):
+        token = self.current_token()
+        if token.type != TokenType.IDENTIFIER:
+            return  # El terminal IDENT reporta el error
+        self.variable_stack.append(self.declare_variable(token.value, self.previous_token().value))
+
+    def action_declaration_value(self):
+        var = self.variable_stack[-1]
+        self.check_assignable(var.type, self.type_stack.pop())
+        var.initialized = True
+        self.flow.assign(var)
+
+    def action_end_declaration(self):
+        self.variable_stack.pop()
+
+    def action_target(self):
+        token = self.current_token()
+        var = self.get_variable(token.value)
+        if var is None:
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"Variable '{token.value}' no declarada",
+                token.line,
+                token.position
+            )
+        self.variable_stack.append(var)
+
+    def action_read_target(self):
+        self.variable_stack.pop()
+        self.use_variable(self.previous_token())
+        self.flow.discard()
+
+    def action_assignment_operator(self):
+        operator = self.previous_token().value
+        self.flow.target(self.variable_stack[-1], self.tokens[self.current - 2])
+        if operator in COMPOUND_ASSIGNMENT_OPERATORS:
+            self.flow.read(self.variable_stack[-1], self.tokens[self.current - 2])
+        self.operator_stack.append(operator)
+
+    def action_assignment_value(self):
+        self.finish_assignment(self.variable_stack.pop(), self.operator_stack.pop(), self.type_stack.pop())
+
+    def action_operator(self):
+        self.operator_stack.append(self.previous_token().value)
+
+    def action_combine(self):
+        right_type = self.type_stack.pop()
+        left_type = self.type_stack.pop()
+        self.type_stack.append(self.combine_types(left_type, self.operator_stack.pop(), right_type))
+
+    def action_end_expression(self):
+        self.flow.end_expression()
+
+    def action_variable(self):
+        self.type_stack.append(self.use_variable(self.current_token()).type)
+
+    def action_literal(self):
+        token = self.current_token()
+        type_ = self.literal_type(token)
+        self.flow.constant(token, type_)
+        self.type_stack.append(type_)
+
+
+def parse_tokens(tokens: List[Token], flow_class=FlowGraph,
+                 parsers: Tuple[Parser, 'LL1Parser'] = None) -> Tuple[Parser, Optional[CompilerError]]:
+    """Analiza con Parser y, si el anidamiento agota la pila de Python, repite con LL1Parser.
+
+    Devuelve (parser que hizo el análisis, primer error o None); con error,
+    el parser conserva lo analizado hasta detenerse (scope_tree, flow) y
+    todos los problemas del análisis de flujo (diagnostics). Con parsers,
+    reutiliza ese Parser y ese LL1Parser en lugar de crearlos.
+    """
+    if parsers is None:
+        parser = Parser(tokens, flow_class)
+    else:
+        parser = parsers[0]
+        parser.reset(tokens)
+    try:
+        try:
+            parser.parse()
+        except NestingTooDeep:
+            if parsers is None:
+                parser = LL1Parser(tokens, flow_class)
+            else:
+                parser = parsers[1]
+                parser.reset(tokens)
+            parser.parse()
+    except CompilerError as e:
+        return parser, e
+    return parser, None
@@ -0,0 +1,113 @@
+from enum import Enum
+from typing import Optional, Tuple
+
+class TokenType(Enum):
+    NUMBER = 'NUMBER'
+    IDENTIFIER = 'IDENTIFIER'
+    KEYWORD = 'KEYWORD'
+    OPERATOR = 'OPERATOR'
+    DELIMITER = 'DELIMITER'
+    #Token [NEW]
+    ARROBA = 'ARROBA'
+    ERROR = 'ERROR'
+    STRING = 'STRING'
+    BOOLEAN = 'BOOLEAN'  # Nuevo tipo para booleanos
+
+class ErrorType(Enum):
+    LEXICAL = "Error Léxico"
+    SYNTACTIC = "Error Sintáctico"
+    SEMANTIC = "Error Semántico"
+
+    @property
+    def code(self) -> str:
+        """Código estable para consumidores automáticos; no cambia con el texto del mensaje"""
+        return ERROR_CODES[self]
+
+ERROR_CODES = {
+    ErrorType.LEXICAL: 'E100',
+    ErrorType.SYNTACTIC: 'E200',
+    ErrorType.SEMANTIC: 'E300',
+}
+
+# Código entero de cada tipo de token y tabla de nombres. TokenType.value es un
+# descriptor de Enum; en los bucles sobre millones de tokens se usa la tabla
+TOKEN_TYPES = tuple(TokenType)
+TOKEN_TYPE_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+TOKEN_TYPE_NAMES = {token_type: token_type.value for token_type in TOKEN_TYPES}
+
+# Representación como tupla: (código de tipo, valor, línea, posición, offset)
+TokenRow = Tuple[int, str, int, int, Optional[int]]
+
+class Token:
+    # Sin __dict__: los tokens se crean por millones en entradas grandes
+    __slots__ = ('type', 'value', 'line', 'position', 'offset')
+
+    def __init__(self, type: TokenType, value: str, line: int, position: int, offset: int = None):
+        self.type = type
+        self.value = value
+        self.line = line
+        self.position = position
+        # Offset de inicio en el buffer (ver source_map.SourceMap)
+        self.offset = offset
+
+    @property
+    def end(self) -> int:
+        return self.offset + len(self.value)
+
+    @property
+    def kind(self) -> int:
+        """Código entero del tipo (índice en TOKEN_TYPES)"""
+        return TOKEN_TYPE_CODES[self.type]
+
+    @property
+    def type_name(self) -> str:
+        return TOKEN_TYPE_NAMES[self.type]
+
+    def as_row(self) -> TokenRow:
+        return (TOKEN_TYPE_CODES[self.type], self.value, self.line, self.position, self.offset)
+
+    @classmethod
+    def from_row(cls, row: TokenRow) -> 'Token':
+        return cls(TOKEN_TYPES[row[0]], row[1], row[2], row[3], row[4])
+
+    def __str__(self):
+        return f"Token({TOKEN_TYPE_NAMES[self.type]}, '{self.value}', línea {self.line}, pos {self.position})"
+
+class CompilerError(Exception):
+    __slots__ = ('error_type', 'message', 'line', 'position', 'expected', 'received', 'offset', 'length')
+
+    def __init__(self, error_type: ErrorType, message: str, line: int, position: int, expected: str = None, received: str = None, offset: int = None, length: int = 1):
+        self.error_type = error_type
+        self.message = message
+        self.line = line
+        self.position = position
+        self.expected = expected
+        self.received = received
+        self.offset = offset
+        self.length = length
+
+    def __reduce__(self):
+        # Con __slots__ el pickle por defecto de las excepciones perdería los campos
+        return (type(self), (self.error_type, self.message, self.line, self.position, self.expected,
+                             self.received, self.offset, self.length))
+
+    def span(self, source_map) -> tuple:
+        """Devuelve (inicio, fin) del error como offsets del buffer"""
+        start = self.offset if self.offset is not None else source_map.offset(self.line, self.position)
+        return start, min(start + max(self.length, 1), source_map.length)
+
+    def __str__(self):
+        base_msg = f"{self.error_type.value} en línea {self.line}, posición {self.position}: {self.message}"
+        if self.expected and self.received:
+            base_msg += f"\nEsperaba: {self.expected}\nRecibió: {self.received}"
+        return base_msg
+
+class Variable:
+    __slots__ = ('name', 'type', 'initialized', 'value', 'used')
+
+    def __init__(self, name: str, type: str, initialized: bool = False, value=None):
+        self.name = name
+        self.type = type
+        self.initialized = initialized
+        self.value = value
+        self.used = False
\ No newline at end of file
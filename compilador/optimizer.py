@@ -0,0 +1,265 @@
+"""Optimización de bucles sobre la IR estructurada.
+
+optimize devuelve un Program nuevo (el original no se modifica) tras tres pasos:
+
+    incrementos  load x; const c; add/sub; store x  ->  inc x, ±c
+    invariantes  los cálculos de un bucle cuyos operandos no cambian dentro
+                 de él se sacan al bloque anterior (el preencabezado)
+    contados     for (i = a; i < n; i += c) con n invariante e i sin otros
+                 stores ni lecturas fuera del bucle: el nodo guarda su rango
+                 y el backend lo ejecuta como un for de Python sobre range()
+
+Solo se sacan de los bucles operaciones que no pueden fallar (la división
+solo si el divisor es una constante distinta de cero); las conversiones se
+quedan donde están, porque el bucle podría no ejecutarse.
+
+Uso: python -m compilador.optimizer [archivo]   (vuelca la IR optimizada)
+"""
+import sys
+from typing import Dict, List, Set
+
+from .ir import Program, Instruction, build_ir, RELATIONAL, LOGICAL, INT, FLOAT
+from .lexer import Lexer
+from .m_token import CompilerError
+
+PURE = frozenset({'add', 'sub', 'mul'} | set(RELATIONAL.values()) | set(LOGICAL.values()))
+# Comparación -> (signo que debe tener el paso, ajuste del límite de range)
+COUNTED = {'lt': (1, 0), 'le': (1, 1), 'gt': (-1, 0), 'ge': (-1, -1)}
+
+
+def copy_structure(items: list) -> list:
+    copied = []
+    for item in items:
+        if isinstance(item, list):
+            item = [copy_structure(part) if isinstance(part, list) else part for part in item]
+        copied.append(item)
+    return copied
+
+
+def loop_blocks(items: list, blocks: List[int]) -> List[int]:
+    """Bloques de una secuencia y de todos sus nodos anidados, en orden"""
+    for item in items:
+        if isinstance(item, int):
+            blocks.append(item)
+        elif isinstance(item, list):
+            for part in item[1:]:
+                if isinstance(part, list):
+                    loop_blocks(part, blocks)
+    return blocks
+
+
+class LoopOptimizer:
+    def __init__(self, program: Program):
+        self.program = Program([list(block) for block in program.blocks], program.variables,
+                               program.temp_types, copy_structure(program.structure))
+        self.stats = {'increments': 0, 'hoisted': 0, 'counted_loops': 0}
+        self.uses = [0] * len(program.temp_types)
+        self.definitions: Dict[int, int] = {}  # temporal -> bloque que lo define
+        self.constants: Dict[int, object] = {}  # temporal -> valor de su const
+        self.reachable = self.reachable_blocks()
+        for index, block in enumerate(self.program.blocks):
+            for instruction in block:
+                if instruction.dest is not None:
+                    self.definitions[instruction.dest] = index
+                if instruction.op == 'const':
+                    self.constants[instruction.dest] = instruction.args[0]
+                for temp in self.operands(instruction):
+                    self.uses[temp] += 1
+
+    def reachable_blocks(self) -> Set[int]:
+        # El análisis de flujo no revisa el código inalcanzable: sus lecturas
+        # pueden ser de variables sin inicializar y no deben salir del bucle
+        seen, pending = {0}, [0]
+        while pending:
+            for successor in self.program.successors(pending.pop()):
+                if successor not in seen:
+                    seen.add(successor)
+                    pending.append(successor)
+        return seen
+
+    @staticmethod
+    def operands(instruction: Instruction) -> tuple:
+        op, args = instruction.op, instruction.args
+        if op in ('const', 'load', 'inc', 'jump', 'exit'):
+            return ()
+        if op == 'store':
+            return args[1:]
+        if op == 'branch':
+            return args[:1]
+        return args
+
+    def run(self) -> Program:
+        for block in self.program.blocks:
+            self.reduce_increments(block)
+        self.optimize_sequence(self.program.structure)
+        self.program.optimizations = self.stats
+        return self.program
+
+    # Incrementos
+
+    def reduce_increments(self, block: List[Instruction]):
+        for index in range(len(block)):
+            if self.match_increment(block, index):
+                self.stats['increments'] += 1
+
+    def match_increment(self, block: List[Instruction], index: int) -> bool:
+        window = block[index:index + 5]
+        if len(window) < 4 or window[0].op != 'load' or window[1].op != 'const':
+            return False
+        load, constant = window[0], window[1]
+        amount, rest, length = constant.args[0], window[2:], 4
+        if rest[0].op == 'itof' and rest[0].args == (constant.dest,):
+            if type(amount) is not int or abs(amount) > 2 ** 53:
+                return False
+            amount, rest, length = float(amount), rest[1:], 5
+            operand = window[2].dest
+        else:
+            operand = constant.dest
+        if len(rest) < 2:
+            return False
+        operation, store = rest[0], rest[1]
+        slot, type_id = load.args[0], load.type_id
+        if (operation.op not in ('add', 'sub') or operation.args != (load.dest, operand)
+                or store.op != 'store' or store.args != (slot, operation.dest)
+                or type(amount) is not (int if type_id == INT else float) or type_id not in (INT, FLOAT)):
+            return False
+        temps = [load.dest, constant.dest, operation.dest] + ([operand] if length == 5 else [])
+        if any(self.uses[temp] != 1 for temp in temps):
+            return False
+        if operation.op == 'sub':
+            amount = -amount
+        block[index:index + length] = [Instruction('inc', type_id, args=(slot, amount), line=store.line)]
+        return True
+
+    # Bucles: primero los interiores, para que lo que sacan pueda volver a subir
+
+    def optimize_sequence(self, items: list):
+        for position, item in enumerate(items):
+            if not isinstance(item, list):
+                continue
+            for part in item[1:]:
+                if isinstance(part, list):
+                    self.optimize_sequence(part)
+            if item[0] == 'loop' and position > 0 and isinstance(items[position - 1], int):
+                self.optimize_loop(item, items[position - 1])
+
+    def optimize_loop(self, node: list, preheader: int):
+        header = node[1]
+        if not isinstance(header[0], int) or self.program.successors(preheader) != (header[0],):
+            return
+        blocks = loop_blocks([node], [])
+        inside = set(blocks)
+        stored: Set[int] = set()
+        for index in blocks:
+            for instruction in self.program.blocks[index]:
+                if instruction.op in ('store', 'inc'):
+                    stored.add(instruction.args[0])
+        self.hoist(blocks, inside, stored, preheader)
+        self.count_loop(node, inside, stored, preheader)
+
+    def invariant(self, temp: int, inside: Set[int], invariant: Set[int]) -> bool:
+        return temp in invariant or self.definitions.get(temp) not in inside
+
+    def hoist(self, blocks: List[int], inside: Set[int], stored: Set[int], preheader: int):
+        invariant: Set[int] = set()
+        computations = []
+        for index in blocks:
+            if index not in self.reachable:
+                continue
+            for instruction in self.program.blocks[index]:
+                op = instruction.op
+                if op == 'const' or (op == 'load' and instruction.args[0] not in stored):
+                    invariant.add(instruction.dest)
+                elif (op in PURE or (op == 'div' and self.constants.get(instruction.args[1], 0) != 0)) \
+                        and all(self.invariant(arg, inside, invariant) for arg in instruction.args):
+                    invariant.add(instruction.dest)
+                    computations.append(instruction)
+        if not computations:
+            return
+        # Se sacan los cálculos y los const/load de dentro del bucle que necesitan
+        moving = {instruction.dest for instruction in computations}
+        pending = [arg for instruction in computations for arg in instruction.args]
+        while pending:
+            temp = pending.pop()
+            if temp not in moving and self.definitions.get(temp) in inside:
+                moving.add(temp)
+        moved = []
+        for index in blocks:
+            block = self.program.blocks[index]
+            kept = []
+            for instruction in block:
+                if instruction.dest in moving:
+                    # Sin línea: el preencabezado no debe contar como una pasada por el cuerpo
+                    moved.append(Instruction(instruction.op, instruction.type_id, instruction.dest,
+                                             instruction.args))
+                    self.definitions[instruction.dest] = preheader
+                else:
+                    kept.append(instruction)
+            block[:] = kept
+        target = self.program.blocks[preheader]
+        target[-1:-1] = moved
+        self.stats['hoisted'] += len(computations)
+
+    def count_loop(self, node: list, inside: Set[int], stored: Set[int], preheader: int):
+        _, header, condition, body, step, _ = node
+        if len(header) != 1 or len(step) != 1 or not isinstance(step[0], int):
+            return
+        code, step_code = self.program.blocks[header[0]], self.program.blocks[step[0]]
+        if len(step_code) != 2 or step_code[0].op != 'inc' or step_code[0].type_id != INT:
+            return
+        slot, amount = step_code[0].args
+        compare = code[-2] if len(code) >= 2 else None
+        if compare is None or compare.dest != condition or compare.op not in COUNTED:
+            return
+        sign, adjust = COUNTED[compare.op]
+        if amount * sign <= 0:
+            return
+        prefix = code[:-2]
+        load = next((i for i in prefix if i.dest == compare.args[0]), None)
+        if load is None or load.op != 'load' or load.args[0] != slot or \
+                self.program.temp_types[compare.args[1]] != INT:
+            return
+        # El resto de la cabecera solo puede calcular el límite, y sin leer i
+        bound = compare.args[1]
+        others = [i for i in prefix if i is not load]
+        if any(i.op not in ('const', 'load') or i.dest != bound or (i.op == 'load' and i.args[0] in stored)
+               for i in others):
+            return
+        if self.definitions.get(bound) in inside and not others:
+            return
+        # i solo cambia en el incremento y no se lee fuera del bucle
+        for index in inside:
+            for instruction in self.program.blocks[index]:
+                if instruction.op in ('store', 'inc') and instruction.args[0] == slot \
+                        and instruction is not step_code[0]:
+                    return
+        for index, block in enumerate(self.program.blocks):
+            if index not in inside and any(i.op == 'load' and i.args[0] == slot for i in block):
+                return
+        target = self.program.blocks[preheader]
+        for instruction in others:
+            code.remove(instruction)
+            target.insert(len(target) - 1, instruction)
+            self.definitions[instruction.dest] = preheader
+        node[5] = (slot, bound, adjust, amount)
+        self.stats['counted_loops'] += 1
+
+
+def optimize(program: Program) -> Program:
+    """Devuelve una copia optimizada del programa; las estadísticas quedan en optimizations"""
+    return LoopOptimizer(program).run()
+
+
+def main():
+    source = open(sys.argv[1], encoding='utf-8').read() if len(sys.argv) > 1 else sys.stdin.read()
+    try:
+        program = optimize(build_ir(Lexer().tokenize(source)))
+    except CompilerError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.write(program.dump())
+    print("; " + ", ".join(f"{name}: {count}" for name, count in program.optimizations.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Canal de salida de print durante la ejecución.
+
+El programa escribe en un anillo en memoria de tamaño fijo; el consumidor
+(stdout o la consola de la interfaz) recibe las líneas por lotes, cuando se
+acumulan batch_size o cuando pasa interval desde el último lote. Si el
+programa escribe más rápido de lo que se consume, se descartan las líneas
+más antiguas y se cuentan en dropped, así que la memoria no crece aunque un
+bucle imprima sin fin.
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, List
+
+CAPACITY = 10000
+BATCH_SIZE = 1000
+INTERVAL = 0.05
+CHECK_EVERY = 256  # Escrituras entre consultas del reloj
+
+
+class OutputClosed(Exception):
+    """El consumidor cerró la salida (por ejemplo, el usuario detuvo la ejecución)"""
+
+
+class OutputBuffer:
+    """Anillo de líneas impresas que se vacía por lotes.
+
+    Con sink, write entrega los lotes por sí mismo (salida síncrona, como
+    stdout). Sin sink, otro hilo recoge las líneas con drain(), por ejemplo
+    desde un temporizador de la interfaz.
+    """
+
+    def __init__(self, sink: Callable[[List[str]], None] = None, capacity: int = CAPACITY,
+                 batch_size: int = BATCH_SIZE, interval: float = INTERVAL):
+        self.sink = sink
+        self.lines = deque(maxlen=capacity)
+        self.batch_size = min(batch_size, capacity)
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.reported = 0  # Descartes ya avisados al consumidor
+        self.closed = False
+        self.last_flush = time.monotonic()
+
+    def write(self, line: str):
+        if self.closed:
+            raise OutputClosed
+        with self.lock:
+            lines = self.lines
+            if len(lines) == lines.maxlen:
+                self.dropped += 1
+            lines.append(line)
+            self.written += 1
+            pending = len(lines)
+        if self.sink is not None and (pending >= self.batch_size or (
+                self.written % CHECK_EVERY == 0 and time.monotonic() - self.last_flush >= self.interval)):
+            self.flush()
+
+    def drain(self) -> List[str]:
+        """Saca las líneas pendientes; si hubo descartes, el lote empieza con un aviso"""
+        with self.lock:
+            batch = list(self.lines)
+            self.lines.clear()
+            dropped = self.dropped - self.reported
+            self.reported = self.dropped
+        self.last_flush = time.monotonic()
+        if dropped:
+            batch.insert(0, f"... {dropped} líneas omitidas ...")
+        return batch
+
+    def flush(self):
+        batch = self.drain()
+        if batch and self.sink is not None:
+            self.sink(batch)
+
+    def close(self):
+        """Hace que la próxima escritura del programa lance OutputClosed"""
+        self.closed = True
+
+
+def stream_sink(stream) -> Callable[[List[str]], None]:
+    """Consumidor que escribe cada lote en un archivo de texto (por ejemplo, sys.stdout)"""
+    def sink(batch: List[str]):
+        stream.write("\n".join(batch) + "\n")
+        stream.flush()
+    return sink
@@ -0,0 +1,643 @@
+from typing import List, Dict
+from .m_token import Token, TokenType, Variable, CompilerError, ErrorType
+from .dataflow import FlowGraph
+
+# Tablas precalculadas; el lexer interna los valores de los tokens, así que
+# las búsquedas usan el hash ya cacheado de cada string
+TYPE_KEYWORDS = frozenset({'int', 'float', 'string', 'boolean'})
+NUMERIC_TYPES = frozenset({'int', 'float'})
+RELATIONAL_OPERATORS = frozenset({'>', '<', '>=', '<=', '==', '!='})
+ARITHMETIC_OPERATORS = frozenset({'+', '-', '*', '/'})
+LOGICAL_OPERATORS = frozenset({'&&', '||'})
+COMPOUND_ASSIGNMENT_OPERATORS = frozenset({'+=', '-=', '*=', '/='})
+LITERAL_TYPES = {
+    TokenType.NUMBER: 'int',
+    TokenType.ARROBA: 'ARROBA',  # Tipo [NEW]
+    TokenType.STRING: 'string',
+    TokenType.BOOLEAN: 'boolean',
+}
+
+class NestingTooDeep(CompilerError):
+    """El programa anida más niveles de los que admite la pila de Python"""
+
+
+class Scope:
+    """Ámbito del programa que el parser construye al analizar.
+
+    start es el índice del primer token dentro del ámbito (el que sigue a '{',
+    o a '(' en la inicialización de un for) y end el del token que sigue a su
+    cierre, o None si el análisis se detuvo antes. El ámbito global va de 0 a
+    len(tokens). declarations guarda el token del nombre de cada variable, en
+    el mismo orden que variables (vacío si el parser no conserva los ámbitos).
+    """
+    __slots__ = ('parent', 'start', 'end', 'variables', 'declarations', 'children')
+
+    def __init__(self, parent: 'Scope', start: int, variables: Dict[str, Variable], end: int = None):
+        self.parent = parent
+        self.start = start
+        self.end = end
+        self.variables = variables
+        self.declarations: List[Token] = []
+        self.children: List['Scope'] = []
+
+    def keyword(self, tokens: List[Token]) -> str:
+        """Sentencia que abre el ámbito: if, else, while, for o global"""
+        if self.parent is None:
+            return 'global'
+        index = self.start - 1
+        if tokens[index].value == '(':
+            return 'for'  # Inicialización del for
+        index -= 1
+        if tokens[index].value != ')':
+            return tokens[index].value  # else
+        # Retroceder hasta el '(' de la condición
+        depth = 0
+        while True:
+            value = tokens[index].value
+            if value == ')':
+                depth += 1
+            elif value == '(':
+                depth -= 1
+                if depth == 0:
+                    return tokens[index - 1].value
+            index -= 1
+
+    def lines(self, tokens: List[Token]) -> tuple:
+        """(primera, última) línea del ámbito, con sus delimitadores; la última es None si no se cerró"""
+        if not tokens:
+            return 1, 1
+        first = tokens[self.start - 1].line if self.parent is not None else tokens[0].line
+        last = tokens[self.end - 1].line if self.end else None
+        return first, last
+
+
+class Parser:
+    # Con False los ámbitos cerrados no quedan en scope_tree y se liberan, y
+    # no se guardan los tokens de las declaraciones (ver spill)
+    keep_scopes = True
+
+    def __init__(self, tokens: List[Token], flow_class=FlowGraph):
+        # FlowGraph o una subclase que además genere código (ver ir.IRBuilder)
+        self.flow_class = flow_class
+        self.reset(tokens)
+        # Despacho de statements por palabra clave
+        self.statement_handlers = {
+            'int': self.parse_variable_declaration,
+            'float': self.parse_variable_declaration,
+            'string': self.parse_variable_declaration,
+            'boolean': self.parse_variable_declaration,
+            'if': self.parse_if_statement,
+            'while': self.parse_while_statement,
+            'for': self.parse_for_statement,
+            'print': self.parse_print_statement,
+            'break': self.parse_loop_control,
+            'continue': self.parse_loop_control,
+        }
+
+    def reset(self, tokens: List[Token]):
+        """Prepara el parser para analizar otro programa reutilizando la instancia"""
+        self.tokens = tokens
+        self.current = 0
+        self.scope_stack = [{}]  # Cada elemento es un dict de Variable objects
+        # Árbol de ámbitos que queda tras el análisis y ámbito en curso
+        self.scope_tree = self.scope = Scope(None, 0, self.scope_stack[0], len(tokens))
+        # Para cada nombre, sus declaraciones visibles de la más externa a la
+        # más interna; hace que get_variable no dependa de la profundidad
+        self.symbols: Dict[str, List[Variable]] = {}
+        self.loop_depth = 0
+        self.flow = self.flow_class()
+        # Todos los problemas del análisis de flujo; parse() lanza el primero
+        self.diagnostics: List[CompilerError] = []
+    
+    def parse_print_statement(self):
+        """Analiza una declaración print y sus argumentos"""
+        self.advance()  # consume 'print'
+        self.expect(TokenType.DELIMITER, '(')
+        
+        # Guardar el tipo retornado por la expresión
+        expr_type = self.parse_expression()
+        
+        if expr_type is None:
+            token = self.current_token()
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                "Expresión inválida en print",
+                token.line,
+                token.position
+            )
+
+        self.flow.print_value()
+        self.expect(TokenType.DELIMITER, ')')
+        self.expect(TokenType.DELIMITER, ';')
+        
+        return expr_type
+
+    
+
+    def get_variable(self, var_name: str) -> Variable:
+        """Busca una variable en todos los ámbitos, desde el más interno al más externo"""
+        declarations = self.symbols.get(var_name)
+        return declarations[-1] if declarations else None
+
+    def push_scope(self):
+        variables = {}
+        self.scope_stack.append(variables)
+        scope = Scope(self.scope, self.current, variables)
+        if self.keep_scopes:
+            self.scope.children.append(scope)
+        self.scope = scope
+        self.flow.begin_scope()
+
+    def pop_scope(self):
+        symbols = self.symbols
+        for name in self.scope_stack.pop():
+            declarations = symbols[name]
+            declarations.pop()
+            if not declarations:
+                del symbols[name]  # Sin entradas de nombres que ya no son visibles
+        self.scope.end = self.current
+        self.scope = self.scope.parent
+        self.flow.end_scope()
+    
+    ## VERIFICA DECLARACION DOBLE
+    def declare_variable(self, name: str, type_: str, initialized: bool = False):
+        if self.declared_here(name):
+            token = self.current_token()
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"Variable '{name}' ya declarada en este ámbito",
+                token.line,
+                token.position
+            )
+        var = self.add_variable(name, type_, initialized)
+        token = self.current_token()
+        if self.keep_scopes:
+            self.scope.declarations.append(token)
+        self.flow.declare(var, token)
+        return var
+
+    def declared_here(self, name: str) -> bool:
+        return name in self.scope_stack[-1]
+
+    def add_variable(self, name: str, type_: str, initialized: bool) -> Variable:
+        """Registra la variable en el ámbito en curso (ver spill.BoundedParser)"""
+        var = self.scope_stack[-1][name] = Variable(name, type_, initialized)
+        self.symbols.setdefault(name, []).append(var)
+        return var
+
+
+    def validate_types(self, left_type: str, right_type: str, operator: str):
+        # Validación de tipos para operaciones booleanas
+        if operator in LOGICAL_OPERATORS:
+            if left_type != 'boolean' or right_type != 'boolean':
+                token = self.current_token()
+                raise CompilerError(
+                    ErrorType.SEMANTIC,
+                    f"Operador '{operator}' requiere operandos booleanos",
+                    token.line,
+                    token.position
+                )
+            return 'boolean'
+
+        # Validación de tipos para operaciones aritméticas
+        if operator in ARITHMETIC_OPERATORS:
+            if left_type == 'string' and right_type == 'string' and operator == '+':
+                return 'string'
+            if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+                return 'float' if 'float' in (left_type, right_type) else 'int'
+            token = self.current_token()
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"Operación '{operator}' no válida entre tipos {left_type} y {right_type}",
+                token.line,
+                token.position
+            )
+
+        # Validación de tipos para operaciones de comparación
+        if operator in RELATIONAL_OPERATORS:
+            if left_type == right_type:
+                return 'boolean'
+            if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+                return 'boolean'
+            token = self.current_token()
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"Comparación no válida entre tipos {left_type} y {right_type}",
+                token.line,
+                token.position
+            )
+
+        return None
+
+
+    def combine_types(self, left_type: str, operator: str, right_type: str) -> str:
+        """Tipo resultante de 'left_type operator right_type' en una expresión"""
+        # Validar que ambos tipos no sean None
+        if left_type is None or right_type is None:
+            token = self.current_token()
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"No se puede realizar la operación '{operator}' con valores indefinidos",
+                token.line,
+                token.position
+            )
+        
+        # Validación de operadores relacionales
+        if operator in RELATIONAL_OPERATORS:
+            if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+                left_type = 'boolean'  # La comparación produce un boolean
+            elif left_type == right_type:
+                left_type = 'boolean'
+            else:
+                token = self.current_token()
+                raise CompilerError(
+                    ErrorType.SEMANTIC,
+                    f"Comparación no válida entre tipos {left_type} y {right_type}",
+                    token.line,
+                    token.position
+                )
+        # Operadores aritméticos
+        elif operator in ARITHMETIC_OPERATORS:
+            if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+                left_type = 'float' if 'float' in (left_type, right_type) else 'int'
+            else:
+                token = self.current_token()
+                raise CompilerError(
+                    ErrorType.SEMANTIC,
+                    f"Operación '{operator}' no válida entre tipos {left_type} y {right_type}",
+                    token.line,
+                    token.position
+                )
+        # Operadores lógicos
+        elif operator in LOGICAL_OPERATORS:
+            if left_type == 'boolean' and right_type == 'boolean':
+                left_type = 'boolean'
+            else:
+                token = self.current_token()
+                raise CompilerError(
+                    ErrorType.SEMANTIC,
+                    f"Operador '{operator}' requiere operandos booleanos",
+                    token.line,
+                    token.position
+                )
+
+        self.flow.operation(operator, left_type)
+        return left_type
+
+    def parse_expression(self):
+        """Analiza una expresión y retorna su tipo"""
+        left_type = self.parse_term()
+        
+        while (self.current < len(self.tokens) and 
+               self.current_token().type == TokenType.OPERATOR):
+            operator = self.current_token().value
+            self.advance()
+            
+            right_type = self.parse_term()
+            
+            left_type = self.combine_types(left_type, operator, right_type)
+
+        self.flow.end_expression()
+        return left_type
+
+    def use_variable(self, token: Token) -> Variable:
+        """Lectura de una variable: debe estar declarada; la inicialización la comprueba el análisis de flujo"""
+        var = self.get_variable(token.value)
+        if var is None:
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"Variable '{token.value}' no declarada",
+                token.line,
+                token.position
+            )
+        self.flow.read(var, token)
+        var.used = True
+        return var
+
+    def literal_type(self, token: Token) -> str:
+        if token.type == TokenType.NUMBER:
+            return 'float' if '.' in token.value else 'int'
+        return LITERAL_TYPES[token.type]
+
+    def parse_term(self):
+        token = self.current_token()
+        
+        if token.type == TokenType.IDENTIFIER:
+            var = self.use_variable(token)
+            self.advance()
+            return var.type
+            ### VERIFICA EL TIPO
+        elif token.type in LITERAL_TYPES:
+            self.advance()
+            type_ = self.literal_type(token)
+            self.flow.constant(token, type_)
+            return type_
+            
+        elif token.value == '(':
+            self.advance()
+            type_ = self.parse_expression()
+            self.expect(TokenType.DELIMITER, ')')
+            return type_
+            
+        raise CompilerError(
+            ErrorType.SYNTACTIC,
+            "Se esperaba un término válido",
+            token.line,
+            token.position
+        )
+
+    def parse_variable_declaration(self):
+        tipo = self.current_token().value
+        self.advance()
+
+        if self.current_token().type != TokenType.IDENTIFIER:
+            raise CompilerError(
+                ErrorType.SYNTACTIC,
+                "Se esperaba un identificador",
+                self.current_token().line,
+                self.current_token().position
+            )
+
+        var_name = self.current_token().value
+        var = self.declare_variable(var_name, tipo)
+        self.advance()
+
+        initialized = False
+        if self.current_token().type == TokenType.OPERATOR and self.current_token().value == '=':
+            self.advance()
+            value_type = self.parse_expression()
+            self.check_assignable(tipo, value_type)
+            initialized = True
+            var.initialized = True
+            self.flow.assign(var)
+
+        self.expect(TokenType.DELIMITER, ';')
+
+    def parse_assignment(self):
+        target = self.current_token()
+        var_name = target.value
+        var = self.get_variable(var_name)
+        if var is None:
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"Variable '{var_name}' no declarada",
+                self.current_token().line,
+                self.current_token().position
+            )
+
+        self.flow.target(var, target)
+        self.advance()
+        operator = self.current_token().value
+        self.advance()
+
+        if operator in COMPOUND_ASSIGNMENT_OPERATORS:
+            self.flow.read(var, target)
+        value_type = self.parse_expression()
+        self.finish_assignment(var, operator, value_type)
+        self.expect(TokenType.DELIMITER, ';')
+
+    def check_assignable(self, target_type: str, value_type: str):
+        if target_type != value_type and not (target_type in NUMERIC_TYPES and value_type in NUMERIC_TYPES):
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"No se puede asignar valor de tipo {value_type} a variable de tipo {target_type}",
+                self.current_token().line,
+                self.current_token().position
+            )
+
+    def finish_assignment(self, var: Variable, operator: str, value_type: str):
+        """Valida el valor asignado con '=' o un operador compuesto y marca la variable"""
+        if operator in COMPOUND_ASSIGNMENT_OPERATORS:
+            if var.type not in NUMERIC_TYPES or value_type not in NUMERIC_TYPES:
+                raise CompilerError(
+                    ErrorType.SEMANTIC,
+                    f"Operador {operator} solo válido para tipos numéricos",
+                    self.current_token().line,
+                    self.current_token().position
+                )
+        else:
+            self.check_assignable(var.type, value_type)
+
+        var.initialized = True
+        self.flow.assign(var, operator)
+
+    def check_condition(self, condition_type: str, statement: str, token: Token):
+        if condition_type != 'boolean':
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"La condición del {statement} debe ser de tipo boolean",
+                token.line,
+                token.position
+            )
+
+    def parse_if_statement(self):
+        """Analiza una estructura if con validación de tipo booleano"""
+        self.advance()  # consume 'if'
+        self.expect(TokenType.DELIMITER, '(')
+        
+        condition_type = self.parse_expression()
+        self.check_condition(condition_type, 'if', self.tokens[self.current - 1])  # Token anterior
+        self.flow.begin_if()
+            
+        self.expect(TokenType.DELIMITER, ')')
+        self.expect(TokenType.DELIMITER, '{')
+        
+        self.push_scope()
+        while self.current < len(self.tokens) and self.current_token().value != '}':
+            self.parse_statement()
+        self.expect(TokenType.DELIMITER, '}')
+        self.pop_scope()
+
+        if (self.current < len(self.tokens) and 
+            self.current_token().type == TokenType.KEYWORD and 
+            self.current_token().value == 'else'):
+            self.advance()
+            self.flow.begin_else()
+            self.expect(TokenType.DELIMITER, '{')
+            
+            self.push_scope()
+            while self.current < len(self.tokens) and self.current_token().value != '}':
+                self.parse_statement()
+            self.expect(TokenType.DELIMITER, '}')
+            self.pop_scope()
+
+        self.flow.end_if()
+
+    def parse_while_statement(self):
+        self.loop_depth += 1
+        self.advance()  # consume 'while'
+        self.flow.begin_loop()
+        self.expect(TokenType.DELIMITER, '(')
+        
+        condition_type = self.parse_expression()
+        self.check_condition(condition_type, 'while', self.current_token())
+        self.flow.loop_body()
+            
+        self.expect(TokenType.DELIMITER, ')')
+        self.expect(TokenType.DELIMITER, '{')
+        
+        self.push_scope()
+        while self.current < len(self.tokens) and self.current_token().value != '}':
+            self.parse_statement()
+        self.expect(TokenType.DELIMITER, '}')
+        self.pop_scope()
+        self.flow.end_loop()
+        self.loop_depth -= 1
+
+    def parse_for_statement(self):
+        """Analiza una estructura for con manejo mejorado de ámbitos"""
+        self.loop_depth += 1
+        self.advance()  # consume 'for'
+        self.expect(TokenType.DELIMITER, '(')
+        
+        # Crear nuevo ámbito para el for
+        self.push_scope()
+        
+        # Inicialización
+        if self.current_token().value in TYPE_KEYWORDS:
+            self.parse_variable_declaration()
+        else:
+            self.parse_assignment()
+            
+        # Condición
+        self.flow.begin_loop()
+        condition_type = self.parse_expression()
+        self.check_condition(condition_type, 'for', self.current_token())
+        self.flow.begin_step()
+        self.expect(TokenType.DELIMITER, ';')
+        
+        # Incremento/actualización: el flujo lo guarda en su propio bloque
+        self.parse_expression()
+        self.flow.loop_body()
+        
+        self.expect(TokenType.DELIMITER, ')')
+        self.expect(TokenType.DELIMITER, '{')
+        
+        # Crear ámbito para el cuerpo del for
+        self.push_scope()
+        
+        while self.current < len(self.tokens) and self.current_token().value != '}':
+            self.parse_statement()
+            
+        self.expect(TokenType.DELIMITER, '}')
+
+        # Eliminar el ámbito del cuerpo del for
+        self.pop_scope()
+        # Eliminar el ámbito de la inicialización del for
+        self.pop_scope()
+        
+        self.flow.end_loop()
+        self.loop_depth -= 1
+
+    def parse_loop_control(self):
+        """Analiza break/continue, que solo son válidos dentro de un bucle"""
+        token = self.current_token()
+        if self.loop_depth == 0:
+            raise CompilerError(
+                ErrorType.SEMANTIC,
+                f"'{token.value}' fuera de un bucle",
+                token.line,
+                token.position
+            )
+        self.flow.jump(token.value)
+        self.advance()
+        self.expect(TokenType.DELIMITER, ';')
+
+    def parse_statement(self):
+        """Analiza un statement con manejo mejorado de print y ámbitos"""
+        if self.current >= len(self.tokens):
+            raise CompilerError(
+                ErrorType.SYNTACTIC,
+                "Fin inesperado del código",
+                self.tokens[-1].line,
+                self.tokens[-1].position
+            )
+
+        token = self.current_token()
+        
+        if token.type == TokenType.KEYWORD:
+            handler = self.statement_handlers.get(token.value)
+            if handler is None:
+                raise CompilerError(
+                    ErrorType.SYNTACTIC,
+                    f"Palabra clave inesperada: '{token.value}'",
+                    token.line,
+                    token.position
+                )
+            handler()
+        elif token.type == TokenType.IDENTIFIER:
+            var_name = token.value
+            var = self.get_variable(var_name)
+            if var is None:
+                raise CompilerError(
+                    ErrorType.SEMANTIC,
+                    f"Variable '{var_name}' no declarada",
+                    token.line,
+                    token.position
+                )
+            if self.current + 1 < len(self.tokens) and self.tokens[self.current + 1].type == TokenType.OPERATOR:
+                self.parse_assignment()
+            else:
+                self.parse_expression()
+                self.flow.discard()
+                self.expect(TokenType.DELIMITER, ';')
+        else:
+            self.parse_expression()
+            self.flow.discard()
+            self.expect(TokenType.DELIMITER, ';')
+
+
+    def parse(self):
+        try:
+            while self.current < len(self.tokens):
+                self.parse_statement()
+            self.check_data_flow()
+        except RecursionError:
+            token = self.tokens[min(self.current, len(self.tokens) - 1)]
+            raise NestingTooDeep(
+                ErrorType.SYNTACTIC,
+                "Anidamiento demasiado profundo para el análisis recursivo",
+                token.line,
+                token.position
+            )
+        except IndexError:
+            last_token = self.tokens[-1] if self.tokens else Token(TokenType.ERROR, "", 1, 0)
+            raise CompilerError(
+                ErrorType.SYNTACTIC,
+                "Se llegó al final del código inesperadamente",
+                last_token.line,
+                last_token.position
+            )
+
+    def check_data_flow(self):
+        # Asignación definida y variables sin usar sobre el grafo de control
+        # completo; cada problema se reporta en su propio token
+        self.diagnostics = self.flow.analyze()
+        if self.diagnostics:
+            raise self.diagnostics[0]
+
+    def current_token(self) -> Token:
+        if self.current >= len(self.tokens):
+            raise CompilerError(
+                ErrorType.SYNTACTIC,
+                "Se llegó al final del código inesperadamente",
+                self.tokens[-1].line if self.tokens else 1,
+                self.tokens[-1].position if self.tokens else 0
+            )
+        return self.tokens[self.current]
+
+    def advance(self):
+        self.current += 1
+
+    def expect(self, type: TokenType, value: str):
+        token = self.current_token()
+        if token.type != type or token.value != value:
+            raise CompilerError(
+                ErrorType.SYNTACTIC,
+                f"Se esperaba '{value}'",
+                token.line,
+                token.position,
+                value,
+                token.value
+            )
+        self.advance()
\ No newline at end of file
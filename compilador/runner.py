@@ -0,0 +1,236 @@
+"""Modo de ejecución con límites de recursos y perfil por línea.
+
+Los programas pueden tener bucles sin fin (while (true) sin break), así que
+cada ejecución lleva un presupuesto de pasos, de tiempo de reloj y de
+memoria. Un paso es una llamada a tick: una por cada línea ejecutada, y al
+menos una por vuelta de cualquier bucle. tick solo cuenta; un hilo vigilante
+comprueba el tiempo y la memoria cada WATCH_INTERVAL y, si se superan,
+obliga a tick a cortar la ejecución en el paso siguiente. Así el coste por
+paso no depende de esas comprobaciones y un paso lento (un entero que crece
+sin límite) no las retrasa.
+
+Opcionalmente LineProfiler cuenta las veces que se ejecuta cada línea del
+código fuente (Token.line) y el tiempo que se pasa en ella, y lo exporta
+como JSON.
+
+Uso: python -m compilador.runner archivo [--max-steps N] [--max-seconds S]
+                                 [--max-memory MiB] [--profile perfil.json]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .backend import compile_program, CompiledProgram
+from .interpreter import ExecutionError
+from .m_token import CompilerError
+from .output import OutputBuffer, stream_sink
+
+WATCH_INTERVAL = 0.01
+MIB = 1024 * 1024
+
+
+class LimitExceeded(ExecutionError):
+    """La ejecución superó uno de sus límites de recursos"""
+
+
+class Cancelled(ExecutionError):
+    """La ejecución se detuvo desde otro hilo (Monitor.cancel)"""
+
+
+class Limits:
+    """Presupuesto de una ejecución; None desactiva el límite"""
+
+    def __init__(self, max_steps: Optional[int] = 10_000_000, max_seconds: Optional[float] = 10.0,
+                 max_memory: Optional[int] = 256 * MIB):
+        self.max_steps = max_steps
+        self.max_seconds = max_seconds
+        self.max_memory = max_memory  # Bytes de crecimiento de la memoria residente
+
+
+def resident_memory() -> Optional[int]:
+    """Memoria residente del proceso en bytes, o None si el sistema no la expone"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class LineProfiler:
+    """Ejecuciones y segundos por línea del código fuente"""
+
+    def __init__(self):
+        self.hits: Dict[int, int] = {}
+        self.seconds: Dict[int, float] = {}
+        self.line = None  # Línea en curso y momento en que empezó
+        self.start = None
+
+    def enter(self, line: int):
+        now = time.perf_counter()
+        if self.line is not None:
+            self.seconds[self.line] = self.seconds.get(self.line, 0.0) + now - self.start
+        self.hits[line] = self.hits.get(line, 0) + 1
+        self.line = line
+        self.start = now
+
+    def stop(self):
+        """Cierra el tiempo de la última línea"""
+        if self.line is not None:
+            self.seconds[self.line] = self.seconds.get(self.line, 0.0) + time.perf_counter() - self.start
+            self.line = None
+
+    def to_dict(self) -> dict:
+        return {
+            'lines': [{'line': line, 'hits': self.hits[line], 'seconds': round(self.seconds.get(line, 0.0), 6)}
+                      for line in sorted(self.hits)],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+
+class Monitor:
+    """Cuenta los pasos de una ejecución y aplica sus límites"""
+
+    def __init__(self, limits: Limits, profiler: LineProfiler = None):
+        self.limits = limits
+        self.profiler = profiler
+        self.steps = 0
+        self.started = time.monotonic()
+        self.memory = resident_memory() if limits.max_memory is not None else None
+        # tick llama a check al llegar a next_check; el vigilante lo pone a 0
+        self.next_check = limits.max_steps + 1 if limits.max_steps is not None else float('inf')
+        self.exceeded = None  # Mensaje del límite que detectó el vigilante
+        self.cancelled = False
+        self.done = threading.Event()
+        self.tick = self.profile_tick if profiler is not None else self.count_tick
+
+    def count_tick(self, line: int):
+        self.steps += 1
+        if self.steps >= self.next_check:
+            self.check()
+
+    def profile_tick(self, line: int):
+        self.profiler.enter(line)
+        self.steps += 1
+        if self.steps >= self.next_check:
+            self.check()
+
+    def check(self):
+        if self.cancelled:
+            raise Cancelled("Ejecución detenida")
+        if self.exceeded is not None:
+            raise LimitExceeded(self.exceeded)
+        raise LimitExceeded(f"Límite de pasos superado ({self.limits.max_steps})")
+
+    def watch(self):
+        """Hilo vigilante: comprueba el tiempo y la memoria hasta que acaba la ejecución"""
+        limits = self.limits
+        while not self.done.wait(WATCH_INTERVAL):
+            if self.memory is not None:
+                current = resident_memory()
+                if current is not None and current - self.memory > limits.max_memory:
+                    self.exceeded = memory_message(limits.max_memory)
+            if self.exceeded is None and limits.max_seconds is not None and self.elapsed() > limits.max_seconds:
+                self.exceeded = f"Límite de tiempo superado ({limits.max_seconds:g} s)"
+            if self.exceeded is not None:
+                self.next_check = 0
+                return
+
+    def cancel(self):
+        """Corta la ejecución en el paso siguiente; se puede llamar desde otro hilo"""
+        self.cancelled = True
+        self.next_check = 0
+
+    def start(self):
+        if self.limits.max_seconds is not None or self.memory is not None:
+            threading.Thread(target=self.watch, daemon=True).start()
+
+    def stop(self):
+        self.done.set()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+def memory_message(max_memory: int) -> str:
+    return f"Límite de memoria superado ({max_memory / MIB:g} MiB)"
+
+
+def run_limited(program: CompiledProgram, write: Callable[[str], None], limits: Limits = None,
+                profiler: LineProfiler = None, monitor: Monitor = None) -> Monitor:
+    """Ejecuta el programa con límites; lanza LimitExceeded si supera alguno.
+
+    Con monitor, se usan sus límites y su perfil: quien lo creó puede
+    detener la ejecución con monitor.cancel() (lanza Cancelled). Devuelve el
+    Monitor con los pasos y el tiempo consumidos.
+    """
+    monitor = monitor or Monitor(limits or Limits(), profiler)
+    profiler = monitor.profiler
+    monitor.start()
+    try:
+        program.run(write, monitor.tick)
+    except MemoryError:
+        raise LimitExceeded(memory_message(monitor.limits.max_memory or 0))
+    finally:
+        monitor.stop()
+        if profiler is not None:
+            profiler.stop()
+    return monitor
+
+
+def cap_address_space(max_memory: int):
+    """Límite duro del sistema para el proceso: la memoria ya usada más max_memory"""
+    try:
+        import resource
+        with open('/proc/self/statm') as statm:
+            used = int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+        resource.setrlimit(resource.RLIMIT_AS, (used + max_memory, resource.RLIM_INFINITY))
+    except (ImportError, OSError, ValueError):
+        pass  # Sin RLIMIT_AS queda la comprobación periódica de Monitor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecuta un programa con límites de recursos")
+    parser.add_argument('file')
+    parser.add_argument('--max-steps', type=int, default=10_000_000)
+    parser.add_argument('--max-seconds', type=float, default=10.0)
+    parser.add_argument('--max-memory', type=int, default=256, help="MiB")
+    parser.add_argument('--profile', help="archivo JSON donde guardar el perfil por línea")
+    args = parser.parse_args()
+
+    with open(args.file, encoding='utf-8') as file:
+        source = file.read()
+    try:
+        program = compile_program(source)
+    except CompilerError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    limits = Limits(args.max_steps, args.max_seconds, args.max_memory * MIB)
+    profiler = LineProfiler() if args.profile else None
+    output = OutputBuffer(stream_sink(sys.stdout))
+    cap_address_space(limits.max_memory)
+    status = 0
+    try:
+        monitor = run_limited(program, output.write, limits, profiler)
+        print(f"{monitor.steps} pasos en {monitor.elapsed():.3f} s", file=sys.stderr)
+    except LimitExceeded as e:
+        print(e, file=sys.stderr)
+        status = 3
+    except ExecutionError as e:
+        print(f"Error de ejecución: {e}", file=sys.stderr)
+        status = 1
+    output.flush()
+    if profiler is not None:
+        with open(args.profile, 'w', encoding='utf-8') as file:
+            file.write(profiler.to_json())
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from array import array
+from bisect import bisect_right
+
+
+class SourceMap:
+    """Índice de inicios de línea de un buffer, construido una vez por compilación.
+
+    Convierte entre offsets de carácter, pares (línea, posición) como los de
+    Token y CompilerError, e índices "línea.columna" de Tk.
+    """
+
+    def __init__(self, code: str):
+        self.length = len(code)
+        self.line_starts = array('l', [0])
+        newline = code.find('\n')
+        while newline != -1:
+            self.line_starts.append(newline + 1)
+            newline = code.find('\n', newline + 1)
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def line_col(self, offset: int) -> tuple:
+        """Convierte un offset en (línea, posición) con búsqueda binaria"""
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1]
+
+    def offset(self, line: int, position: int) -> int:
+        """Convierte (línea, posición) en offset del buffer"""
+        line = min(max(line, 1), len(self.line_starts))
+        return min(self.line_starts[line - 1] + position, self.length)
+
+    def tk_index(self, offset: int) -> str:
+        line, position = self.line_col(offset)
+        return f"{line}.{position}"
+
+    def from_tk_index(self, index: str) -> int:
+        line, position = index.split('.')
+        return self.offset(int(line), int(position))
+
+    def tk_range(self, start: int, end: int) -> tuple:
+        return self.tk_index(start), self.tk_index(end)
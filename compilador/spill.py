@@ -0,0 +1,398 @@
+"""Compilación de entradas enormes con la memoria acotada.
+
+El fichero se lee y tokeniza por trozos y los tokens se escriben en bloques
+de CHUNK_TOKENS a un fichero temporal (TokenStore), cada bloque por columnas
+con marshal y comprimido con zlib: el fichero ocupa menos que el código
+fuente. El parser lo lee a través de un mmap y solo mantiene decodificados
+los últimos bloques usados, los que caben en la ventana. Con StructuredFlow
+(ver dataflow) y sin árbol de ámbitos, lo que queda en memoria depende del
+anidamiento y de las variables locales visibles, no del tamaño de la entrada.
+Las variables globales viven todo el análisis, así que van a una tabla
+SQLite temporal (GlobalTable) y en memoria solo quedan las últimas usadas y
+un bit por global en el estado de asignación.
+
+Uso: python -m compilador.spill programa.txt [--max-memory MB]
+"""
+import argparse
+import marshal
+import mmap
+import os
+import sqlite3
+import sys
+import tempfile
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Tuple
+
+from .m_token import Token, TOKEN_TYPES, TOKEN_TYPE_CODES, CompilerError, Variable
+from .lexer import Lexer
+from .paser import Parser
+from .dataflow import StructuredFlow
+
+CHUNK_SHIFT = 14
+CHUNK_TOKENS = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_TOKENS - 1
+# Memoria aproximada de un token decodificado: el objeto, su valor si no
+# está internado, los enteros de su línea y su offset y su hueco en la lista
+TOKEN_BYTES = 192
+DEFAULT_MAX_MEMORY = 256 * 1024 * 1024
+BASELINE_MEMORY = 16 * 1024 * 1024  # El intérprete con el compilador cargado
+# Errores del lexer que solo indican que el trozo cortó un comentario o un string
+UNCLOSED = frozenset({"Comentario no cerrado", "String no cerrado"})
+MADV_DONTNEED = getattr(mmap, 'MADV_DONTNEED', None)  # No existe en Windows
+# Al leer una página, Linux mapea también las vecinas dentro de bloques
+# alineados de este tamaño (fault-around); se liberan con el bloque
+FAULT_AROUND = 64 * 1024
+CACHED_GLOBALS = 1024  # Variables globales que GlobalTable mantiene en memoria
+
+
+def budget(max_memory: int) -> Tuple[int, int]:
+    """(caracteres por trozo del lexer, bytes de la ventana de bloques) para max_memory.
+
+    Tokenizar un trozo ocupa unas 128 veces su tamaño (el texto, sus clases
+    de carácter, los tokens y, si hay que repetirlo, el trozo siguiente).
+    Lexer y parser no coinciden en el tiempo; a cada uno se le da la mitad
+    de lo que queda sobre el intérprete, con margen para las tablas del
+    parser y la fragmentación de la memoria liberada.
+    """
+    available = max(max_memory - BASELINE_MEMORY, 4 * 1024 * 1024)
+    return max(available // 256, 16 * 1024), available // 2
+
+
+class TokenStore:
+    """Secuencia de tokens de solo lectura guardada en un fichero temporal.
+
+    Se llena con extend y, tras finish, se indexa como una lista: store[i]
+    decodifica el bloque de i si no está en la ventana y descarta el menos
+    usado cuando se llena. Las páginas del mmap se liberan tras decodificar
+    cada bloque, así que no cuentan en la memoria residente.
+    """
+
+    def __init__(self, window: int = DEFAULT_MAX_MEMORY // 2, directory: str = None):
+        self.file = tempfile.TemporaryFile(dir=directory)
+        self.resident = max(2, window // (CHUNK_TOKENS * TOKEN_BYTES))
+        self.starts = array('Q', [0])  # Offset de cada bloque en el fichero y final del último
+        self.length = 0
+        self.map = None
+        self.cache: 'OrderedDict[int, List[Token]]' = OrderedDict()
+        self.chunk_number = -1  # Último bloque leído, sin pasar por el OrderedDict
+        self.chunk: List[Token] = []
+        self.loads = 0  # Bloques decodificados, incluidos los que se volvieron a leer
+        self.new_chunk()
+
+    def new_chunk(self):
+        self.kinds = bytearray()
+        self.lines = array('I')
+        self.positions = array('I')
+        self.offsets = array('Q')  # Un fichero puede pasar de 4 GB
+        self.values = []
+
+    def extend(self, tokens: List[Token], line_base: int = 0, offset_base: int = 0):
+        """Añade tokens con sus líneas y offsets desplazados (tokens de un trozo del fichero)"""
+        codes = TOKEN_TYPE_CODES
+        start = 0
+        while start < len(tokens):
+            part = tokens[start:start + CHUNK_TOKENS - len(self.values)]
+            self.kinds.extend([codes[token.type] for token in part])
+            self.lines.extend([token.line + line_base for token in part])
+            self.positions.extend([token.position for token in part])
+            self.offsets.extend([token.offset + offset_base for token in part])
+            self.values.extend([token.value for token in part])
+            start += len(part)
+            self.length += len(part)
+            if len(self.values) == CHUNK_TOKENS:
+                self.flush()
+
+    def flush(self):
+        # Los valores internados se escriben una vez por bloque y vuelven internados
+        data = zlib.compress(marshal.dumps((bytes(self.kinds), self.lines.tobytes(), self.positions.tobytes(),
+                                            self.offsets.tobytes(), self.values)), 1)
+        self.file.write(data)
+        self.starts.append(self.starts[-1] + len(data))
+        self.new_chunk()
+
+    def finish(self) -> 'TokenStore':
+        """Termina la escritura y abre el mmap para leer"""
+        if self.values:
+            self.flush()
+        self.file.flush()
+        if self.starts[-1]:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    @property
+    def chunks(self) -> int:
+        return len(self.starts) - 1
+
+    @property
+    def spilled_bytes(self) -> int:
+        return self.starts[-1]
+
+    def load(self, number: int) -> List[Token]:
+        chunk = self.cache.get(number)
+        if chunk is not None:
+            self.cache.move_to_end(number)
+            return chunk
+        start, end = self.starts[number], self.starts[number + 1]
+        data = zlib.decompress(self.map[start:end])
+        kinds, line_data, position_data, offset_data, values = marshal.loads(data)
+        lines, positions, offsets = array('I'), array('I'), array('Q')
+        lines.frombytes(line_data)
+        positions.frombytes(position_data)
+        offsets.frombytes(offset_data)
+        chunk = list(map(Token, map(TOKEN_TYPES.__getitem__, kinds), values, lines, positions, offsets))
+        if MADV_DONTNEED is not None:
+            first = start - start % FAULT_AROUND
+            last = min(end - end % FAULT_AROUND + FAULT_AROUND, len(self.map))
+            self.map.madvise(MADV_DONTNEED, first, last - first)
+        self.loads += 1
+        self.cache[number] = chunk
+        if len(self.cache) > self.resident:
+            self.cache.popitem(last=False)
+        return chunk
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> Token:
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("índice de token fuera de rango")
+        number = index >> CHUNK_SHIFT
+        if number != self.chunk_number:
+            self.chunk = self.load(number)
+            self.chunk_number = number
+        return self.chunk[index & CHUNK_MASK]
+
+    def __iter__(self) -> Iterator[Token]:
+        for number in range(self.chunks):
+            yield from self.load(number)
+
+    def close(self):
+        self.cache.clear()
+        self.chunk = []
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self) -> 'TokenStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GlobalVariable(Variable):
+    """Variable global de un BoundedParser; bit es su bit en el estado de BoundedFlow.
+
+    GlobalTable crea otra instancia si vuelve a leer la variable de disco:
+    dos instancias con el mismo nombre son iguales, así que sirven de clave
+    en los diccionarios del análisis de flujo. used e initialized no se
+    conservan entre instancias (el análisis de flujo no los usa).
+    """
+    __slots__ = ('bit',)
+
+    def __init__(self, name: str, type: str, bit: int, initialized: bool = False):
+        super().__init__(name, type, initialized)
+        self.bit = bit
+
+    def __eq__(self, other) -> bool:
+        return type(other) is GlobalVariable and other.name == self.name
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
+
+class GlobalTable:
+    """Variables globales en una base SQLite temporal, con las últimas usadas en memoria"""
+
+    def __init__(self, directory: str = None, cached: int = CACHED_GLOBALS):
+        descriptor, self.path = tempfile.mkstemp(suffix='.sqlite', dir=directory)
+        os.close(descriptor)
+        self.db = sqlite3.connect(self.path)
+        # Base desechable: sin diario ni sincronización y con una caché de páginas pequeña
+        self.db.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            PRAGMA cache_size = -1024;
+            CREATE TABLE globals (name TEXT PRIMARY KEY, type TEXT NOT NULL, bit INTEGER NOT NULL) WITHOUT ROWID;
+        """)
+        self.cached = cached
+        self.cache: 'OrderedDict[str, GlobalVariable]' = OrderedDict()
+        self.count = 0
+
+    def get(self, name: str) -> Optional[GlobalVariable]:
+        var = self.cache.get(name)
+        if var is not None:
+            self.cache.move_to_end(name)
+            return var
+        row = self.db.execute("SELECT type, bit FROM globals WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        var = GlobalVariable(name, row[0], row[1])
+        self.remember(var)
+        return var
+
+    def add(self, name: str, type_: str, initialized: bool = False) -> GlobalVariable:
+        """Guarda una global nueva; su bit es el número de globales anteriores"""
+        var = GlobalVariable(name, type_, self.count, initialized)
+        self.db.execute("INSERT INTO globals VALUES (?, ?, ?)", (name, type_, var.bit))
+        self.count += 1
+        self.remember(var)
+        return var
+
+    def remember(self, var: GlobalVariable):
+        self.cache[var.name] = var
+        if len(self.cache) > self.cached:
+            self.cache.popitem(last=False)
+
+    def close(self):
+        self.cache.clear()
+        self.db.close()
+        os.remove(self.path)
+
+
+class BoundedFlow(StructuredFlow):
+    """StructuredFlow sin entradas por variable global: su bit va en la propia variable.
+
+    En el ámbito global la altura es el número de globales declaradas, que
+    es el bit que les da GlobalTable; los ámbitos anidados siguen usando los
+    bits por encima.
+    """
+
+    def bit(self, var: Variable) -> int:
+        if type(var) is GlobalVariable:
+            return var.bit
+        return self.bits[var]
+
+    def declare(self, var: Variable, token: Token):
+        if type(var) is not GlobalVariable:
+            super().declare(var, token)
+            return
+        self.height += 1
+        self.unassign(var, var.bit, token)
+
+
+class BoundedParser(Parser):
+    """Parser para un TokenStore con la memoria acotada.
+
+    Los ámbitos cerrados no quedan en scope_tree y las variables globales se
+    guardan en una GlobalTable (scope_tree.variables queda vacío); close()
+    borra su fichero.
+    """
+    keep_scopes = False
+
+    def __init__(self, tokens: TokenStore, flow_class=BoundedFlow, directory: str = None):
+        self.globals = GlobalTable(directory)
+        super().__init__(tokens, flow_class)
+
+    def get_variable(self, var_name: str) -> Variable:
+        declarations = self.symbols.get(var_name)
+        return declarations[-1] if declarations else self.globals.get(var_name)
+
+    def declared_here(self, name: str) -> bool:
+        if len(self.scope_stack) > 1:
+            return super().declared_here(name)
+        return self.globals.get(name) is not None
+
+    def add_variable(self, name: str, type_: str, initialized: bool) -> Variable:
+        if len(self.scope_stack) > 1:
+            return super().add_variable(name, type_, initialized)
+        return self.globals.add(name, type_, initialized)
+
+    def close(self):
+        self.globals.close()
+
+
+def tokenize_file(path: str, store: TokenStore, piece_size: int, lexer: Lexer = None) -> int:
+    """Tokeniza el fichero en trozos que acaban en salto de línea; devuelve el número de líneas.
+
+    Si un comentario o string sigue en el trozo siguiente, el trozo se
+    vuelve a tokenizar junto con el siguiente.
+    """
+    lexer = lexer or Lexer()
+    line_base = offset_base = 0
+    carry = ''
+    with open(path, encoding='utf-8') as file:
+        while True:
+            text = file.read(piece_size)
+            last = not text
+            piece = carry + text
+            if last:
+                carry = ''
+            else:
+                cut = piece.rfind('\n') + 1
+                if not cut:
+                    carry = piece  # Línea más larga que el trozo
+                    continue
+                piece, carry = piece[:cut], piece[cut:]
+            try:
+                tokens = lexer.tokenize(piece)
+            except CompilerError as error:
+                if last or error.message not in UNCLOSED:
+                    error.line += line_base
+                    if error.offset is not None:
+                        error.offset += offset_base
+                    raise error
+                carry = piece + carry
+                continue
+            store.extend(tokens, line_base, offset_base)
+            line_base += piece.count('\n')
+            offset_base += len(piece)
+            lexer.reset()
+            if last:
+                return line_base + 1 if piece and not piece.endswith('\n') else line_base
+
+
+def compile_file(path: str, max_memory: int = DEFAULT_MAX_MEMORY, directory: str = None) -> dict:
+    """Compila el fichero con la memoria residente por debajo de max_memory (aproximadamente).
+
+    diagnostics tiene el error léxico o sintáctico o todos los del análisis
+    de flujo, como compile_worker. No se usa el parser LL(1) de respaldo:
+    su tabla de terminales ocupa memoria proporcional a la entrada.
+    """
+    piece_size, window = budget(max_memory)
+    with TokenStore(window, directory) as store:
+        parser = None
+        lines = 0
+        try:
+            lines = tokenize_file(path, store, piece_size)
+            parser = BoundedParser(store.finish(), directory=directory)
+            parser.parse()
+            diagnostics = []
+        except CompilerError as e:
+            diagnostics = (parser.diagnostics if parser is not None else []) or [e]
+        finally:
+            if parser is not None:
+                parser.close()
+        return {
+            'ok': not diagnostics,
+            'tokens': len(store),
+            'lines': lines,
+            'diagnostics': diagnostics,
+            'chunks': store.chunks,
+            'loads': store.loads,
+            'spilled_bytes': store.spilled_bytes,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila programas grandes sin cargarlos en memoria")
+    parser.add_argument('file')
+    parser.add_argument('--max-memory', type=int, default=DEFAULT_MAX_MEMORY // (1024 * 1024),
+                        help="memoria residente máxima aproximada, en MB")
+    parser.add_argument('--temp-dir', help="directorio del fichero temporal de tokens")
+    args = parser.parse_args()
+
+    result = compile_file(args.file, args.max_memory * 1024 * 1024, args.temp_dir)
+    for error in result['diagnostics']:
+        print(f"{args.file}: {error}", file=sys.stderr)
+    if not result['ok']:
+        sys.exit(1)
+    print(f"Compilación exitosa: {result['tokens']:,} tokens en {result['lines']:,} líneas")
+
+
+if __name__ == "__main__":
+    main()
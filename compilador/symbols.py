@@ -0,0 +1,348 @@
+"""Índice de símbolos del proyecto en SQLite: declaraciones y referencias.
+
+SymbolCollector es un FlowGraph que, en lugar de preparar el análisis de
+flujo, anota cada declaración (declare), lectura (read) y destino de
+asignación (target) con el token del identificador; en las asignaciones
+dentro de una expresión, como el incremento de un for, el destino es el
+operando izquierdo del operador. Cada referencia apunta a
+la declaración concreta que resolvió get_variable, así que las variables que
+ocultan a otras del mismo nombre no se confunden dentro de un archivo.
+
+El lenguaje no tiene importaciones: entre archivos los símbolos se relacionan
+por nombre. SymbolIndex guarda por archivo su mtime, tamaño y hash; update
+solo vuelve a analizar los archivos cuyo contenido cambió y reemplaza sus
+filas en una sola transacción.
+
+Uso: python -m compilador.symbols índice.sqlite carpeta [nombre]
+"""
+import hashlib
+import os
+import sqlite3
+import sys
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .dataflow import FlowGraph
+from .lexer import Lexer
+from .ll1_parser import parse_tokens
+from .m_token import Token, Variable, CompilerError
+from .paser import COMPOUND_ASSIGNMENT_OPERATORS
+
+SUFFIXES = ('.py', '.txt')  # Extensiones con las que la interfaz guarda los programas
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS declarations (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    file_id INTEGER NOT NULL,
+    declaration_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS declarations_name ON declarations (name);
+CREATE INDEX IF NOT EXISTS declarations_file ON declarations (file_id, line);
+CREATE INDEX IF NOT EXISTS refs_name ON refs (name);
+CREATE INDEX IF NOT EXISTS refs_file ON refs (file_id, line);
+CREATE INDEX IF NOT EXISTS refs_declaration ON refs (declaration_id);
+"""
+
+
+class Symbol(NamedTuple):
+    path: str
+    name: str
+    type: str
+    kind: str  # declaration, read, write o update (asignación compuesta)
+    line: int
+    position: int
+
+
+class SymbolCollector(FlowGraph):
+    """Registra declaraciones y referencias; no hace el análisis de flujo"""
+
+    def __init__(self):
+        super().__init__()
+        # (nombre, tipo, línea, posición)
+        self.declarations: List[tuple] = []
+        # (declaración, nombre, tipo de referencia, línea, posición)
+        self.references: List[tuple] = []
+        self.numbers: Dict[Variable, int] = {}
+        self.last_target = None
+        # Referencia de cada valor pendiente de las expresiones, o None si no
+        # es una variable; sigue la pila de valores de IRBuilder
+        self.operands: List[Optional[int]] = []
+
+    def declare(self, var: Variable, token: Token):
+        self.numbers[var] = len(self.declarations)
+        self.declarations.append((var.name, var.type, token.line, token.position))
+
+    def target(self, var: Variable, token: Token):
+        self.last_target = token
+        self.references.append((self.numbers[var], var.name, 'write', token.line, token.position))
+
+    def read(self, var: Variable, token: Token):
+        if token is self.last_target:
+            # x += e: el destino también se lee
+            self.mark(len(self.references) - 1, 'update')
+            self.operands.append(None)
+            return
+        self.operands.append(len(self.references))
+        self.references.append((self.numbers[var], var.name, 'read', token.line, token.position))
+
+    def mark(self, index: int, kind: str):
+        self.references[index] = self.references[index][:2] + (kind,) + self.references[index][3:]
+
+    def constant(self, token: Token, type_: str):
+        self.operands.append(None)
+
+    def operation(self, operator: str, result_type: str):
+        right = self.operands.pop()
+        left = self.operands.pop()
+        if left is not None and (operator == '=' or operator in COMPOUND_ASSIGNMENT_OPERATORS):
+            # Asignación dentro de una expresión, como el incremento de un for:
+            # la variable de la izquierda es su destino
+            self.mark(left, 'write' if operator == '=' else 'update')
+            self.operands.append(right)
+        else:
+            self.operands.append(None)
+
+    def assign(self, var: Variable, operator: str = '='):
+        super().assign(var, operator)
+        self.operands.pop()
+        if operator in COMPOUND_ASSIGNMENT_OPERATORS:
+            self.operands.pop()  # Lectura del destino
+
+    def print_value(self):
+        self.operands.pop()
+
+    def discard(self):
+        self.operands.pop()
+
+    def begin_if(self):
+        self.operands.pop()
+        super().begin_if()
+
+    def begin_step(self):
+        self.operands.pop()
+        super().begin_step()
+
+    def loop_body(self):
+        self.operands.pop()
+        super().loop_body()
+
+    def analyze(self) -> List[CompilerError]:
+        return []
+
+    def symbols(self, path: str = None) -> List[Symbol]:
+        """Declaraciones y referencias en orden de aparición"""
+        found = [Symbol(path, name, type_, 'declaration', line, position)
+                 for name, type_, line, position in self.declarations]
+        found += [Symbol(path, name, self.declarations[number][1], kind, line, position)
+                  for number, name, kind, line, position in self.references]
+        found.sort(key=lambda symbol: (symbol.line, symbol.position))
+        return found
+
+    def references_to(self, number: int, path: str = None) -> List[Symbol]:
+        """La declaración number y sus referencias"""
+        name, type_, line, position = self.declarations[number]
+        return [Symbol(path, name, type_, 'declaration', line, position)] + \
+            [Symbol(path, name, type_, kind, ref_line, ref_position)
+             for ref_number, _, kind, ref_line, ref_position in self.references if ref_number == number]
+
+    def declaration_at(self, line: int, column: int) -> Optional[int]:
+        """Número de la declaración del identificador que ocupa (línea, columna)"""
+        for number, (name, _, decl_line, position) in enumerate(self.declarations):
+            if decl_line == line and position <= column < position + len(name):
+                return number
+        for number, name, _, ref_line, position in self.references:
+            if ref_line == line and position <= column < position + len(name):
+                return number
+        return None
+
+
+def collect_symbols(source: str) -> tuple:
+    """Devuelve (SymbolCollector, error); con un error quedan los símbolos anteriores a él"""
+    try:
+        tokens = Lexer().tokenize(source)
+    except CompilerError as e:
+        return SymbolCollector(), e
+    parser, error = parse_tokens(tokens, SymbolCollector)
+    return parser.flow, error
+
+
+class SymbolIndex:
+    """Índice en disco de los símbolos de un conjunto de archivos"""
+
+    def __init__(self, db_path: str):
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        # Estadísticas de la última actualización
+        self.stats = {'parsed': 0, 'unchanged': 0, 'removed': 0}
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Actualización
+
+    def update(self, paths: Iterable[str]):
+        """Analiza los archivos nuevos o modificados de paths"""
+        stats = {'parsed': 0, 'unchanged': 0, 'removed': 0}
+        known = {row[0]: row[1:] for row in self.db.execute("SELECT path, id, mtime, size, hash FROM files")}
+        with self.db:
+            next_id = self.db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM declarations").fetchone()[0]
+            declarations, references = [], []
+            for path in paths:
+                path = os.path.abspath(path)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                previous = known.get(path)
+                if previous is not None and previous[1:3] == (info.st_mtime_ns, info.st_size):
+                    stats['unchanged'] += 1
+                    continue
+                with open(path, 'rb') as file:
+                    data = file.read()
+                digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                if previous is not None and previous[3] == digest:
+                    # Solo cambió la fecha: no hace falta analizarlo
+                    self.db.execute("UPDATE files SET mtime = ?, size = ? WHERE id = ?",
+                                    (info.st_mtime_ns, info.st_size, previous[0]))
+                    stats['unchanged'] += 1
+                    continue
+                collector, error = collect_symbols(data.decode('utf-8', errors='replace'))
+                if previous is not None:
+                    file_id = previous[0]
+                    self.forget(file_id)
+                    self.db.execute("UPDATE files SET mtime = ?, size = ?, hash = ?, error = ? WHERE id = ?",
+                                    (info.st_mtime_ns, info.st_size, digest, error and str(error), file_id))
+                else:
+                    file_id = self.db.execute(
+                        "INSERT INTO files (path, mtime, size, hash, error) VALUES (?, ?, ?, ?, ?)",
+                        (path, info.st_mtime_ns, info.st_size, digest, error and str(error))).lastrowid
+                declarations.extend((next_id + number, file_id) + declaration
+                                    for number, declaration in enumerate(collector.declarations))
+                references.extend((file_id, next_id + reference[0]) + reference[1:]
+                                  for reference in collector.references)
+                next_id += len(collector.declarations)
+                stats['parsed'] += 1
+            self.db.executemany("INSERT INTO declarations VALUES (?, ?, ?, ?, ?, ?)", declarations)
+            self.db.executemany("INSERT INTO refs VALUES (?, ?, ?, ?, ?, ?)", references)
+        self.stats = stats
+
+    def update_directory(self, root: str, suffixes: tuple = SUFFIXES):
+        """Sincroniza el índice con los archivos de root: nuevos, modificados y borrados"""
+        paths = []
+        for folder, _, names in os.walk(root):
+            paths.extend(os.path.join(folder, name) for name in names if name.endswith(suffixes))
+        self.update(paths)
+        prefix = os.path.join(os.path.abspath(root), '')
+        present = {os.path.abspath(path) for path in paths}
+        missing = [(file_id,) for file_id, path in self.db.execute("SELECT id, path FROM files")
+                   if path.startswith(prefix) and path not in present]
+        with self.db:
+            for (file_id,) in missing:
+                self.forget(file_id)
+            self.db.executemany("DELETE FROM files WHERE id = ?", missing)
+        self.stats['removed'] = len(missing)
+
+    def forget(self, file_id: int):
+        self.db.execute("DELETE FROM declarations WHERE file_id = ?", (file_id,))
+        self.db.execute("DELETE FROM refs WHERE file_id = ?", (file_id,))
+
+    # Consultas
+
+    def declarations(self, name: str) -> List[Symbol]:
+        """Todas las declaraciones de name en el proyecto"""
+        return [Symbol(*row) for row in self.db.execute(
+            "SELECT f.path, d.name, d.type, 'declaration', d.line, d.position "
+            "FROM declarations d JOIN files f ON f.id = d.file_id WHERE d.name = ? "
+            "ORDER BY f.path, d.line, d.position", (name,))]
+
+    def references(self, name: str) -> List[Symbol]:
+        """Todas las lecturas y asignaciones de name en el proyecto"""
+        return [Symbol(*row) for row in self.db.execute(
+            "SELECT f.path, r.name, d.type, r.kind, r.line, r.position "
+            "FROM refs r JOIN files f ON f.id = r.file_id JOIN declarations d ON d.id = r.declaration_id "
+            "WHERE r.name = ? ORDER BY f.path, r.line, r.position", (name,))]
+
+    def declaration_at(self, path: str, line: int, column: int) -> Optional[int]:
+        """Id de la declaración del identificador en (línea, columna) de path"""
+        path = os.path.abspath(path)
+        row = self.db.execute(
+            "SELECT d.id FROM declarations d JOIN files f ON f.id = d.file_id "
+            "WHERE f.path = ? AND d.line = ? AND d.position <= ? AND ? < d.position + LENGTH(d.name) "
+            "UNION ALL "
+            "SELECT r.declaration_id FROM refs r JOIN files f ON f.id = r.file_id "
+            "WHERE f.path = ? AND r.line = ? AND r.position <= ? AND ? < r.position + LENGTH(r.name) LIMIT 1",
+            (path, line, column, column) * 2).fetchone()
+        return row[0] if row else None
+
+    def definition(self, declaration: int) -> Symbol:
+        return Symbol(*self.db.execute(
+            "SELECT f.path, d.name, d.type, 'declaration', d.line, d.position "
+            "FROM declarations d JOIN files f ON f.id = d.file_id WHERE d.id = ?", (declaration,)).fetchone())
+
+    def go_to_definition(self, path: str, line: int, column: int) -> Optional[Symbol]:
+        declaration = self.declaration_at(path, line, column)
+        return self.definition(declaration) if declaration is not None else None
+
+    def find_references(self, path: str, line: int, column: int) -> List[Symbol]:
+        """La declaración del símbolo en (línea, columna) y todas sus referencias"""
+        declaration = self.declaration_at(path, line, column)
+        if declaration is None:
+            return []
+        definition = self.definition(declaration)
+        return [definition] + [Symbol(*row) for row in self.db.execute(
+            "SELECT f.path, r.name, ?, r.kind, r.line, r.position "
+            "FROM refs r JOIN files f ON f.id = r.file_id WHERE r.declaration_id = ? "
+            "ORDER BY r.line, r.position", (definition.type, declaration))]
+
+    def errors(self) -> List[tuple]:
+        """(archivo, error) de los archivos que no se analizaron completos"""
+        return self.db.execute("SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path").fetchall()
+
+    def counts(self) -> tuple:
+        """(archivos, declaraciones, referencias) del índice"""
+        return tuple(self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                     for table in ('files', 'declarations', 'refs'))
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Uso: python -m compilador.symbols índice.sqlite carpeta [nombre]", file=sys.stderr)
+        sys.exit(2)
+    with SymbolIndex(sys.argv[1]) as index:
+        index.update_directory(sys.argv[2])
+        files, declarations, references = index.counts()
+        print(f"{files} archivos, {declarations} declaraciones, {references} referencias "
+              f"({index.stats['parsed']} analizados, {index.stats['unchanged']} sin cambios, "
+              f"{index.stats['removed']} eliminados)")
+        if len(sys.argv) > 3:
+            for symbol in index.declarations(sys.argv[3]) + index.references(sys.argv[3]):
+                print(f"{symbol.path}:{symbol.line}:{symbol.position + 1}: {symbol.kind} {symbol.type} {symbol.name}")
+
+
+if __name__ == "__main__":
+    main()
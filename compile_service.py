@@ -0,0 +1,142 @@
+"""Servicio de compilación asíncrono sobre un socket local.
+
+Protocolo: JSON delimitado por líneas. Cada petición es una línea
+{"id": ..., "source": "..."} y cada respuesta una línea
+{"id": ..., "ok": bool, "tokens": [...], "diagnostics": [...]}.
+
+Uso: python compile_service.py [--host 127.0.0.1] [--port 8765] [--unix RUTA]
+"""
+import argparse
+import asyncio
+import json
+
+from compile_worker import WorkerPool
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_TIMEOUT = 5.0
+
+
+class CompileServer:
+    """Servidor asyncio que reparte las compilaciones en un pool de procesos.
+
+    Cada proceso del pool conserva su WarmCompiler entre peticiones; el que
+    supera timeout se termina y se sustituye por uno nuevo (ver WorkerPool).
+    """
+
+    def __init__(self, workers: int = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.pool = None
+        self.server = None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str = None):
+        self.pool = WorkerPool(self.workers)
+        # El límite del StreamReader acota el tamaño de cada línea de petición
+        limit = self.max_bytes + 1024
+        if unix_path:
+            self.server = await asyncio.start_unix_server(self.handle_client, unix_path, limit=limit)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port, limit=limit)
+        return self.server
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool:
+            self.pool.close()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Línea mayor que el límite: no se puede resincronizar el flujo
+                    await self.send(writer, {'id': None, 'ok': False, 'error': 'Petición demasiado grande'})
+                    break
+                if not line:
+                    break
+                response = await self.handle_request(line)
+                await self.send(writer, response)
+        except (ConnectionError, asyncio.CancelledError):
+            # Cliente desconectado o servidor apagándose
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, line: bytes) -> dict:
+        try:
+            request = json.loads(line)
+            source = request['source']
+            request_id = request.get('id')
+        except (ValueError, KeyError, TypeError):
+            return {'id': None, 'ok': False, 'error': 'Petición inválida'}
+
+        if not isinstance(source, str):
+            return {'id': request_id, 'ok': False, 'error': 'Petición inválida'}
+        if len(source.encode('utf-8')) > self.max_bytes:
+            return {'id': request_id, 'ok': False, 'error': 'Código fuente demasiado grande'}
+
+        # La espera por el worker bloquea un hilo del executor por defecto, no el bucle
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(None, self.pool.compile, source, self.timeout)
+        except TimeoutError:
+            return {'id': request_id, 'ok': False, 'error': 'Tiempo de compilación excedido'}
+        result['id'] = request_id
+        return result
+
+    async def send(self, writer: asyncio.StreamWriter, response: dict):
+        writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+        await writer.drain()
+
+
+async def request_compile(source: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                          unix_path: str = None, request_id=None) -> dict:
+    """Cliente mínimo: envía una petición y espera su respuesta"""
+    if unix_path:
+        reader, writer = await asyncio.open_unix_connection(unix_path, limit=2 ** 26)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=2 ** 26)
+    try:
+        request = {'id': request_id, 'source': source}
+        writer.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+async def serve(args):
+    service = CompileServer(args.workers, args.max_bytes, args.timeout)
+    server = await service.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Servicio de compilación escuchando en {where}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio de compilación sobre socket local")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', help="ruta de un socket Unix en lugar de TCP")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Workers de compilación persistentes con Lexer/Parser precargados.
+
+Modo tubería: python compile_worker.py lee peticiones JSON por stdin (una por
+línea, {"id": ..., "source": "..."}) y escribe una respuesta JSON por línea en
+stdout, sin volver a pagar el arranque del intérprete por cada compilación.
+"""
+import json
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+from typing import List
+
+from compilador import CompilerError, Lexer, Parser, LL1Parser, parse_tokens
+
+
+def error_to_dict(error: CompilerError) -> dict:
+    return {
+        'code': error.error_type.code,
+        'type': error.error_type.name,
+        'message': error.message,
+        'line': error.line,
+        'position': error.position,
+        'expected': error.expected,
+        'received': error.received,
+    }
+
+
+class WarmCompiler:
+    """Mantiene un Lexer y un Parser inicializados y los reutiliza entre compilaciones"""
+
+    def __init__(self):
+        self.lexer = Lexer()
+        self.parser = Parser([])
+        # Respaldo sin recursión para programas con anidamiento muy profundo
+        self.fallback_parser = LL1Parser([])
+        self.compiles = 0
+
+    def compile(self, source: str) -> dict:
+        start = time.perf_counter()
+        diagnostics: List[dict] = []
+        try:
+            tokens = self.lexer.tokenize(source)
+        except CompilerError as e:
+            tokens = self.lexer.tokens
+            diagnostics.append(error_to_dict(e))
+        else:
+            try:
+                parser, error = parse_tokens(tokens, parsers=(self.parser, self.fallback_parser))
+                if error is not None:
+                    # El análisis de flujo reporta todos sus problemas, no solo el primero
+                    diagnostics.extend(error_to_dict(e) for e in parser.diagnostics or [error])
+            finally:
+                self.parser.reset([])
+                self.fallback_parser.reset([])
+        self.compiles += 1
+        return {
+            'ok': not diagnostics,
+            'tokens': [[t.type_name, t.value, t.line, t.position] for t in tokens],
+            'diagnostics': diagnostics,
+            'elapsed_ms': (time.perf_counter() - start) * 1000,
+        }
+
+
+# Instancia por proceso, creada en el primer uso dentro de cada worker
+_compiler = None
+
+
+def compile_source(source: str) -> dict:
+    """Compila con el WarmCompiler del proceso actual"""
+    global _compiler
+    if _compiler is None:
+        _compiler = WarmCompiler()
+    return _compiler.compile(source)
+
+
+def worker_loop(conn):
+    """Bucle de un worker del pool: recibe fuentes por la tubería hasta recibir None"""
+    compiler = WarmCompiler()
+    while True:
+        source = conn.recv()
+        if source is None:
+            break
+        conn.send(compiler.compile(source))
+    conn.close()
+
+
+class WorkerPool:
+    """Pool de procesos de larga vida, cada uno con su propio WarmCompiler.
+
+    Una compilación que supera su tiempo no se puede interrumpir dentro del
+    worker: se termina el proceso y se arranca otro en su lugar, así que el
+    tiempo excedido no sigue ocupando CPU ni un hueco del pool.
+    """
+
+    def __init__(self, workers: int = None):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.processes = {}  # Tubería -> proceso
+        self.lock = threading.Lock()
+        self.idle = queue.Queue()
+        for _ in range(self.workers):
+            self.idle.put(self.spawn())
+
+    def spawn(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=worker_loop, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        with self.lock:
+            self.processes[parent_conn] = process
+        return parent_conn
+
+    def replace(self, conn):
+        """Termina el worker de conn y devuelve la tubería de uno nuevo"""
+        with self.lock:
+            process = self.processes.pop(conn)
+        process.terminate()
+        process.join()
+        conn.close()
+        return self.spawn()
+
+    def compile(self, source: str, timeout: float = None) -> dict:
+        """Envía una compilación al primer worker libre; seguro entre hilos.
+
+        Con timeout (segundos) lanza TimeoutError si no queda un worker libre
+        a tiempo o si la compilación no responde a tiempo; este segundo plazo
+        cuenta desde que se obtiene el worker, que entonces se recicla. Si el
+        worker muere durante la compilación se reemplaza y el resultado es
+        un error, sin diagnósticos.
+        """
+        try:
+            conn = self.idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("Tiempo de compilación excedido")
+        try:
+            conn.send(source)
+            if timeout is not None and not conn.poll(timeout):
+                conn = self.replace(conn)
+                raise TimeoutError("Tiempo de compilación excedido")
+            return conn.recv()
+        except TimeoutError:  # Subclase de OSError; el worker ya está reciclado
+            raise
+        except (EOFError, OSError):
+            conn = self.replace(conn)
+            return {'ok': False, 'error': 'El proceso de compilación terminó inesperadamente'}
+        finally:
+            self.idle.put(conn)
+
+    def close(self):
+        with self.lock:
+            processes = list(self.processes.items())
+            self.processes = {}
+        for conn, process in processes:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for conn, process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    compiler = WarmCompiler()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            response = compiler.compile(request['source'])
+            response['id'] = request.get('id')
+        except (ValueError, KeyError, TypeError):
+            response = {'id': None, 'ok': False, 'error': 'Petición inválida'}
+        sys.stdout.write(json.dumps(response, ensure_ascii=False) + '\n')
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,20 @@
 import flet as ft
-from m_token import CompilerError
-from paser import Parser
-from lexer import Lexer
+from compilador import CompilerError, Lexer, parse_tokens
+from compilador.diffing import changed_range, same_token
 
 class CompilerGUI:
     def __init__(self):
         self.current_file = None
+        self.page = None
+        # Lo que muestra cada vista; cada compilación envía solo la diferencia
+        self.shown_tokens = []
+        self.shown_status = None  # (texto, color)
+
+    def run(self):
         ft.app(target=self.main)
 
     def main(self, page: ft.Page):
+        self.page = page
         # Configuración de la página
         page.title = "Compilador Olga y Brayan"
         page.theme_mode = ft.ThemeMode.DARK
@@ -24,19 +30,17 @@ class CompilerGUI:
             bgcolor=ft.colors.SURFACE_VARIANT,
         )
 
-        # Área de resultados
+        # Área de resultados; un control por token para poder cambiar solo
+        # los que difieren de la compilación anterior
+        self.tokens_header = ft.Text("=== Tokens Encontrados ===", visible=False,
+                                     style=ft.TextStyle(family="Consolas", size=12))
+        self.tokens_list = ft.ListView(spacing=0, height=220)
         self.results_tabs = ft.Tabs(
             selected_index=0,
             tabs=[
                 ft.Tab(
                     text="Tokens",
-                    content=ft.TextField(
-                        multiline=True,
-                        read_only=True,
-                        min_lines=10,
-                        max_lines=10,
-                        text_style=ft.TextStyle(family="Consolas", size=12),
-                    ),
+                    content=ft.Column([self.tokens_header, self.tokens_list], spacing=8),
                 ),
                 ft.Tab(
                     text="Estatus de Compilación",
@@ -145,44 +149,60 @@ class CompilerGUI:
                 print(f"Error al guardar el archivo: {str(ex)}")
 
     def analyze_code(self, e):
-        self.clear_results()
         code = self.code_editor.value
+        tokens = []
+        status_bar = self.status_bar.controls[0].value
 
         try:
             # Análisis léxico
             lexer = Lexer()
             tokens = lexer.tokenize(code)
-            
-            # Mostrar tokens
-            tokens_text = "=== Tokens Encontrados ===\n\n"
-            for token in tokens:
-                tokens_text += f"{token}\n"
-            
-            self.results_tabs.tabs[0].content.value = tokens_text
-            
+
             # Análisis sintáctico y semántico
-            parser = Parser(tokens)
-            parser.parse()
-            
-            self.results_tabs.tabs[1].content.value = "¡Compilación exitosa!"
-            self.results_tabs.tabs[1].content.color = ft.colors.GREEN
+            parse_tokens(tokens)
+
+            status = ("¡Compilación exitosa!", ft.colors.GREEN)
             self.status_bar.controls[0].value = "Compilación completada"
-            
+
         except CompilerError as e:
-            self.results_tabs.tabs[1].content.value = str(e)
-            self.results_tabs.tabs[1].content.color = ft.colors.RED
+            status = (str(e), ft.colors.RED)
             self.status_bar.controls[0].value = "Error de compilación"
         except Exception as e:
-            self.results_tabs.tabs[1].content.value = f"Error inesperado: {str(e)}"
+            status = (f"Error inesperado: {str(e)}", self.results_tabs.tabs[1].content.color)
             self.status_bar.controls[0].value = "Error inesperado"
 
-        self.results_tabs.update()
-        self.status_bar.update()
+        self.show_tokens(tokens)
+        self.show_status(status)
+        if self.status_bar.controls[0].value != status_bar:
+            self.status_bar.update()
+
+    def show_tokens(self, tokens):
+        """Sustituye solo los controles de los tokens que cambiaron"""
+        change = changed_range(self.shown_tokens, tokens, same_token)
+        if change is None:
+            return
+        start, old_end, new_end = change
+        self.tokens_list.controls[start:old_end] = [
+            ft.Text(str(token), style=ft.TextStyle(family="Consolas", size=12))
+            for token in tokens[start:new_end]
+        ]
+        self.shown_tokens = tokens
+        if self.tokens_header.visible != bool(tokens):
+            self.tokens_header.visible = bool(tokens)
+            self.tokens_header.update()
+        self.tokens_list.update()
+
+    def show_status(self, status):
+        if status == self.shown_status:
+            return
+        self.shown_status = status
+        content = self.results_tabs.tabs[1].content
+        content.value, content.color = status
+        content.update()
 
     def clear_results(self):
-        self.results_tabs.tabs[0].content.value = ""
-        self.results_tabs.tabs[1].content.value = ""
-        self.results_tabs.update()
+        self.show_tokens([])
+        self.show_status(("", None))
 
 if __name__ == "__main__":
-    CompilerGUI()
+    CompilerGUI().run()
@@ -0,0 +1,223 @@
+"""Revisión de corpus grandes en paralelo, con robo de trabajo y progreso reanudable.
+
+Los archivos se agrupan en lotes de unos shard_bytes (un archivo mayor que
+eso forma su propio lote) y los lotes se reparten entre los workers
+equilibrando bytes. Cada worker procesa su cola de mayor a menor; cuando se
+queda sin trabajo roba el lote más pequeño de la cola con más bytes
+pendientes, así los archivos enormes empiezan pronto y nadie espera ocioso
+al final.
+
+Cada resultado se añade al diario (NDJSON, un archivo por línea) en cuanto
+llega. Al repetir la orden con el mismo diario se saltan los archivos ya
+revisados cuyo tamaño y fecha no cambiaron; una última línea incompleta por
+una interrupción se ignora.
+
+Uso: python corpus_check.py ruta... [--journal diario.ndjson] [--workers N]
+                            [--shard-bytes B]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Dict, List
+
+from compilador.diagnostics import check_file, expand_paths
+
+SHARD_BYTES = 1024 * 1024
+MIN_SHARDS_PER_WORKER = 8  # Lotes más pequeños si el corpus es pequeño, para poder robar
+
+
+def worker_loop(conn):
+    """Pide lotes, revisa sus archivos y envía un resultado por archivo"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Las interrupciones las atiende el proceso principal
+    conn.send(('idle', None))
+    while True:
+        shard = conn.recv()
+        if shard is None:
+            break
+        for path, size, mtime in shard:
+            start = time.perf_counter()
+            try:
+                diagnostics = check_file(path)
+                error = None
+            except (OSError, RecursionError, MemoryError) as e:
+                diagnostics, error = [], str(e)
+            conn.send(('result', {
+                'file': path, 'size': size, 'mtime_ns': mtime,
+                'ms': round((time.perf_counter() - start) * 1000, 3),
+                'ok': not diagnostics and error is None,
+                'error': error, 'diagnostics': diagnostics,
+            }))
+        conn.send(('idle', None))
+    conn.close()
+
+
+def read_journal(path: str) -> Dict[str, dict]:
+    """Resultados ya guardados, por archivo; la última entrada de cada archivo manda"""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as journal:
+        for line in journal:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # Línea cortada por una interrupción
+            done[entry['file']] = entry
+    return done
+
+
+def open_journal(path: str):
+    """Abre el diario para añadir, terminando antes una última línea cortada"""
+    with open(path, 'ab+') as journal:
+        if journal.tell() > 0:
+            journal.seek(-1, os.SEEK_END)
+            if journal.read(1) != b'\n':
+                journal.write(b'\n')
+    return open(path, 'a', encoding='utf-8')
+
+
+def make_shards(files: List[tuple], shard_bytes: int) -> List[list]:
+    """Agrupa (ruta, tamaño, fecha) consecutivos hasta shard_bytes"""
+    shards, current, size = [], [], 0
+    for entry in files:
+        if current and size + entry[1] > shard_bytes:
+            shards.append(current)
+            current, size = [], 0
+        current.append(entry)
+        size += entry[1]
+    if current:
+        shards.append(current)
+    return shards
+
+
+def shard_size(shard: list) -> int:
+    return sum(entry[1] for entry in shard)
+
+
+class Scheduler:
+    """Colas de lotes por worker con robo desde la cola más cargada"""
+
+    def __init__(self, shards: List[list], workers: int):
+        self.queues = [deque() for _ in range(workers)]
+        self.pending = [0] * workers  # Bytes en cola de cada worker
+        self.stolen = 0
+        # Reparto voraz: el lote más grande al worker con menos bytes
+        for shard in sorted(shards, key=shard_size, reverse=True):
+            worker = min(range(workers), key=self.pending.__getitem__)
+            self.queues[worker].append(shard)
+            self.pending[worker] += shard_size(shard)
+
+    def next_shard(self, worker: int):
+        queue = self.queues[worker]
+        if queue:
+            shard = queue.popleft()
+        else:
+            victim = max(range(len(self.queues)), key=self.pending.__getitem__)
+            if not self.queues[victim]:
+                return None
+            shard = self.queues[victim].pop()
+            worker = victim
+            self.stolen += 1
+        self.pending[worker] -= shard_size(shard)
+        return shard
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def check_corpus(paths: List[str], journal_path: str, workers: int = None,
+                 shard_bytes: int = SHARD_BYTES, progress=None) -> dict:
+    """Revisa los archivos pendientes de paths y devuelve las estadísticas de la ejecución"""
+    workers = workers or multiprocessing.cpu_count()
+    done = read_journal(journal_path)
+    files, resumed = [], 0
+    for path in expand_paths(paths):
+        try:
+            info = os.stat(path)
+        except OSError:
+            continue
+        previous = done.get(path)
+        if previous is not None and (previous['size'], previous['mtime_ns']) == (info.st_size, info.st_mtime_ns):
+            resumed += 1
+            continue
+        files.append((path, info.st_size, info.st_mtime_ns))
+    total_bytes = sum(entry[1] for entry in files)
+    shard_bytes = max(1, min(shard_bytes, total_bytes // (workers * MIN_SHARDS_PER_WORKER)))
+    scheduler = Scheduler(make_shards(files, shard_bytes), workers)
+
+    stats = {'files': 0, 'failed': 0, 'resumed': resumed, 'latencies': [], 'stolen': 0, 'interrupted': False}
+    start = time.perf_counter()
+    processes, connections = [], {}
+    try:
+        with open_journal(journal_path) as journal:
+            for worker in range(min(workers, len(files))):
+                parent_conn, child_conn = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=worker_loop, args=(child_conn,), daemon=True)
+                process.start()
+                child_conn.close()
+                processes.append(process)
+                connections[parent_conn] = worker
+            while connections:
+                for conn in wait(list(connections)):
+                    try:
+                        kind, entry = conn.recv()
+                    except EOFError:
+                        del connections[conn]
+                        continue
+                    if kind == 'result':
+                        journal.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                        journal.flush()
+                        stats['files'] += 1
+                        stats['failed'] += not entry['ok']
+                        stats['latencies'].append(entry['ms'])
+                        if progress is not None:
+                            progress(entry)
+                        continue
+                    shard = scheduler.next_shard(connections[conn])
+                    conn.send(shard)
+                    if shard is None:
+                        del connections[conn]
+    except KeyboardInterrupt:
+        stats['interrupted'] = True
+    finally:
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+    stats['seconds'] = time.perf_counter() - start
+    stats['stolen'] = scheduler.stolen
+    stats['workers'] = len(processes)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Revisa un corpus de programas en paralelo")
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--journal', default='corpus_check.ndjson',
+                        help="diario de resultados; también permite reanudar")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--shard-bytes', type=int, default=SHARD_BYTES)
+    args = parser.parse_args()
+
+    stats = check_corpus(args.paths, args.journal, args.workers, args.shard_bytes)
+    latencies = stats['latencies']
+    rate = stats['files'] / stats['seconds'] if stats['seconds'] else 0.0
+    print(f"{stats['files']} archivos revisados ({stats['failed']} con errores), {stats['resumed']} ya en el diario; "
+          f"{rate:,.0f} archivos/s con {stats['workers']} workers, {stats['stolen']} lotes robados; "
+          f"latencia p50 {percentile(latencies, 0.5):.2f} ms, p99 {percentile(latencies, 0.99):.2f} ms",
+          file=sys.stderr)
+    if stats['interrupted']:
+        print("Interrumpido: repite la orden para continuar", file=sys.stderr)
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,16 @@
+import os
+import threading
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
-from m_token import CompilerError
-from paser import Parser
-from lexer import Lexer
+from compilador import CompilerError, TokenType, Lexer, SourceMap, parse_tokens
+from compilador.diffing import changed_range, same_token
+
+CONSOLE_LINES = 5000  # Líneas que conserva la consola
+POLL_MS = 50  # Intervalo de volcado de la salida del programa a la consola
+HEAT_LEVELS = 5  # Tonos del mapa de calor del perfil en los números de línea
+INDEX_NAME = '.compilador_index.sqlite'  # Índice de símbolos dentro de la carpeta indexada
+TOKENS_FIRST_LINE = 3  # Línea de la pestaña Tokens con el primer token, tras la cabecera
+TREE_PAGE = 500  # Hijos que carga cada apertura de un nodo del árbol de ámbitos
 
 class TokenTree:
     def __init__(self, parent):
@@ -19,6 +27,26 @@ class TokenTree:
         self.tree.heading('value', text='Value')
         self.tree.heading('line', text='Line')
 
+class LazyTab:
+    """Pestaña del notebook cuyo contenido se construye la primera vez que se muestra"""
+    def __init__(self, notebook, text, build, render):
+        self.frame = ttk.Frame(notebook)
+        notebook.add(self.frame, text=text)
+        self.build = build
+        self.render = render
+        self.built = False
+
+    def ensure_built(self):
+        if not self.built:
+            self.build(self.frame)
+            self.built = True
+            self.render()
+
+    def refresh(self):
+        # Las pestañas aún no construidas se dibujarán al mostrarse
+        if self.built:
+            self.render()
+
 class CompilerGUI:
     def __init__(self, root):
         self.root = root
@@ -27,6 +55,9 @@ class CompilerGUI:
         self.setup_gui()
         self.setup_bindings()
         self.current_file = None
+        self.execution = None  # (hilo, OutputBuffer, errores, Monitor) del programa en ejecución
+        self.last_profile = None
+        self.symbol_index = None  # SymbolIndex de la carpeta indexada
 
     def setup_styles(self):
         # Configurar estilos personalizados para tema Dracula
@@ -108,6 +139,10 @@ class CompilerGUI:
         
         ttk.Button(toolbar, text="Compilar", style='Custom.TButton',
                   command=self.analyze_code).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Ejecutar", style='Custom.TButton',
+                  command=self.run_code).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="Detener", style='Custom.TButton',
+                  command=self.stop_execution).pack(side=tk.LEFT, padx=2)
 
 
     def setup_editor(self):
@@ -137,19 +172,64 @@ class CompilerGUI:
         self.notebook = ttk.Notebook(self.results_paned)
         self.results_paned.add(self.notebook, weight=1)
 
-        # Pestañas de resultados
-        self.tokens_text = scrolledtext.ScrolledText(self.notebook, height=10,
+        # Resultados de la última compilación, compartidos por las pestañas
+        self.last_tokens = []
+        self.last_scopes = None  # Árbol de ámbitos del último análisis
+        self.last_status = None  # (mensaje, tag)
+
+        # Lo que muestra cada pestaña: al refrescar solo se cambia la diferencia
+        self.shown_tokens = []
+        self.shown_status = None
+        self.tree_shown = ([], None)  # (tokens, estado) del árbol de ámbitos
+
+        # Pestañas de resultados; se construyen la primera vez que se muestran
+        self.tokens_text = None
+        self.tokens_tree = None
+        self.tree_pending = {}  # Nodo -> (ámbito, primer hijo sin cargar, nodo padre)
+        self.tree_locations = {}  # Nodo -> (línea, posición) en el editor
+        self.errors_text = None
+        self.references_tree = None
+        self.last_references = []  # Symbol de la última búsqueda de referencias
+        self.tabs = [
+            LazyTab(self.notebook, 'Tokens', self.build_tokens_tab, self.render_tokens_tab),
+            LazyTab(self.notebook, 'Tokens Tree', self.build_tree_tab, self.render_tree_tab),
+            LazyTab(self.notebook, 'Estatus de Compilacion', self.build_status_tab, self.render_status_tab),
+            LazyTab(self.notebook, 'Referencias', self.build_references_tab, self.render_references_tab),
+        ]
+        self.references_tab = self.tabs[3]
+        self.status_tab = self.tabs[2]
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.tabs[0].ensure_built()
+
+        self.console = scrolledtext.ScrolledText(self.notebook, height=10,
+                                               font=('Consolas', 15, 'bold'), 
+                                               background=self.dracula['background'], 
+                                               foreground=self.dracula['green'])
+        self.console.tag_configure("success", foreground=self.dracula['green'])
+        self.console.tag_configure("output", foreground=self.dracula['foreground'])
+        self.console.tag_configure("error", foreground=self.dracula['red'])
+        self.notebook.add(self.console, text='Consola')
+
+    def on_tab_changed(self, event=None):
+        selected = self.notebook.select()
+        for tab in self.tabs:
+            if str(tab.frame) == selected:
+                tab.ensure_built()
+
+    def build_tokens_tab(self, parent):
+        self.tokens_text = scrolledtext.ScrolledText(parent, height=10,
                                                    font=('Consolas', 12), 
                                                    background=self.dracula['background'], 
                                                    foreground=self.dracula['foreground'])
-        
-        self.errors_text = scrolledtext.ScrolledText(self.notebook, height=10,
-                                                   font=('Consolas', 15, 'bold'), 
-                                                   background=self.dracula['background'], 
-                                                   foreground=self.dracula['red'])
-        
-        self.tokens_tree = ttk.Treeview(self.notebook, height=10)
-        self.tokens_tree.heading('#0', text='Tokens', anchor='w')
+        self.tokens_text.pack(fill=tk.BOTH, expand=True)
+
+    def build_tree_tab(self, parent):
+        # Árbol de ámbitos del parser; cada nodo carga sus hijos al abrirse
+        self.tokens_tree = ttk.Treeview(parent, height=10, columns=('detail',))
+        self.tokens_tree.heading('#0', text='Ámbitos', anchor='w')
+        self.tokens_tree.heading('detail', text='Detalle', anchor='w')
+        self.tokens_tree.bind('<<TreeviewOpen>>', self.expand_tree_item)
+        self.tokens_tree.bind('<Double-1>', self.open_tree_item)
         style = ttk.Style()
         style.configure('Treeview', 
                     background=self.dracula['background'],
@@ -158,16 +238,131 @@ class CompilerGUI:
         style.configure('Treeview.Heading',
                     background=self.dracula['current_line'],
                     foreground=self.dracula['foreground'])
-    
-        self.console = scrolledtext.ScrolledText(self.notebook, height=10,
-                                               font=('Consolas', 15, 'bold'), 
-                                               background=self.dracula['background'], 
-                                               foreground=self.dracula['green'])
+        self.tokens_tree.pack(fill=tk.BOTH, expand=True)
+
+    def build_status_tab(self, parent):
+        self.errors_text = scrolledtext.ScrolledText(parent, height=10,
+                                                   font=('Consolas', 15, 'bold'), 
+                                                   background=self.dracula['background'], 
+                                                   foreground=self.dracula['red'])
+        self.errors_text.tag_configure("success", foreground=self.dracula['green'])
+        self.errors_text.pack(fill=tk.BOTH, expand=True)
+
+    def build_references_tab(self, parent):
+        self.references_tree = ttk.Treeview(parent, height=10, columns=('line', 'column', 'kind'))
+        self.references_tree.heading('#0', text='Archivo', anchor='w')
+        self.references_tree.heading('line', text='Línea')
+        self.references_tree.heading('column', text='Col')
+        self.references_tree.heading('kind', text='Uso')
+        self.references_tree.column('line', width=60)
+        self.references_tree.column('column', width=50)
+        self.references_tree.column('kind', width=100)
+        self.references_tree.bind('<Double-1>', self.open_reference)
+        self.references_tree.pack(fill=tk.BOTH, expand=True)
+
+    def render_tokens_tab(self):
+        # Solo se reescriben las líneas de los tokens que cambiaron
+        old, new = self.shown_tokens, self.last_tokens
+        change = changed_range(old, new, same_token)
+        if change is None:
+            return
+        self.shown_tokens = new
+        if not old or not new:
+            self.tokens_text.delete("1.0", tk.END)
+            if new:
+                lines = "\n".join(str(token) for token in new)
+                self.tokens_text.insert(tk.END, f"=== Tokens Encontrados ===\n\n{lines}\n")
+            return
+        start, old_end, new_end = change
+        first = start + TOKENS_FIRST_LINE
+        self.tokens_text.delete(f"{first}.0", f"{old_end + TOKENS_FIRST_LINE}.0")
+        if new_end > start:
+            self.tokens_text.insert(f"{first}.0", "".join(f"{token}\n" for token in new[start:new_end]))
+
+    def render_tree_tab(self):
+        tokens, status = self.tree_shown
+        if status == self.last_status and changed_range(tokens, self.last_tokens, same_token) is None:
+            return  # Mismos tokens, mismos ámbitos: se conservan los nodos abiertos
+        self.tree_shown = (self.last_tokens, self.last_status)
+        self.tokens_tree.delete(*self.tokens_tree.get_children())
+        self.tree_pending = {}
+        self.tree_locations = {}
+        if self.last_scopes is None:
+            return
+        root = self.insert_scope('', self.last_scopes)
+        self.tokens_tree.item(root, open=True)
+        self.expand_tree_item(item=root)
+
+    def insert_scope(self, parent, scope) -> str:
+        """Nodo de un ámbito; sus hijos se cargan al abrirlo"""
+        tokens = self.last_tokens
+        first, last = scope.lines(tokens)
+        keyword = scope.keyword(tokens)
+        opener = f" {tokens[scope.start - 1].value}" if scope.parent is not None else ""
+        lines = f"líneas {first}-{last}" if last is not None else f"desde la línea {first}"
+        item = self.tokens_tree.insert(parent, 'end', text=keyword + opener,
+                                       values=(f"{lines}, {len(scope.variables)} variable"
+                                               f"{'' if len(scope.variables) == 1 else 's'}",))
+        if scope.parent is not None:
+            opening = tokens[scope.start - 1]
+            self.tree_locations[item] = (opening.line, opening.position)
+        if scope.declarations or scope.children:
+            self.tokens_tree.insert(item, 'end', text="…")
+            self.tree_pending[item] = (scope, 0, item)
+        return item
+
+    def expand_tree_item(self, event=None, item=None):
+        # Se carga una página de hijos la primera vez que se abre un nodo
+        item = item or self.tokens_tree.focus()
+        pending = self.tree_pending.pop(item, None)
+        if pending is None:
+            return
+        scope, first, parent = pending
+        if parent == item:
+            self.tokens_tree.delete(*self.tokens_tree.get_children(item))
+        else:
+            self.tokens_tree.delete(item)  # Nodo "… más" de la página anterior
+        declarations = scope.declarations
+        total = len(declarations) + len(scope.children)
+        last = min(first + TREE_PAGE, total)
+        for index in range(first, last):
+            if index < len(declarations):
+                token = declarations[index]
+                var = scope.variables[token.value]
+                child = self.tokens_tree.insert(parent, 'end', text=f"{var.type} {var.name}",
+                                                values=(f"línea {token.line}, columna {token.position + 1}",))
+                self.tree_locations[child] = (token.line, token.position)
+            else:
+                self.insert_scope(parent, scope.children[index - len(declarations)])
+        if last < total:
+            more = self.tokens_tree.insert(parent, 'end', text=f"… {total - last} más")
+            self.tokens_tree.insert(more, 'end', text="…")
+            self.tree_pending[more] = (scope, last, parent)
+
+    def open_tree_item(self, event=None):
+        location = self.tree_locations.get(self.tokens_tree.focus())
+        if location is not None:
+            self.show_location(*location)
+
+    def render_status_tab(self):
+        if self.last_status == self.shown_status:
+            return
+        self.shown_status = self.last_status
+        self.errors_text.delete("1.0", tk.END)
+        if self.last_status:
+            message, tag = self.last_status
+            self.errors_text.insert(tk.END, message, tag)
+
+    def render_references_tab(self):
+        self.references_tree.delete(*self.references_tree.get_children())
+        for number, symbol in enumerate(self.last_references):
+            name = os.path.basename(symbol.path) if symbol.path else "(editor)"
+            self.references_tree.insert('', 'end', iid=str(number), text=name,
+                                        values=(symbol.line, symbol.position + 1, symbol.kind))
 
-        self.notebook.add(self.tokens_text, text='Tokens')
-        self.notebook.add(self.tokens_tree, text='Tokens Tree')
-        #self.notebook.add(self.console, text='Consola')
-        self.notebook.add(self.errors_text, text='Estatus de Compilacion')
+    def refresh_results(self):
+        for tab in self.tabs:
+            tab.refresh()
 
     def setup_menu(self):
         menubar = tk.Menu(self.root)
@@ -187,8 +382,21 @@ class CompilerGUI:
         compiler_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Compilador", menu=compiler_menu)
         compiler_menu.add_command(label="Compilar", command=self.analyze_code, accelerator="F5")
+        compiler_menu.add_command(label="Ejecutar", command=self.run_code, accelerator="F6")
+        compiler_menu.add_command(label="Ejecutar con perfil", command=lambda: self.run_code(profile=True))
+        compiler_menu.add_command(label="Detener", command=self.stop_execution)
+        compiler_menu.add_command(label="Exportar perfil...", command=self.export_profile)
+        compiler_menu.add_command(label="Formatear", command=self.format_code, accelerator="Ctrl+Shift+F")
         compiler_menu.add_command(label="Limpiar resultados", command=self.clear_results)
 
+        # Menú Navegar
+        navigate_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Navegar", menu=navigate_menu)
+        navigate_menu.add_command(label="Ir a definición", command=self.go_to_definition, accelerator="F12")
+        navigate_menu.add_command(label="Buscar referencias", command=self.find_references,
+                                  accelerator="Shift+F12")
+        navigate_menu.add_command(label="Indexar carpeta...", command=self.index_folder)
+
     def setup_status_bar(self):
         self.status_bar = ttk.Frame(self.root)
         self.status_bar.pack(fill=tk.X, side=tk.BOTTOM)
@@ -206,6 +414,7 @@ class CompilerGUI:
         self.code_text.tag_configure("number", foreground=self.dracula['purple'])
         self.code_text.tag_configure("error", background=self.dracula['red'], 
                                    foreground=self.dracula['foreground'])
+        self.code_text.tag_configure("reference", background=self.dracula['current_line'])
 
 
     def setup_bindings(self):
@@ -215,52 +424,40 @@ class CompilerGUI:
         self.root.bind('<Control-o>', lambda e: self.open_file())
         self.root.bind('<Control-s>', lambda e: self.save_file())
         self.root.bind('<F5>', lambda e: self.analyze_code())
+        self.root.bind('<F6>', lambda e: self.run_code())
+        self.root.bind('<Control-F>', lambda e: self.format_code())  # F mayúscula: con Shift
+        self.root.bind('<F12>', lambda e: self.go_to_definition())
+        self.root.bind('<Shift-F12>', lambda e: self.find_references())
 
     def highlight_syntax(self, event=None):
         # Eliminar resaltado existente
         for tag in ["keyword", "string", "comment", "number"]:
             self.code_text.tag_remove(tag, "1.0", "end")
-        
+
         content = self.code_text.get("1.0", "end-1c")
-        
-        # Keywords
-        keywords = ['if', 'else', 'while', 'for', 'int', 'float', 'string', 
-                   'boolean', 'print', 'input', 'return', 'void', 'class',
-                   'public', 'private', 'true', 'false']
-        
-        for keyword in keywords:
-            start = "1.0"
-            while True:
-                start = self.code_text.search(r'\y' + keyword + r'\y', start, "end", regexp=True)
-                if not start:
-                    break
-                end = f"{start}+{len(keyword)}c"
-                self.code_text.tag_add("keyword", start, end)
-                start = end
-
-        # Strings
-        start = "1.0"
-        while True:
-            start = self.code_text.search(r'["\'](.*?)["\']', start, "end", regexp=True)
-            if not start:
-                break
-            end = self.code_text.search(r'["\']', self.code_text.index(f"{start}+1c"), "end")
-            if not end:
-                break
-            end = self.code_text.index(f"{end}+1c")
-            self.code_text.tag_add("string", start, end)
-            start = end
-
-        # Comments
-        start = "1.0"
-        while True:
-            start = self.code_text.search("//", start, "end")
-            if not start:
-                break
-            line = start.split('.')[0]
-            end = f"{line}.end"
-            self.code_text.tag_add("comment", start, end)
-            start = self.code_text.index(f"{line}.end+1c")
+
+        # Los spans salen del propio lexer; si el código está incompleto se
+        # resalta lo que se alcanzó a reconocer antes del error
+        lexer = Lexer()
+        try:
+            lexer.tokenize(content)
+        except CompilerError:
+            pass
+        source_map = lexer.source_map
+
+        tags = {
+            TokenType.KEYWORD: "keyword",
+            TokenType.BOOLEAN: "keyword",
+            TokenType.STRING: "string",
+            TokenType.NUMBER: "number",
+        }
+        for token in lexer.tokens:
+            tag = tags.get(token.type)
+            if tag:
+                self.code_text.tag_add(tag, *source_map.tk_range(token.offset, token.end))
+
+        for start, end in lexer.comments:
+            self.code_text.tag_add("comment", *source_map.tk_range(start, end))
 
     def update_line_numbers(self, event=None):
         self.line_numbers.config(state='normal')
@@ -289,17 +486,22 @@ class CompilerGUI:
             filetypes=[("Archivos Python", "*.py"), ("Todos los archivos", "*.*")]
         )
         if file_path:
-            try:
-                with open(file_path, 'r') as file:
-                    content = file.read()
-                    self.code_text.delete(1.0, tk.END)
-                    self.code_text.insert(1.0, content)
-                    self.current_file = file_path
-                    self.status_label.config(text=f"Archivo abierto: {file_path}")
-                    self.update_line_numbers()
-                    self.highlight_syntax()
-            except Exception as e:
-                messagebox.showerror("Error", f"Error al abrir el archivo: {str(e)}")
+            self.load_file(file_path)
+
+    def load_file(self, file_path) -> bool:
+        try:
+            with open(file_path, 'r') as file:
+                content = file.read()
+                self.code_text.delete(1.0, tk.END)
+                self.code_text.insert(1.0, content)
+                self.current_file = file_path
+                self.status_label.config(text=f"Archivo abierto: {file_path}")
+                self.update_line_numbers()
+                self.highlight_syntax()
+                return True
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al abrir el archivo: {str(e)}")
+            return False
 
     def save_file(self):
         if not self.current_file:
@@ -316,96 +518,271 @@ class CompilerGUI:
             with open(self.current_file, 'w') as file:
                 file.write(content)
             self.status_label.config(text=f"Archivo guardado: {self.current_file}")
+            if self.symbol_index is not None:
+                self.symbol_index.update([self.current_file])
         except Exception as e:
             messagebox.showerror("Error", f"Error al guardar el archivo: {str(e)}")
 
-    def analyze_code(self):
-        self.clear_results()
+    def analyze_code(self) -> bool:
+        self.stop_execution()
+        self.reset_results()  # Las pestañas se actualizan al final, solo con lo que cambió
         code = self.code_text.get("1.0", tk.END)
-        
+        lexer = Lexer()
+
         try:
             # Análisis léxico
-            lexer = Lexer()
             tokens = lexer.tokenize(code)
-            
-            # Mostrar tokens
-            self.tokens_text.insert(tk.END, "=== Tokens Encontrados ===\n\n")
-            for token in tokens:
-                self.tokens_text.insert(tk.END, f"{token}\n")
-            
-            # Limpiar árbol
-            self.tokens_tree.delete(*self.tokens_tree.get_children())
-            
-            # Variables para tracking del scope
-            scope_stack = ['global']
-            current_parent = ''
-            scope_level = 0
-            
-            for token in tokens:
-                token_str = str(token)
-                token_parts = token_str.split()
-                token_type = token_parts[0]
-                token_value = ' '.join(token_parts[1:]) if len(token_parts) > 1 else ''
-                
-                # Manejar cambios de scope
-                if token_type == 'DELIMITER':
-                    if token_value == '{':
-                        scope_level += 1
-                        parent_id = self.tokens_tree.insert(current_parent, 'end', 
-                                                        text=f"Scope Level {scope_level}",
-                                                        open=True)
-                        current_parent = parent_id
-                        scope_stack.append(parent_id)
-                    elif token_value == '}':
-                        scope_level -= 1
-                        scope_stack.pop()
-                        current_parent = scope_stack[-1] if scope_stack else ''
-                        
-                # Insertar token en el árbol
-                item_id = self.tokens_tree.insert(current_parent, 'end',
-                                                text=token_type,
-                                                values=(token_value, ''),
-                                                tags=('token',))
-                
-                # Si es inicio de función o clase, crear nuevo scope
-                if token_type == 'KEYWORD' and token_value in ('class', 'def'):
-                    current_parent = item_id
-                    scope_stack.append(item_id)
-        
-        
+            self.last_tokens = tokens
+
             # Análisis sintáctico y semántico
-            parser = Parser(tokens)
-            parser.parse()
+            parser, error = parse_tokens(tokens)
+            # Con errores el árbol muestra lo analizado hasta detenerse
+            self.last_scopes = parser.scope_tree
+            if error is not None:
+                raise error
             
+            self.last_status = ("¡Compilación exitosa!\n", "success")
             self.console.insert(tk.END, "¡Compilación exitosa!\n", "success")
-            self.errors_text.insert(tk.END, "¡Compilación exitosa!\n", "success")
-            self.console.tag_configure("success", foreground=self.dracula['green'])
-            self.errors_text.tag_configure("success", foreground=self.dracula['green'])
             self.status_label.config(text="Compilación completada")
             self.notebook.select(1)
+            self.refresh_results()
+            return True
 
-            
-            
         except CompilerError as e:
-            self.errors_text.insert(tk.END, str(e))
-            self.highlight_error(e.line, e.position)
-            self.status_label.config(text="Error de compilación")
+            self.last_status = (str(e), None)
+            self.highlight_error(e, lexer.source_map)
+            self.status_label.config(text=f"Error de compilación ({e.error_type.code})")
             self.console.insert(tk.END, "Compilación fallida\n")
-            self.notebook.select(1)  # Mostrar pestaña de errores
+            self.notebook.select(self.status_tab.frame)  # Mostrar pestaña de errores
         except Exception as e:
-            self.errors_text.insert(tk.END, f"Error inesperado: {str(e)}")
+            self.last_status = (f"Error inesperado: {str(e)}", None)
             self.console.insert(tk.END, "Compilación fallida\n")
             self.status_label.config(text="Error inesperado")
 
-    def highlight_error(self, line, position):
+        self.refresh_results()
+        return False
+
+    def format_code(self):
+        from compilador.formatter import format_source
+        code = self.code_text.get("1.0", "end-1c")
+        try:
+            formatted = format_source(code)
+        except CompilerError as e:
+            self.highlight_error(e, SourceMap(code))
+            self.status_label.config(text=f"No se puede formatear: {e.message}")
+            return
+        if formatted != code:
+            line = self.code_text.index(tk.INSERT).split('.')[0]
+            self.code_text.delete("1.0", tk.END)
+            self.code_text.insert("1.0", formatted)
+            self.code_text.mark_set(tk.INSERT, f"{line}.0")
+            self.update_line_numbers()
+            self.highlight_syntax()
+        self.status_label.config(text="Código formateado")
+
+    def run_code(self, profile=False):
+        if self.execution is not None:
+            # Una sola ejecución (y una sola cadena de poll_output) a la vez
+            self.status_label.config(text="Ya hay un programa en ejecución: detenlo antes de ejecutar otro")
+            return
+        if not self.analyze_code():
+            return
+        # Ejecutar es opcional: el backend se carga al primer uso, no al abrir el editor
+        from compilador.backend import compile_program
+        from compilador.output import OutputBuffer
+        from compilador.runner import Limits, LineProfiler, Monitor
+        program = compile_program(self.code_text.get("1.0", tk.END))
+        output = OutputBuffer()  # Sin consumidor: poll_output lo vacía desde el hilo de la interfaz
+        errors = []
+        monitor = Monitor(Limits(), LineProfiler() if profile else None)
+        thread = threading.Thread(target=self.execute, args=(program, output, errors, monitor), daemon=True)
+        self.execution = (thread, output, errors, monitor)
+        self.notebook.select(self.console)
+        self.status_label.config(text="Ejecutando...")
+        thread.start()
+        self.root.after(POLL_MS, self.poll_output)
+
+    def execute(self, program, output, errors, monitor):
+        # Hilo de ejecución: no toca widgets, solo escribe en el buffer
+        from compilador.interpreter import ExecutionError
+        from compilador.runner import Cancelled, LimitExceeded, run_limited
+        try:
+            run_limited(program, output.write, monitor=monitor)
+        except Cancelled:
+            errors.append("Ejecución detenida")
+        except LimitExceeded as e:
+            errors.append(str(e))
+        except ExecutionError as e:
+            errors.append(f"Error de ejecución: {e}")
+
+    def poll_output(self):
+        if self.execution is None:
+            return
+        thread, output, errors, monitor = self.execution
+        profiler = monitor.profiler
+        running = thread.is_alive()
+        batch = output.drain()
+        if batch:
+            self.console.insert(tk.END, "\n".join(batch) + "\n", "output")
+            self.trim_console()
+            self.console.see(tk.END)
+        if running:
+            self.root.after(POLL_MS, self.poll_output)
+            return
+        self.execution = None
+        if profiler is not None:
+            self.last_profile = profiler
+            self.show_heat_map(profiler)
+        if errors:
+            self.console.insert(tk.END, errors[0] + "\n", "error")
+            self.status_label.config(text=errors[0])
+        else:
+            self.status_label.config(text=f"Ejecución terminada: {output.written} líneas")
+
+    def show_heat_map(self, profiler):
+        # Colorea los números de línea según las veces que se ejecutó cada una
+        self.update_line_numbers()
+        colors = [self.dracula[name] for name in ('comment', 'purple', 'pink', 'orange', 'red')]
+        for level, color in enumerate(colors):
+            self.line_numbers.tag_configure(f"heat{level}", background=color,
+                                            foreground=self.dracula['background'])
+        if not profiler.hits:
+            return
+        most = max(profiler.hits.values())
+        for line, hits in profiler.hits.items():
+            level = min(HEAT_LEVELS - 1, hits * HEAT_LEVELS // (most + 1))
+            self.line_numbers.tag_add(f"heat{level}", f"{line}.0", f"{line}.end")
+
+    def export_profile(self):
+        if self.last_profile is None:
+            messagebox.showinfo("Perfil", "Ejecuta el programa con perfil primero")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".json",
+                                                 filetypes=[("JSON", "*.json")])
+        if file_path:
+            try:
+                with open(file_path, 'w', encoding='utf-8') as file:
+                    file.write(self.last_profile.to_json())
+                self.status_label.config(text=f"Perfil guardado: {file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Error al guardar el perfil: {str(e)}")
+
+    def trim_console(self):
+        lines = int(self.console.index('end-1c').split('.')[0])
+        if lines > CONSOLE_LINES:
+            self.console.delete("1.0", f"{lines - CONSOLE_LINES}.0")
+
+    def stop_execution(self):
+        # Monitor.cancel corta también los bucles que no imprimen; poll_output
+        # recoge el final del hilo
+        if self.execution is not None:
+            self.execution[3].cancel()
+
+    def cursor_symbol(self):
+        # Los símbolos salen del buffer, no del archivo guardado
+        from compilador.symbols import collect_symbols
+        line, column = map(int, self.code_text.index(tk.INSERT).split('.'))
+        collector, _ = collect_symbols(self.code_text.get("1.0", tk.END))
+        number = collector.declaration_at(line, column)
+        if number is None:
+            self.status_label.config(text="No hay una variable en el cursor")
+        return collector, number
+
+    def show_location(self, line, position):
+        self.code_text.mark_set(tk.INSERT, f"{line}.{position}")
+        self.code_text.see(f"{line}.{position}")
+        self.code_text.focus_set()
+        self.update_line_numbers()
+
+    def go_to_definition(self):
+        collector, number = self.cursor_symbol()
+        if number is not None:
+            name, type_, line, position = collector.declarations[number]
+            self.show_location(line, position)
+            self.status_label.config(text=f"{type_} {name}: línea {line}")
+
+    def find_references(self):
+        self.code_text.tag_remove("reference", "1.0", tk.END)
+        collector, number = self.cursor_symbol()
+        if number is None:
+            return
+        references = collector.references_to(number, self.current_file)
+        for symbol in references:
+            self.code_text.tag_add("reference", f"{symbol.line}.{symbol.position}",
+                                   f"{symbol.line}.{symbol.position + len(symbol.name)}")
+        name = references[0].name
+        if self.symbol_index is not None:
+            # Entre archivos los símbolos se relacionan por nombre
+            current = os.path.abspath(self.current_file) if self.current_file else None
+            references += [symbol for symbol in self.symbol_index.declarations(name) +
+                           self.symbol_index.references(name) if symbol.path != current]
+        self.last_references = references
+        self.references_tab.refresh()
+        self.notebook.select(self.references_tab.frame)
+        self.status_label.config(text=f"{len(references)} referencias a {name}")
+
+    def open_reference(self, event=None):
+        selection = self.references_tree.selection()
+        if not selection:
+            return
+        symbol = self.last_references[int(selection[0])]
+        current = os.path.abspath(self.current_file) if self.current_file else None
+        if symbol.path is not None and symbol.path != current and not self.load_file(symbol.path):
+            return
+        self.show_location(symbol.line, symbol.position)
+
+    def index_folder(self):
+        folder = filedialog.askdirectory()
+        if not folder:
+            return
+        index_path = os.path.join(folder, INDEX_NAME)
+        result = []
+        thread = threading.Thread(target=self.build_index, args=(folder, index_path, result), daemon=True)
+        self.status_label.config(text=f"Indexando {folder}...")
+        thread.start()
+        self.root.after(POLL_MS, self.poll_index, thread, index_path, result)
+
+    def build_index(self, folder, index_path, result):
+        # Hilo del índice: usa su propia conexión a SQLite
+        from compilador.symbols import SymbolIndex
+        try:
+            with SymbolIndex(index_path) as index:
+                index.update_directory(folder)
+                result.append(index.counts())
+        except Exception as e:
+            result.append(e)
+
+    def poll_index(self, thread, index_path, result):
+        if thread.is_alive():
+            self.root.after(POLL_MS, self.poll_index, thread, index_path, result)
+            return
+        if not result or isinstance(result[0], Exception):
+            messagebox.showerror("Error", f"Error al indexar la carpeta: {result[0] if result else ''}")
+            return
+        from compilador.symbols import SymbolIndex
+        if self.symbol_index is not None:
+            self.symbol_index.close()
+        self.symbol_index = SymbolIndex(index_path)
+        files, declarations, references = result[0]
+        self.status_label.config(text=f"Índice: {files} archivos, {declarations} declaraciones, "
+                                      f"{references} referencias")
+
+    def highlight_error(self, error, source_map):
         self.code_text.tag_remove("error", "1.0", tk.END)
-        start_index = f"{line}.{position}"
-        end_index = f"{line}.{position + 1}"
+        start_index, end_index = source_map.tk_range(*error.span(source_map))
         self.code_text.tag_add("error", start_index, end_index)
         self.code_text.see(start_index)
 
     def clear_results(self):
-        self.tokens_text.delete("1.0", tk.END)
-        self.errors_text.delete("1.0", tk.END)
+        self.reset_results()
+        self.refresh_results()
+
+    def reset_results(self):
+        """Olvida la última compilación sin tocar las pestañas; el próximo refresco las actualiza"""
+        self.last_tokens = []
+        self.last_scopes = None
+        self.last_status = None
+        self.last_references = []
         self.console.delete("1.0", tk.END)
         self.code_text.tag_remove("error", "1.0", tk.END)
+        self.code_text.tag_remove("reference", "1.0", tk.END)
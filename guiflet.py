@@ -1,27 +1,91 @@
+"""Compilador en el navegador: python guiflet.py sirve la página en el puerto 8550.
+
+Cada pestaña es una sesión de Flet con su propia tarea de compilación; el
+pool de procesos y la caché de resultados son del servidor y se comparten
+entre sesiones (ver web_compiler).
+"""
 import flet as ft
 
-def main(page: ft.Page):
-    page.add(ft.Text("Web Compiler"))
-    
-    code_input = ft.TextField(
-        multiline=True, 
-        min_lines=10, 
-        expand=True
-    )
-    
-    def compile_action(e):
-        page.add(ft.Text(f"Code length: {len(code_input.value)}"))
-    
+from compilador.diffing import changed_range
+from web_compiler import Session, WebCompiler, diagnostic_error, token_text
+
+PORT = 8550
+
+
+async def session_page(page: ft.Page, compiler: WebCompiler):
+    session = Session(compiler)
+    page.title = "Web Compiler"
+    page.on_disconnect = lambda e: session.close()
+
+    code_input = ft.TextField(multiline=True, min_lines=10, expand=True)
+    status = ft.Text("Listo")
+    diagnostics = ft.Column(spacing=2)
+    tokens_list = ft.ListView(spacing=0, height=300)
+    shown_tokens = []  # Filas que muestra tokens_list; cada resultado envía solo la diferencia
+
+    async def compile_action(e):
+        nonlocal shown_tokens
+        status.value = "Compilando..."
+        status.update()
+        try:
+            result = await session.compile(code_input.value or "")
+        except Exception as ex:
+            result = {'ok': False, 'error': f"Error inesperado: {str(ex)}"}
+        if result is None:
+            return  # Una compilación posterior de esta pestaña la sustituyó
+        if 'error' in result:
+            # Sin resultado del compilador: el error va al área de resultados
+            # y los tokens de la compilación anterior siguen a la vista
+            diagnostics.controls = [ft.Text(result['error'], color=ft.colors.RED)]
+            diagnostics.update()
+            status.value = result['error']
+            status.update()
+            return
+
+        tokens = result['tokens']
+        change = changed_range(shown_tokens, tokens)
+        if change is not None:
+            start, old_end, new_end = change
+            tokens_list.controls[start:old_end] = [
+                ft.Text(token_text(row), style=ft.TextStyle(family="Consolas", size=12))
+                for row in tokens[start:new_end]
+            ]
+            shown_tokens = tokens
+            tokens_list.update()
+        diagnostics.controls = [ft.Text(f"{d['code']} {diagnostic_error(d)}", color=ft.colors.RED)
+                                for d in result['diagnostics']]
+        diagnostics.update()
+        status.value = (f"Compilación exitosa ({result['elapsed_ms']:.1f} ms)" if result['ok']
+                        else f"Compilación fallida: {len(result['diagnostics'])} errores")
+        status.update()
+
     compile_button = ft.ElevatedButton("Compile", on_click=compile_action)
-    
+
     page.add(
+        ft.Text("Web Compiler"),
         ft.Row([
             ft.Column([
                 ft.Text("Code Editor"),
                 code_input,
-                compile_button
-            ])
+                ft.Row([compile_button, status]),
+                diagnostics,
+                tokens_list,
+            ], expand=True)
         ])
     )
 
-ft.app(target=main, port=8550, view=ft.AppView.WEB_BROWSER)
\ No newline at end of file
+
+def main():
+    compiler = WebCompiler()
+
+    async def target(page: ft.Page):
+        await session_page(page, compiler)
+
+    try:
+        ft.app(target=target, port=PORT, view=ft.AppView.WEB_BROWSER)
+    finally:
+        compiler.close()
+
+
+if __name__ == "__main__":
+    main()
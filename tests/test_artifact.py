@@ -0,0 +1,61 @@
+import pytest
+
+from compilador import Lexer
+from compilador import artifact
+
+SOURCE = "/* a\n b */ string s = \"x\\\"y\";\nboolean b = true && false; @ 1.5\nprint('año');\n"
+
+
+def rows(tokens) -> list:
+    return [(t.type, t.value, t.line, t.position, t.offset) for t in tokens]
+
+
+def test_round_trip():
+    tokens = Lexer().tokenize(SOURCE)
+    stream = artifact.load(artifact.dump(tokens))
+    assert len(stream) == len(tokens)
+    assert rows(stream.to_tokens()) == rows(tokens)
+    assert rows([stream[-1]]) == rows(tokens[-1:])
+    with pytest.raises(IndexError):
+        stream[len(tokens)]
+
+
+def test_round_trip_empty():
+    assert artifact.load(artifact.dump([])).to_tokens() == []
+
+
+@pytest.mark.parametrize('cut', [0, 10, -1])
+def test_truncated(cut):
+    data = artifact.dump(Lexer().tokenize(SOURCE))
+    with pytest.raises(artifact.ArtifactError):
+        artifact.load(data[:cut])
+
+
+def test_not_an_artifact():
+    data = bytearray(artifact.dump(Lexer().tokenize(SOURCE)))
+    data[0] ^= 0xFF
+    with pytest.raises(artifact.ArtifactError):
+        artifact.load(bytes(data))
+
+
+def test_mmap_close(tmp_path):
+    tokens = Lexer().tokenize(SOURCE)
+    path = str(tmp_path / 'tokens.ctok')
+    artifact.save(tokens, path)
+    stream = artifact.open_artifact(path)
+    received = stream.to_tokens()
+    # Mientras haya vistas sobre el mmap no se puede cerrar
+    with pytest.raises(BufferError):
+        stream.data.close()
+    stream.release()
+    stream.data.close()
+    assert stream.data.closed
+    assert rows(received) == rows(tokens)  # Los Token no dependen del mmap
+
+
+@pytest.mark.parametrize('cut', [0, 10])
+def test_open_truncated(tmp_path, cut):
+    path = tmp_path / 'tokens.ctok'
+    path.write_bytes(artifact.dump(Lexer().tokenize(SOURCE))[:cut])
+    with pytest.raises(artifact.ArtifactError, match="Artefacto truncado"):
+        artifact.open_artifact(str(path))
@@ -0,0 +1,72 @@
+import json
+import os
+
+from compilador.diagnostics import check_file
+from corpus_check import Scheduler, check_corpus, make_shards, open_journal, percentile, read_journal
+
+
+def entries(*sizes):
+    return [(f"f{n}", size, 0) for n, size in enumerate(sizes)]
+
+
+def test_make_shards():
+    shards = make_shards(entries(3, 3, 3, 10, 1), 6)
+    assert [[path for path, _, _ in shard] for shard in shards] == [['f0', 'f1'], ['f2'], ['f3'], ['f4']]
+    assert make_shards([], 6) == []
+
+
+def test_scheduler_balances_and_steals():
+    shards = [[entry] for entry in entries(10, 1, 1, 1, 5, 2)]
+    scheduler = Scheduler(shards, 2)
+    # Reparto voraz de mayor a menor: 10 | 5 2 1 1 1
+    assert [[shard[0][1] for shard in queue] for queue in scheduler.queues] == [[10], [5, 2, 1, 1, 1]]
+    assert scheduler.pending == [10, 10]
+    assert scheduler.next_shard(0)[0][1] == 10
+    # La cola 0 está vacía: roba el lote más pequeño de la cola 1
+    assert scheduler.next_shard(0)[0][1] == 1
+    assert scheduler.next_shard(1)[0][1] == 5
+    assert (scheduler.stolen, scheduler.pending) == (1, [0, 4])
+    taken = [scheduler.next_shard(0) for _ in range(4)]
+    assert [shard[0][1] for shard in taken[:3]] == [1, 1, 2] and taken[3] is None
+    assert (scheduler.stolen, scheduler.pending) == (4, [0, 0])
+
+
+def test_percentile():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3, 1, 2, 4], 0.5) == 3
+    assert percentile(list(range(100)), 0.99) == 99
+
+
+def test_journal_cut_line(tmp_path):
+    path = str(tmp_path / 'diario.ndjson')
+    with open(path, 'w', encoding='utf-8') as journal:
+        journal.write(json.dumps({'file': 'a', 'ok': True}) + '\n{"file": "b", "o')
+    assert list(read_journal(path)) == ['a']
+    with open_journal(path) as journal:
+        journal.write(json.dumps({'file': 'c', 'ok': False}) + '\n')
+    assert list(read_journal(path)) == ['a', 'c']
+    assert read_journal(str(tmp_path / 'no_existe.ndjson')) == {}
+
+
+def test_check_corpus_and_resume(tmp_path):
+    corpus = tmp_path / 'corpus'
+    corpus.mkdir()
+    for n in range(12):
+        body = f"int a{n} = {n}; print(a{n});" if n % 3 else f"int a{n} = {n};"  # Uno de cada 3 falla
+        (corpus / f"p{n}.py").write_text(body, encoding='utf-8')
+    journal = str(tmp_path / 'diario.ndjson')
+    seen = []
+    stats = check_corpus([str(corpus)], journal, workers=2, shard_bytes=40, progress=seen.append)
+    assert (stats['files'], stats['failed'], stats['resumed'], stats['interrupted']) == (12, 4, 0, False)
+    assert len(seen) == 12
+    for path, entry in read_journal(journal).items():
+        assert entry['diagnostics'] == check_file(path)
+        assert entry['ok'] == (not entry['diagnostics'])
+
+    # Solo se vuelve a revisar el archivo modificado
+    changed = corpus / 'p0.py'
+    changed.write_text("int a0 = 0; print(a0);", encoding='utf-8')
+    os.utime(changed, ns=(0, 10 ** 9))
+    stats = check_corpus([str(corpus)], journal, workers=2)
+    assert (stats['files'], stats['failed'], stats['resumed']) == (1, 0, 11)
+    assert read_journal(journal)[str(changed)]['ok']
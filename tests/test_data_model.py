@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+from compilador import CompilerError, ErrorType, Lexer, Token, TokenType, Variable
+from compilador.ir import Instruction
+from compilador.m_token import TOKEN_TYPE_CODES, TOKEN_TYPE_NAMES, TOKEN_TYPES
+
+
+@pytest.mark.parametrize('instance', [
+    Token(TokenType.IDENTIFIER, 'x', 1, 0, 0),
+    Variable('x', 'int'),
+    Instruction('const', 0, 1, (5,), 1),
+])
+def test_no_instance_dict(instance):
+    assert not hasattr(instance, '__dict__')
+    with pytest.raises(AttributeError):
+        instance.extra = 1
+
+
+def test_compiler_error_fields_in_slots():
+    # BaseException siempre tiene __dict__; los campos no van en él
+    error = CompilerError(ErrorType.SEMANTIC, "m", 1, 0)
+    assert vars(error) == {}
+    assert all(isinstance(getattr(CompilerError, name), type(Token.value)) for name in CompilerError.__slots__)
+
+
+def test_type_tables():
+    assert [TOKEN_TYPES[TOKEN_TYPE_CODES[t]] for t in TokenType] == list(TokenType)
+    assert all(TOKEN_TYPE_NAMES[t] == t.name for t in TokenType)
+
+
+def test_token_rows():
+    for token in Lexer().tokenize("int a = 1; print(\"b\" + a);"):
+        row = token.as_row()
+        assert row == (token.kind, token.value, token.line, token.position, token.offset)
+        assert token.type_name == token.type.name
+        copy = Token.from_row(row)
+        assert (copy.type, copy.value, copy.line, copy.position, copy.offset) == \
+            (token.type, token.value, token.line, token.position, token.offset)
+        assert str(copy) == str(token) == f"Token({token.type.name}, '{token.value}', línea {token.line}, " \
+                                          f"pos {token.position})"
+
+
+def test_compiler_error_pickles():
+    error = CompilerError(ErrorType.LEXICAL, "Carácter no reconocido: $", 2, 3, "un carácter válido", "$", 14, 1)
+    copy = pickle.loads(pickle.dumps(error))
+    assert [getattr(copy, name) for name in CompilerError.__slots__] == \
+        [getattr(error, name) for name in CompilerError.__slots__]
+    assert str(copy) == str(error)
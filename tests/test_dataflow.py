@@ -0,0 +1,48 @@
+import pytest
+
+from compilador import CompilerError, Lexer, LL1Parser, Parser
+from compilador.dataflow import FlowGraph, StructuredFlow
+from compile_worker import compile_source
+
+UNINITIALIZED = "Variable '{}' utilizada sin inicializar"
+UNUSED = "Variable '{}' declarada pero nunca utilizada"
+
+# Programa -> (mensaje, línea, posición) de todos los diagnósticos del análisis de flujo
+CASES = {
+    "int x;\nif (true) { x = 1; }\nprint(x);": [(UNINITIALIZED.format('x'), 3, 6)],
+    "int x; if (true) { x = 1; } else { x = 2; } print(x);": [],
+    "int x; while (true) { x = 1; break; } print(x);": [(UNINITIALIZED.format('x'), 1, 44)],
+    "int x; while (true) { print(x); x = 1; }": [(UNINITIALIZED.format('x'), 1, 28)],
+    "int s; for (int i = 0; i < 3; s) { s = i; } print(1);": [],
+    "int x = x + 1; print(x);": [(UNINITIALIZED.format('x'), 1, 8)],
+    # Lo que sigue a break/continue no se alcanza y no se comprueba
+    "int i = 0; while (i < 3) { i += 1; continue; print(i); }": [],
+    "int x; while (true) { break; print(x); }": [(UNUSED.format('x'), 1, 4)],
+    "int a = 1; if (a > 0) { int b = a; } int c; int d = 2;": [
+        (UNUSED.format('b'), 1, 28), (UNUSED.format('c'), 1, 41), (UNUSED.format('d'), 1, 48),
+    ],
+}
+
+
+def diagnostics(parser_class, flow_class, source):
+    parser = parser_class(Lexer().tokenize(source), flow_class)
+    try:
+        parser.parse()
+    except CompilerError as e:
+        # Se lanza el primero de los diagnósticos
+        assert (e.message, e.line, e.position) == \
+            (parser.diagnostics[0].message, parser.diagnostics[0].line, parser.diagnostics[0].position)
+    return [(d.message, d.line, d.position) for d in parser.diagnostics]
+
+
+@pytest.mark.parametrize('flow_class', [FlowGraph, StructuredFlow])
+@pytest.mark.parametrize('parser_class', [Parser, LL1Parser])
+@pytest.mark.parametrize('source', list(CASES))
+def test_diagnostics(parser_class, flow_class, source):
+    assert diagnostics(parser_class, flow_class, source) == CASES[source]
+
+
+def test_worker_reports_all_diagnostics():
+    source = "int a = 1; if (a > 0) { int b = a; } int c; int d = 2;"
+    result = compile_source(source)
+    assert [(d['message'], d['line'], d['position']) for d in result['diagnostics']] == CASES[source]
@@ -0,0 +1,77 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+from compilador import ErrorType
+from compilador.diagnostics import NDJSONWriter, SARIFWriter, check_file, check_source, diagnostic_record
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UNUSED = "int a = 1; if (a > 0) { int b = a; } int c;"
+
+
+def test_codes():
+    assert [error_type.code for error_type in ErrorType] == ['E100', 'E200', 'E300']
+
+
+def test_lexical_record():
+    errors, source_map = check_source("int a = 1;\n  $")
+    assert diagnostic_record(errors[0], source_map, 'x.py') == {
+        'kind': 'diagnostic', 'file': 'x.py', 'code': 'E100', 'type': 'LEXICAL', 'severity': 'error',
+        'message': 'Carácter no reconocido: $', 'line': 2, 'column': 3, 'end_line': 2, 'end_column': 4,
+        'start': 13, 'end': 14, 'expected': 'un carácter válido', 'received': '$',
+    }
+
+
+def test_all_dataflow_diagnostics(tmp_path):
+    path = tmp_path / 'a.py'
+    path.write_text(UNUSED, encoding='utf-8')
+    records = check_file(str(path))
+    assert [(r['code'], r['message'], r['column']) for r in records] == [
+        ('E300', "Variable 'b' declarada pero nunca utilizada", 29),
+        ('E300', "Variable 'c' declarada pero nunca utilizada", 42),
+    ]
+    assert check_source("int a = 1; print(a);")[0] == []
+
+
+def test_writers():
+    errors, source_map = check_source(UNUSED)
+    records = [diagnostic_record(error, source_map, 'a.py') for error in errors]
+    stream = io.StringIO()
+    writer = NDJSONWriter(stream)
+    writer.write(records)
+    writer.close()
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == records
+
+    for batches in ([], [records[:1], [], records[1:]]):
+        stream = io.StringIO()
+        writer = SARIFWriter(stream)
+        for batch in batches:
+            writer.write(batch)
+        writer.close()
+        run = json.loads(stream.getvalue())['runs'][0]
+        assert [rule['id'] for rule in run['tool']['driver']['rules']] == ['E100', 'E200', 'E300']
+        assert [result['ruleId'] for result in run['results']] == ['E300'] * len(sum(batches, []))
+    region = run['results'][0]['locations'][0]['physicalLocation']['region']
+    assert (region['startLine'], region['startColumn'], region['charLength']) == (1, 29, 1)
+
+
+def test_cli(tmp_path):
+    (tmp_path / 'ok.py').write_text("int a = 1; print(a);", encoding='utf-8')
+    (tmp_path / 'bad.py').write_text(UNUSED, encoding='utf-8')
+    (tmp_path / 'notes.md').write_text("$", encoding='utf-8')  # Extensión que no se revisa
+    command = [sys.executable, '-m', 'compilador.diagnostics']
+    result = subprocess.run(command + ['--files', str(tmp_path)], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(r['kind'], os.path.basename(r['file'])) for r in records] == [
+        ('diagnostic', 'bad.py'), ('diagnostic', 'bad.py'), ('file', 'bad.py'), ('file', 'ok.py'),
+    ]
+    assert records[-1]['ok'] and not records[2]['ok']
+    assert result.stderr.strip() == "2 archivos, 1 con errores"
+
+    result = subprocess.run(command + ['--format', 'sarif', '-'], cwd=ROOT, input="int a = 1; print(a);",
+                            capture_output=True, text=True)
+    assert result.returncode == 0
+    assert json.loads(result.stdout)['runs'][0]['results'] == []
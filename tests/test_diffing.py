@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from compilador import Lexer
+from compilador.diffing import changed_range, same_token
+
+
+def apply(old, new, change):
+    if change is None:
+        return list(old)
+    start, old_end, new_end = change
+    return list(old[:start]) + list(new[start:new_end]) + list(old[old_end:])
+
+
+@pytest.mark.parametrize('old, new, expected', [
+    ([], [], None),
+    ([1, 2, 3], [1, 2, 3], None),
+    ([1, 2, 3], [1, 9, 3], (1, 2, 2)),
+    ([1, 2, 3], [1, 2, 3, 4], (3, 3, 4)),
+    ([1, 2, 3], [2, 3], (0, 1, 0)),
+    ([1, 1, 1], [1, 1], (2, 3, 2)),  # Prefijo y sufijo no se solapan
+    ([], [1], (0, 0, 1)),
+    ([1], [], (0, 1, 0)),
+])
+def test_changed_range(old, new, expected):
+    assert changed_range(old, new) == expected
+    assert apply(old, new, expected) == new
+
+
+def test_random_edits():
+    rnd = random.Random(3)
+    for _ in range(500):
+        old = [rnd.randrange(4) for _ in range(rnd.randrange(12))]
+        new = list(old)
+        for _ in range(rnd.randrange(3)):
+            position = rnd.randrange(len(new) + 1)
+            if new and rnd.random() < 0.5:
+                del new[min(position, len(new) - 1)]
+            else:
+                new.insert(position, rnd.randrange(4))
+        change = changed_range(old, new)
+        assert apply(old, new, change) == new
+        assert (change is None) == (old == new)
+
+
+def test_token_edit():
+    lexer = Lexer()
+    old = lexer.tokenize("int a = 1;\nint b = 2;\nprint(a + b);")
+    new = lexer.tokenize("int a = 10;\nint b = 2;\nprint(a + b);")
+    # Cambian el número y el ';' que lo sigue; en las líneas siguientes solo
+    # cambian los offsets, que las vistas no muestran
+    assert changed_range(old, new, same_token) == (3, 5, 5)
+    moved = lexer.tokenize("int a = 1;\n\nint b = 2;\nprint(a + b);")
+    assert changed_range(old, moved, same_token) == (5, len(old), len(moved))
+    assert changed_range(old, old, same_token) is None
@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from compilador import CompilerError, Lexer
+from compilador import backend
+from compilador.formatter import canonical_hash, format_source
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOURCE = "int a=1;// uno\nif(a>0){print(a);}else{a=2;}\n\n\n/* bloque */\nfor(int i=0;i<3;i+=1){print(i);}"
+FORMATTED = """int a = 1; // uno
+if (a > 0) {
+    print(a);
+} else {
+    a = 2;
+}
+
+/* bloque */
+for (int i = 0; i < 3; i += 1) {
+    print(i);
+}
+"""
+
+
+def scan(source):
+    lexer = Lexer()
+    tokens = lexer.tokenize(source)
+    return [(t.type, t.value) for t in tokens], [source[start:end] for start, end in lexer.comments]
+
+
+def test_format():
+    assert format_source(SOURCE) == FORMATTED
+    assert format_source(FORMATTED) == FORMATTED
+    assert scan(FORMATTED) == scan(SOURCE)  # Mismos tokens y comentarios
+
+
+def test_format_lexical_error():
+    with pytest.raises(CompilerError):
+        format_source("int a = $;")
+
+
+def test_canonical_hash():
+    base = canonical_hash(Lexer().tokenize(SOURCE))
+    assert canonical_hash(Lexer().tokenize(FORMATTED)) == base
+    assert canonical_hash(Lexer().tokenize(SOURCE.replace("a=2", "a=3"))) != base
+
+
+SPREAD = "int s = 0;\nfor (int i = 0; i < 2; i += 1) {\n    s += i;\n}\nprint(s);\n"
+JOINED = "int s = 0;   for (int i = 0; i < 2; i += 1) { s += i; }\n\n\nprint(s);"
+
+
+def run_lines(program):
+    lines = []
+    output = program.run(tick=lines.append)
+    return output, lines
+
+
+def fresh_compile(source):
+    backend._cache.clear()
+    backend._canonical.clear()
+    return backend.compile_program(source)
+
+
+def test_canonical_cache_relocates_lines():
+    expected = run_lines(fresh_compile(JOINED))
+    spread = fresh_compile(SPREAD)
+    joined = backend.compile_program(JOINED)
+    # Cada línea de SPREAD queda entera en una de JOINED: misma función, otras líneas
+    assert joined.function is spread.function
+    assert run_lines(joined) == expected
+    assert backend.compile_program(JOINED) is joined  # Primer nivel: el mismo texto
+
+
+def test_canonical_cache_split_line_recompiles():
+    joined = fresh_compile(JOINED)
+    spread = backend.compile_program(SPREAD)
+    # La primera línea de JOINED queda partida en SPREAD: no se puede reubicar
+    assert spread.function is not joined.function
+    assert run_lines(spread) == run_lines(fresh_compile(SPREAD))
+
+
+def test_check_cli(tmp_path):
+    path = tmp_path / 'a.py'
+    path.write_text(SOURCE, encoding='utf-8')
+    command = [sys.executable, '-m', 'compilador.formatter']
+    result = subprocess.run(command + ['--check', str(path)], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 1
+    subprocess.run(command + ['--write', str(path)], cwd=ROOT, check=True)
+    assert path.read_text(encoding='utf-8') == FORMATTED
+    result = subprocess.run(command + ['--check', str(path)], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que el editor solo necesita al ejecutar, formatear o buscar símbolos
+DEFERRED = ['compilador.backend', 'compilador.formatter', 'compilador.interpreter',
+            'compilador.runner', 'compilador.symbols', 'sqlite3']
+
+
+def loaded_after(statement):
+    code = f"import sys\n{statement}\nprint(' '.join(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    return set(result.stdout.split())
+
+
+def test_gui_import_defers_modules():
+    assert not loaded_after("import gui") & set(DEFERRED)
+
+
+def test_ll1_table_built_on_first_use():
+    from compilador import LL1Parser, ll1_parser
+    code = "import compilador.ll1_parser as m\nassert m._grammar is None"
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+    assert LL1Parser([]).grammar is ll1_parser.language_grammar() is LL1Parser([]).grammar
@@ -0,0 +1,36 @@
+import pytest
+
+from compilador import Lexer
+from compilador.backend import compile_ir
+from compilador.interpreter import run_ir
+from compilador.ir import build_ir
+from compilador.runner import Limits, run_limited
+
+STEPS = ["i = i + 1", "i += 1"]
+
+
+def run_both(source: str) -> list:
+    """Salida del intérprete de la IR y del backend, que deben coincidir"""
+    program = build_ir(Lexer().tokenize(source))
+    output = []
+    run_ir(program, output.append)
+    compiled = []
+    run_limited(compile_ir(program), compiled.append, Limits(max_steps=100_000, max_seconds=None, max_memory=None))
+    assert compiled == output
+    return output
+
+
+@pytest.mark.parametrize('step', STEPS)
+def test_for_step(step):
+    source = f"int s = 0;\nfor (int i = 0; i < 5; {step}) {{ s += i; }}\nprint(s);\n"
+    assert run_both(source) == ['10']
+
+
+def test_descending_step():
+    source = "int s = 0;\nfor (int j = 5; j > 0; j = j - 1) { s += j; }\nprint(s);\n"
+    assert run_both(source) == ['15']
+
+
+def test_chained_assignment_step():
+    source = "int a = 0;\nint b = 0;\nfor (int k = 0; k < 3; a = b = k + 1) { k = a; }\nprint(a);\nprint(b);\n"
+    assert run_both(source) == ['4', '4']
@@ -0,0 +1,97 @@
+import pytest
+
+from compilador import CompilerError, Lexer, TokenType
+from corpus import CONFORMANCE_PROGRAMS, structured_program
+
+SOURCE = ('int a = 1; /* uno\n dos */ string s = "x\\"\ny";\n'
+          'boolean t = trueish || true;\nfloat f = .5;\n// fin')
+
+
+def rows(tokens):
+    return [(t.type, t.value, t.line, t.position, t.offset) for t in tokens]
+
+
+def test_single_cursor_scan():
+    lexer = Lexer(fast=False)
+    tokens = lexer.tokenize(SOURCE)
+    # El comentario y el string abarcan varias líneas
+    assert rows(tokens[4:10]) == [
+        (TokenType.DELIMITER, ';', 1, 9, 9),
+        (TokenType.KEYWORD, 'string', 2, 8, 26),
+        (TokenType.IDENTIFIER, 's', 2, 15, 33),
+        (TokenType.OPERATOR, '=', 2, 17, 35),
+        (TokenType.STRING, '"x\\"\ny"', 2, 19, 37),
+        (TokenType.DELIMITER, ';', 3, 2, 44),
+    ]
+    assert lexer.comments == [(11, 25), (89, 95)]
+    assert all(SOURCE[t.offset:t.offset + len(t.value)] == t.value for t in tokens)
+
+
+def test_booleans_are_whole_words():
+    tokens = Lexer(fast=False).tokenize("trueish || true && false_ == false")
+    assert [(t.type, t.value) for t in tokens if t.type != TokenType.OPERATOR] == [
+        (TokenType.IDENTIFIER, 'trueish'), (TokenType.BOOLEAN, 'true'),
+        (TokenType.IDENTIFIER, 'false_'), (TokenType.BOOLEAN, 'false'),
+    ]
+
+
+def test_numbers_and_operators():
+    tokens = Lexer(fast=False).tokenize("x+=.5<=3.25!=y&&!z")
+    assert [t.value for t in tokens] == ['x', '+=', '.5', '<=', '3.25', '!=', 'y', '&&', '!', 'z']
+
+
+@pytest.mark.parametrize('source, message, line, position, partial', [
+    ("int a; /* abierto", "Comentario no cerrado", 1, 7, 3),
+    ('int a;\nstring s = "abierto\n', "String no cerrado", 2, 11, 6),
+    ("float f = 1.2.3;", "Número mal formado: múltiples puntos decimales", 1, 10, 3),
+    ("int a = 1;\n  $", "Carácter no reconocido: $", 2, 2, 5),
+])
+def test_errors(source, message, line, position, partial):
+    lexer = Lexer(fast=False)
+    with pytest.raises(CompilerError) as info:
+        lexer.tokenize(source)
+    assert (info.value.message, info.value.line, info.value.position) == (message, line, position)
+    assert len(lexer.tokens) == partial  # Los tokens anteriores al error se conservan
+
+
+def scan(source, fast):
+    lexer = Lexer(fast=fast)
+    try:
+        tokens = lexer.tokenize(source)
+        error = None
+    except CompilerError as e:
+        tokens = lexer.tokens
+        error = (e.message, e.line, e.position, e.offset)
+    return rows(tokens), lexer.comments, error
+
+
+EDGE_CASES = [
+    SOURCE,
+    "a/*b*/c//d\ne",
+    "x/=2;y*=3;z-=.5;w+=1.;",
+    "i++--j;!a!=b;a<=b>=c==d",
+    "a.b[0],c;{}",
+    "\tint\x0ba\x0c=\r\n1;",
+    "print('año');",  # No ASCII: camino carácter a carácter
+    "@ 1.5 @@",
+    "trueish true_ true",
+    "1.2.3",
+    "int a; /* abierto",
+    "string s = 'sin cerrar",
+    "int $ = 1;",
+    "a & b",
+    "",
+]
+
+
+@pytest.mark.parametrize('source', EDGE_CASES)
+def test_fast_path_matches_scanner(source):
+    assert scan(source, True) == scan(source, False)
+
+
+def test_fast_path_matches_on_corpus():
+    for source in CONFORMANCE_PROGRAMS + [structured_program(10)]:
+        assert scan(source, True) == scan(source, False)
+        # Cortes arbitrarios dejan comentarios y strings sin cerrar
+        for cut in range(0, len(source), 53):
+            assert scan(source[:cut], True) == scan(source[:cut], False)
@@ -0,0 +1,18 @@
+import pytest
+
+from compilador import Lexer
+from compilador.backend import CompiledProgram
+from compilador.ir import build_ir
+from compilador.optimizer import optimize
+
+
+@pytest.mark.parametrize('step, sign', [("i += 1", 1), ("i = i + 1", 1), ("i -= 1", -1), ("i = i - 1", -1)])
+def test_counted_step(step, sign):
+    start, condition = (0, "i < 5") if sign > 0 else (4, "i >= 0")
+    source = f"int s = 0;\nfor (int i = {start}; {condition}; {step}) {{ s += i; }}\nprint(s);\n"
+    program = build_ir(Lexer().tokenize(source))
+    optimized = optimize(program)
+    optimized.verify()
+    assert optimized.optimizations['increments'] == 1
+    assert optimized.optimizations['counted_loops'] == 1
+    assert CompiledProgram(optimized, None).run() == CompiledProgram(program, None).run() == ['10']
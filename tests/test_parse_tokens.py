@@ -0,0 +1,38 @@
+import pytest
+
+from compilador import Lexer, Parser, LL1Parser, parse_tokens
+from compilador.diagnostics import check_source
+from compilador.symbols import collect_symbols
+from compile_worker import WarmCompiler
+from bench_nesting import nested_blocks
+
+DEEP = nested_blocks(5000)  # Agota la pila de Parser
+
+
+@pytest.mark.parametrize('source, parser_class', [(nested_blocks(3), Parser), (DEEP, LL1Parser)])
+def test_valid(source, parser_class):
+    parser, error = parse_tokens(Lexer().tokenize(source))
+    assert type(parser) is parser_class and error is None
+    assert parser.scope_tree.children
+
+
+@pytest.mark.parametrize('source', [nested_blocks(3), DEEP])
+def test_error_keeps_parser(source):
+    source += "print(sin_declarar);\nint a;\n"
+    parser, error = parse_tokens(Lexer().tokenize(source))
+    assert error is not None and error.message == "Variable 'sin_declarar' no declarada"
+    assert parser.scope_tree.children  # Lo analizado antes del error
+
+    errors, _ = check_source(source)
+    assert [e.message for e in errors] == [error.message]
+    collector, symbol_error = collect_symbols(source)
+    assert symbol_error.message == error.message
+    result = WarmCompiler().compile(source)
+    assert [d['message'] for d in result['diagnostics']] == [error.message]
+
+
+def test_reused_parsers():
+    compiler = WarmCompiler()
+    for source in (DEEP, "int x;\nprint(x);\n", DEEP):
+        expected = [e.message for e in check_source(source)[0]]
+        assert [d['message'] for d in compiler.compile(source)['diagnostics']] == expected
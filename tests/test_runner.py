@@ -0,0 +1,38 @@
+import threading
+
+import pytest
+
+from compilador.backend import compile_program
+from compilador.runner import Cancelled, LimitExceeded, LineProfiler, Limits, Monitor, run_limited
+
+
+def run_in_thread(source: str, monitor: Monitor) -> tuple:
+    errors = []
+
+    def execute():
+        try:
+            run_limited(compile_program(source), [].append, monitor=monitor)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=execute, daemon=True)
+    thread.start()
+    return thread, errors
+
+
+@pytest.mark.parametrize('source', ["while (true) { }", "int i = 0; while (true) { print(i); i += 1; }"])
+def test_cancel(source):
+    monitor = Monitor(Limits(max_steps=None, max_seconds=None, max_memory=None), LineProfiler())
+    thread, errors = run_in_thread(source, monitor)
+    while monitor.steps < 1000:
+        thread.join(0.001)
+    monitor.cancel()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert [type(e) for e in errors] == [Cancelled]
+    assert monitor.profiler.hits  # El perfil se cierra igual que al terminar
+
+
+def test_step_limit():
+    with pytest.raises(LimitExceeded):
+        run_limited(compile_program("while (true) { }"), [].append, Limits(max_steps=1000, max_seconds=None))
@@ -0,0 +1,82 @@
+import pytest
+
+from compilador import CompilerError, Lexer, LL1Parser, Parser
+
+PARSERS = [Parser, LL1Parser]
+
+SOURCE = """int a = 1;
+if (a > 0) {
+  int b = a;
+  print(b);
+} else {
+  print(a);
+}
+for (int i = 0; i < 2; i += 1) {
+  while (i < 1) {
+    int c = i; print(c);
+    break;
+  }
+}
+"""
+
+
+def shape(scope, tokens):
+    """(sentencia, líneas, variables con su línea, hijos) de un ámbito y sus descendientes"""
+    return (scope.keyword(tokens), scope.lines(tokens),
+            [(name, token.line) for name, token in zip(scope.variables, scope.declarations)],
+            [shape(child, tokens) for child in scope.children])
+
+
+def parse(parser_class, source):
+    tokens = Lexer().tokenize(source)
+    parser = parser_class(tokens)
+    try:
+        parser.parse()
+    except CompilerError:
+        pass
+    return parser, tokens
+
+
+@pytest.mark.parametrize('parser_class', PARSERS)
+def test_scope_tree(parser_class):
+    parser, tokens = parse(parser_class, SOURCE)
+    assert shape(parser.scope_tree, tokens) == (
+        'global', (1, 13), [('a', 1)], [
+            ('if', (2, 5), [('b', 3)], []),
+            ('else', (5, 7), [], []),
+            ('for', (8, 13), [('i', 8)], [  # Inicialización del for y, dentro, su cuerpo
+                ('for', (8, 13), [], [
+                    ('while', (9, 12), [('c', 10)], []),
+                ]),
+            ]),
+        ])
+    tree = parser.scope_tree
+    assert (tree.start, tree.end) == (0, len(tokens))
+    assert all(child.parent is tree for child in tree.children)
+
+
+@pytest.mark.parametrize('parser_class', PARSERS)
+def test_partial_tree(parser_class):
+    # El análisis se detiene dentro del while: sus ámbitos quedan abiertos
+    source = SOURCE.replace("int c = i;", "int c = x;")
+    parser, tokens = parse(parser_class, source)
+    loop = parser.scope_tree.children[2]
+    body = loop.children[0]
+    inner = body.children[0]
+    assert [scope.end for scope in (loop, body, inner)] == [None, None, None]
+    assert inner.lines(tokens) == (9, None)
+    assert [scope.end is not None for scope in parser.scope_tree.children[:2]] == [True, True]
+
+
+def test_parsers_agree_on_partial_trees():
+    tokens = Lexer().tokenize(SOURCE)
+    for cut in range(len(tokens)):
+        trees = []
+        for parser_class in PARSERS:
+            parser = parser_class(tokens[:cut])
+            try:
+                parser.parse()
+            except CompilerError:
+                pass
+            trees.append(shape(parser.scope_tree, tokens))
+        assert trees[0] == trees[1], cut
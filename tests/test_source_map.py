@@ -0,0 +1,54 @@
+import pytest
+
+from compilador import CompilerError, ErrorType, Lexer, SourceMap, parse_tokens
+
+SOURCE = "int a = 1;\n\nstring s = \"x\";\nprint(a)"
+
+
+def test_line_col_round_trip():
+    source_map = SourceMap(SOURCE)
+    assert source_map.line_count == 4
+    for offset in range(len(SOURCE) + 1):
+        line, position = source_map.line_col(offset)
+        assert source_map.offset(line, position) == offset
+        assert source_map.from_tk_index(source_map.tk_index(offset)) == offset
+    assert source_map.line_col(0) == (1, 0)
+    assert source_map.line_col(11) == (2, 0)  # Línea vacía
+    assert source_map.line_col(12) == (3, 0)
+
+
+def test_offset_clamps():
+    source_map = SourceMap(SOURCE)
+    assert source_map.offset(0, 0) == 0
+    assert source_map.offset(99, 0) == source_map.line_starts[-1]
+    assert source_map.offset(4, 99) == len(SOURCE)
+
+
+@pytest.mark.parametrize('fast', [True, False])
+def test_tokens_carry_offsets(fast):
+    lexer = Lexer(fast=fast)
+    tokens = lexer.tokenize(SOURCE)
+    for token in tokens:
+        assert SOURCE[token.offset:token.end] == token.value
+        assert lexer.source_map.line_col(token.offset) == (token.line, token.position)
+
+
+def test_error_span():
+    source_map = SourceMap(SOURCE)
+    # Un error sin offset se resuelve por (línea, posición)
+    error = CompilerError(ErrorType.SEMANTIC, "x", 3, 7, length=1)
+    assert error.span(source_map) == (19, 20)
+    assert source_map.tk_range(*error.span(source_map)) == ("3.7", "3.8")
+    # Un error léxico trae su offset
+    lexer = Lexer()
+    with pytest.raises(CompilerError) as info:
+        lexer.tokenize("int a;\n  $")
+    assert info.value.span(lexer.source_map) == (9, 10)
+
+
+def test_parse_error_span_at_end():
+    # El error al final del código no sale del buffer
+    source = "int a = 1"
+    _, error = parse_tokens(Lexer().tokenize(source))
+    start, end = error.span(SourceMap(source))
+    assert 0 <= start <= end <= len(source)
@@ -0,0 +1,105 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from compilador import Lexer, Parser, CompilerError
+from compilador.spill import CHUNK_TOKENS, compile_file, tokenize_file, TokenStore
+from corpus import structured_program
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BIG = structured_program(300)  # Más de un bloque de tokens (CHUNK_TOKENS)
+MIB = 1024 * 1024
+# Mide el pico de memoria del compilador acotado como hijo de un proceso
+# nuevo: los hijos de pytest heredarían en ru_maxrss la memoria de pytest
+PEAK = """
+import resource, subprocess, sys
+subprocess.run([sys.executable, '-m', 'compilador.spill'] + sys.argv[1:], check=True, stdout=subprocess.DEVNULL)
+print(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024)
+"""
+
+
+def in_memory(source: str) -> list:
+    try:
+        parser = Parser(Lexer().tokenize(source))
+    except CompilerError as e:
+        return [(e.message, e.line, e.position)]
+    try:
+        parser.parse()
+    except CompilerError as e:
+        return [(d.message, d.line, d.position) for d in parser.diagnostics or [e]]
+    return []
+
+
+def in_memory_errors(source: str) -> list:
+    parser = Parser(Lexer().tokenize(source))
+    with pytest.raises(CompilerError) as error:
+        parser.parse()
+    return parser.diagnostics or [error.value]
+
+
+@pytest.mark.parametrize('source', [
+    # Globales en GlobalTable frente a las del Parser en memoria
+    "int a = 1;\nif (true) { int a = 2; print(a); }\nprint(a);\n",
+    "int a = 1;\nif (true) { int b = a; print(b); }\nint b = 2;\nprint(b + a);\n",
+    "int a = 1;\nprint(a);\nint a = 2;\n",
+    "int a;\nif (a > 0) { a = 1; }\nstring s;\nint c = 3;\n",
+    "int a;\nwhile (true) { a = 1; break; }\nfor (int i = 0; i < a; i += 1) { print(x); }\n",
+    "float f = 1;\nf += 2;\nstring s = f;\n",
+    BIG,
+    BIG + "int sin_usar;\n",
+    BIG + "int z;\nprint(z);\n",
+    BIG + "print(;\n",
+    BIG + "/* sin cerrar\n",
+])
+def test_compile_file(tmp_path, source):
+    path = tmp_path / 'programa.txt'
+    path.write_text(source, encoding='utf-8')
+    result = compile_file(str(path), max_memory=MIB, directory=str(tmp_path))
+    expected = in_memory(source)
+    assert [(d.message, d.line, d.position) for d in result['diagnostics']] == expected
+    assert result['ok'] == (not expected)
+    if result['ok']:
+        assert result['chunks'] == -(-result['tokens'] // CHUNK_TOKENS)
+        assert result['tokens'] == len(Lexer().tokenize(source))
+        assert result['lines'] == source.count('\n')
+
+
+def test_small_pieces(tmp_path):
+    source = "string s = \"dos\nlíneas\"; /* comentario\nlargo */ print(s);\n" * 50
+    path = tmp_path / 'trozos.txt'
+    path.write_text(source, encoding='utf-8')
+    with TokenStore(window=0, directory=str(tmp_path)) as store:
+        tokenize_file(str(path), store, 7)
+        received = [token.as_row() for token in store.finish()]
+    assert received == [token.as_row() for token in Lexer().tokenize(source)]
+
+
+def test_max_memory_cli(tmp_path):
+    path = tmp_path / 'programa.txt'
+    path.write_text(BIG, encoding='utf-8')
+    result = subprocess.run([sys.executable, '-m', 'compilador.spill', str(path), '--max-memory', '20',
+                             '--temp-dir', str(tmp_path)], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    tokens = len(Lexer().tokenize(BIG))
+    assert f"{tokens:,} tokens" in result.stdout
+
+    path.write_text(BIG + "int z;\nprint(z);\n", encoding='utf-8')
+    result = subprocess.run([sys.executable, '-m', 'compilador.spill', str(path), '--max-memory', '20'],
+                            cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert [line.split(': ', 1)[1] for line in result.stderr.splitlines()] == \
+        [str(d) for d in in_memory_errors(BIG + "int z;\nprint(z);\n")]
+
+
+def test_many_globals_memory(tmp_path):
+    """Cada global vive todo el análisis: con muchas, la memoria sigue por debajo del límite"""
+    path = tmp_path / 'globales.txt'
+    with open(path, 'w', encoding='utf-8') as file:
+        for n in range(150_000):
+            file.write(f"int v{n} = {n}; print(v{n});\n")
+    limit = 48
+    peak = subprocess.run([sys.executable, '-c', PEAK, str(path), '--max-memory', str(limit),
+                           '--temp-dir', str(tmp_path)], cwd=ROOT, check=True, capture_output=True, text=True)
+    assert int(peak.stdout) < limit * MIB
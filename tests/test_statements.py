@@ -0,0 +1,83 @@
+import pytest
+
+from compilador import CompilerError, ErrorType, Lexer, LL1Parser, Parser
+
+PARSERS = [Parser, LL1Parser]
+
+PROGRAM = """int i = 0;
+float f = 1.5;
+string s = "a";
+boolean b = true;
+while (i < 3) {
+    i += 1;
+    if (i == 2) {
+        continue;
+    } else {
+        print(s);
+    }
+    break;
+}
+for (int k = 0; k < 2; k += 1) {
+    print(f);
+}
+print(b);
+"""
+
+
+def parse(parser_class, source):
+    parser = parser_class(Lexer().tokenize(source))
+    parser.parse()
+    return parser
+
+
+def test_handlers_cover_statement_keywords():
+    handlers = Parser([]).statement_handlers
+    assert set(handlers) == {'int', 'float', 'string', 'boolean', 'if', 'while', 'for',
+                             'print', 'break', 'continue'}
+    assert handlers['break'] == handlers['continue']
+
+
+@pytest.mark.parametrize('parser_class', PARSERS)
+def test_every_statement(parser_class):
+    parse(parser_class, PROGRAM)
+
+
+def test_dispatch_through_table():
+    parser = Parser(Lexer().tokenize("print(1); print(2);"))
+    seen = []
+
+    def handler():
+        seen.append(parser.current_token().line)
+        parser.parse_print_statement()
+
+    parser.statement_handlers['print'] = handler
+    parser.parse()
+    assert seen == [1, 1]
+
+
+@pytest.mark.parametrize('parser_class', PARSERS)
+@pytest.mark.parametrize('keyword', ['return', 'void', 'class', 'public', 'private', 'input', 'else'])
+def test_unexpected_keyword(parser_class, keyword):
+    # Antes estas palabras dejaban al parser en un bucle sin avanzar
+    with pytest.raises(CompilerError) as info:
+        parse(parser_class, f"int a = 1;\n{keyword} a;\n")
+    error = info.value
+    assert (error.error_type, error.message) == (ErrorType.SYNTACTIC, f"Palabra clave inesperada: '{keyword}'")
+    assert (error.line, error.position) == (2, 0)
+
+
+@pytest.mark.parametrize('parser_class', PARSERS)
+@pytest.mark.parametrize('keyword', ['break', 'continue'])
+def test_loop_control_outside_loop(parser_class, keyword):
+    with pytest.raises(CompilerError) as info:
+        parse(parser_class, f"{keyword};")
+    assert info.value.message == f"'{keyword}' fuera de un bucle"
+
+
+@pytest.mark.parametrize('fast', [True, False])
+def test_identifiers_interned(fast):
+    # Sin interning cada aparición sería un str distinto cortado del buffer
+    source = "int v0 = 0;\nint v1 = 1;\nprint(v0 + v0 + v1);\n"
+    tokens = Lexer(fast=fast).tokenize(source)
+    v0 = [token.value for token in tokens if token.value == 'v0']
+    assert len(v0) == 3 and v0[0] is v0[1] is v0[2]
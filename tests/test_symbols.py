@@ -0,0 +1,36 @@
+from compilador.symbols import collect_symbols
+
+SOURCE = """int total = 0;
+for (int i = 0; i < 3; i = i + 1) {
+    total += i;
+}
+for (int k = 0; k < 3; k += 1) {
+    print(k);
+}
+total = total * 2;
+"""
+
+
+def kinds(source):
+    collector, error = collect_symbols(source)
+    assert error is None
+    return [(symbol.name, symbol.kind, symbol.line) for symbol in collector.symbols()]
+
+
+def test_for_step_target_is_write():
+    found = kinds(SOURCE)
+    # i = i + 1: el destino se escribe y el lado derecho se lee
+    assert [kind for name, kind, line in found if name == 'i' and line == 2] == \
+        ['declaration', 'read', 'write', 'read']
+    assert [kind for name, kind, line in found if name == 'k' and line == 5] == \
+        ['declaration', 'read', 'update']
+
+
+def test_statement_assignments():
+    found = kinds(SOURCE)
+    assert ('total', 'update', 3) in found
+    assert [kind for name, kind, line in found if line == 8] == ['write', 'read']
+
+
+def test_assignment_inside_expression():
+    assert kinds("int x = 0;\nprint(x = 5);\n") == [('x', 'declaration', 1), ('x', 'write', 2)]
@@ -0,0 +1,114 @@
+import asyncio
+
+from compilador import Lexer, parse_tokens
+from compile_worker import compile_source
+from web_compiler import RateLimiter, Session, WebCompiler, diagnostic_error, token_text
+
+SMALL = "int x = 1;\nprint(x);\n"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowCompiler:
+    """Compilador de prueba: cada compilación espera a que se libere su evento"""
+
+    def __init__(self):
+        self.started = []
+        self.release = asyncio.Event()
+
+    async def compile(self, source):
+        self.started.append(source)
+        await self.release.wait()
+        return {'ok': True, 'source': source}
+
+
+def test_rate_limiter_burst_then_rate():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2.0, burst=5, clock=clock)
+    assert [limiter.acquire() for _ in range(5)] == [0.0] * 5
+    assert limiter.acquire() == 0.5
+    clock.now = 0.5
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.5
+    clock.now = 100.0  # Las fichas no pasan de burst
+    assert [limiter.acquire() for _ in range(5)] == [0.0] * 5
+    assert limiter.acquire() > 0
+
+
+def test_session_limited():
+    async def scenario():
+        compiler = SlowCompiler()
+        compiler.release.set()
+        session = Session(compiler, RateLimiter(rate=1.0, burst=2, clock=FakeClock()))
+        return [await session.compile(SMALL) for _ in range(3)], compiler.started
+
+    results, started = asyncio.run(scenario())
+    assert results[:2] == [{'ok': True, 'source': SMALL}] * 2
+    assert results[2]['limited'] and not results[2]['ok']
+    assert results[2]['error'].startswith("Demasiadas compilaciones seguidas")
+    assert len(started) == 2  # La petición limitada no llega al compilador
+
+
+def test_session_superseded():
+    async def scenario():
+        compiler = SlowCompiler()
+        session = Session(compiler)
+        first = asyncio.ensure_future(session.compile("int a = 1;"))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(session.compile("int b = 2;"))
+        await asyncio.sleep(0)
+        compiler.release.set()
+        return await first, await second
+
+    first, second = asyncio.run(scenario())
+    assert first is None
+    assert second == {'ok': True, 'source': "int b = 2;"}
+
+
+def test_session_close_cancels():
+    async def scenario():
+        session = Session(SlowCompiler())
+        request = asyncio.ensure_future(session.compile(SMALL))
+        await asyncio.sleep(0)
+        session.close()
+        try:
+            await request
+        except asyncio.CancelledError:
+            return 'cancelada'
+
+    assert asyncio.run(scenario()) == 'cancelada'
+
+
+def test_web_compiler_shares_and_caches():
+    async def scenario():
+        compiler = WebCompiler(workers=1)
+        try:
+            shared = await asyncio.gather(*(compiler.compile(SMALL) for _ in range(10)))
+            cached = await compiler.compile(SMALL)
+            too_big = await compiler.compile("x" * (compiler.max_bytes + 1))
+        finally:
+            compiler.close()
+        return shared, cached, too_big, compiler.stats
+
+    shared, cached, too_big, stats = asyncio.run(scenario())
+    assert stats == {'compiles': 1, 'hits': 1, 'shared': 9}
+    assert all(result is shared[0] for result in shared) and cached is shared[0]
+    assert shared[0]['ok']
+    assert too_big == {'ok': False, 'error': 'Código fuente demasiado grande'}
+
+
+def test_result_rendering():
+    # Los mensajes reconstruidos del resultado son los mismos que en proceso
+    source = "int x = ;\n"
+    result = compile_source(source)
+    tokens = Lexer().tokenize(source)
+    error = parse_tokens(tokens)[1]
+    assert not result['ok']
+    assert str(diagnostic_error(result['diagnostics'][0])) == str(error)
+    assert [token_text(row) for row in result['tokens']] == [str(token) for token in tokens]
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+import pytest
+
+from compile_service import CompileServer, request_compile
+from compile_worker import WorkerPool, compile_source
+from corpus import structured_program
+
+SMALL = "int x = 1;\nprint(x);\n"
+SLOW = structured_program(3000)  # Algo más de un segundo de compilación
+
+
+def test_timeout_recycles_worker():
+    with WorkerPool(1) as pool:
+        (old,) = pool.processes.values()
+        with pytest.raises(TimeoutError):
+            pool.compile(SLOW, timeout=0.01)
+        assert not old.is_alive()
+        (new,) = pool.processes.values()
+        assert new is not old and new.is_alive()
+        assert pool.compile(SMALL, timeout=5)['ok']
+
+
+def test_timeout_counts_from_worker():
+    # La espera por un worker ocupado no cuenta en el plazo de la compilación
+    with WorkerPool(1) as pool:
+        assert pool.compile(SMALL)['ok']
+        (worker,) = pool.processes.values()
+        conn = pool.idle.get()  # Ocupado durante 2,5 s
+        busy = threading.Timer(2.5, pool.idle.put, (conn,))
+        busy.start()
+        result = pool.compile(SLOW, timeout=3.0)
+        busy.join()
+        assert result['ok']
+        assert list(pool.processes.values()) == [worker]
+
+
+def test_service_timeout(tmp_path):
+    async def scenario():
+        service = CompileServer(workers=1, timeout=0.01)
+        path = str(tmp_path / 'servicio.sock')
+        await service.start(unix_path=path)
+        try:
+            slow = await request_compile(SLOW, unix_path=path, request_id=1)
+            service.timeout = 5
+            small = await request_compile(SMALL, unix_path=path, request_id=2)
+        finally:
+            await service.close()
+        return slow, small
+
+    slow, small = asyncio.run(scenario())
+    assert slow == {'id': 1, 'ok': False, 'error': 'Tiempo de compilación excedido'}
+    small.pop('elapsed_ms', None)
+    expected = compile_source(SMALL)
+    expected.pop('elapsed_ms', None)
+    assert small == dict(expected, id=2)
+
+
+def test_dead_worker_replaced():
+    with WorkerPool(1) as pool:
+        (old,) = pool.processes.values()
+        old.kill()
+        old.join()
+        result = pool.compile(SMALL, timeout=5)
+        assert result == {'ok': False, 'error': 'El proceso de compilación terminó inesperadamente'}
+        (new,) = pool.processes.values()
+        assert new is not old and new.is_alive()
+        assert pool.compile(SMALL, timeout=5)['ok']
@@ -0,0 +1,138 @@
+"""Compilación para el modo web: caché compartida entre sesiones y límite por sesión.
+
+Todas las sesiones (pestañas del navegador) de un servidor comparten un
+WebCompiler: un pool de procesos con WarmCompiler (ver compile_worker), una
+caché LRU de resultados por hash del código fuente y las compilaciones en
+curso, así que muchos alumnos compilando el mismo ejemplo provocan una sola
+compilación. Cada sesión tiene su propia tarea asíncrona y un cubo de fichas
+que limita cuántas compilaciones pide por segundo.
+
+Los resultados (ver compile_worker.WarmCompiler.compile) se comparten entre
+sesiones y no deben modificarse.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from compilador import CompilerError, ErrorType
+from compile_service import DEFAULT_MAX_BYTES, DEFAULT_TIMEOUT
+from compile_worker import WorkerPool
+
+CACHE_SIZE = 1024  # Resultados guardados
+RATE = 2.0  # Compilaciones por segundo y sesión, sostenidas
+BURST = 5  # Compilaciones seguidas antes de aplicar RATE
+
+
+def token_text(row: list) -> str:
+    """Misma forma que str(Token) para una fila [tipo, valor, línea, posición] del resultado"""
+    kind, value, line, position = row
+    return f"Token({kind}, '{value}', línea {line}, pos {position})"
+
+
+def diagnostic_error(diagnostic: dict) -> CompilerError:
+    """Reconstruye el CompilerError de un diagnóstico del resultado, para mostrarlo igual"""
+    return CompilerError(ErrorType[diagnostic['type']], diagnostic['message'], diagnostic['line'],
+                         diagnostic['position'], diagnostic['expected'], diagnostic['received'])
+
+
+class RateLimiter:
+    """Cubo de fichas: hasta burst compilaciones seguidas y después rate por segundo"""
+
+    def __init__(self, rate: float = RATE, burst: int = BURST, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+
+    def acquire(self) -> float:
+        """Consume una ficha y devuelve 0; si no quedan, los segundos hasta la próxima"""
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class WebCompiler:
+    """Compilaciones del servidor: pool de procesos, caché por hash y peticiones en curso"""
+
+    def __init__(self, workers: int = None, cache_size: int = CACHE_SIZE,
+                 max_bytes: int = DEFAULT_MAX_BYTES, timeout: float = DEFAULT_TIMEOUT):
+        self.pool = WorkerPool(workers)
+        self.cache_size = cache_size
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.cache: 'OrderedDict[bytes, dict]' = OrderedDict()
+        self.pending: Dict[bytes, asyncio.Future] = {}
+        self.stats = {'compiles': 0, 'hits': 0, 'shared': 0}
+
+    async def compile(self, source: str) -> dict:
+        data = source.encode('utf-8')
+        if len(data) > self.max_bytes:
+            return {'ok': False, 'error': 'Código fuente demasiado grande'}
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        result = self.cache.get(key)
+        if result is not None:
+            self.cache.move_to_end(key)
+            self.stats['hits'] += 1
+            return result
+        future = self.pending.get(key)
+        if future is None:
+            future = self.pending[key] = asyncio.ensure_future(self.run(key, source))
+        else:
+            self.stats['shared'] += 1  # La misma fuente ya se está compilando para otra sesión
+        # Cancelar la espera de una sesión no cancela la compilación compartida
+        return await asyncio.shield(future)
+
+    async def run(self, key: bytes, source: str) -> dict:
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(None, self.pool.compile, source, self.timeout)
+        except TimeoutError:
+            return {'ok': False, 'error': 'Tiempo de compilación excedido'}  # No se guarda
+        finally:
+            del self.pending[key]
+        self.stats['compiles'] += 1
+        if 'error' in result:
+            return result  # Fallo del worker, no de la fuente: no se guarda
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def close(self):
+        self.pool.close()
+
+
+class Session:
+    """Una pestaña del navegador: su límite de peticiones y su compilación en curso"""
+
+    def __init__(self, compiler: WebCompiler, limiter: RateLimiter = None):
+        self.compiler = compiler
+        self.limiter = limiter or RateLimiter()
+        self.task: Optional[asyncio.Task] = None
+
+    async def compile(self, source: str) -> Optional[dict]:
+        """Resultado de compilar source; None si una petición posterior de la sesión lo sustituyó"""
+        wait = self.limiter.acquire()
+        if wait:
+            return {'ok': False, 'limited': True,
+                    'error': f"Demasiadas compilaciones seguidas; espera {wait:.1f} s"}
+        if self.task is not None and not self.task.done():
+            self.task.cancel()  # Solo interesa el resultado de la última edición
+        task = self.task = asyncio.ensure_future(self.compiler.compile(source))
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if self.task is task:
+                raise  # Se canceló la sesión, no esta petición
+            return None
+
+    def close(self):
+        if self.task is not None:
+            self.task.cancel()